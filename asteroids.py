@@ -6,10 +6,16 @@
 import pygame
 import sys
 import math
-import random
 
-# Initialize Pygame
-pygame.init()
+import collision
+from entity_pool import EntityPool
+import frame_profiler
+import rng
+import rotation
+
+# Random streams
+spawn_rng = rng.stream(rng.SPAWN)
+cosmetic_rng = rng.stream(rng.COSMETIC)
 
 # Constants
 WINDOW_WIDTH = 800
@@ -45,13 +51,37 @@ INITIAL_ASTEROIDS = 4
 PARTICLE_COUNT = 10
 PARTICLE_LIFETIME = 20  # frames
 PARTICLE_SPEED = 3
-
-# Setup Display
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Asteroids")
-clock = pygame.time.Clock()
+MAX_PARTICLES = 256  # Pool size; explosions past this are trimmed
+
+# Outlines, rotated once per angle and then reused
+SHIP_HULL = rotation.Polygon([
+    (0, -SHIP_SIZE),  # Nose
+    (-SHIP_SIZE, SHIP_SIZE),  # Left
+    (0, SHIP_SIZE/2),  # Back center
+    (SHIP_SIZE, SHIP_SIZE),  # Right
+])
+SHIP_FLAME = rotation.Polygon([
+    (-SHIP_SIZE/2, SHIP_SIZE),  # Left
+    (0, SHIP_SIZE * 1.5),  # Tip
+    (SHIP_SIZE/2, SHIP_SIZE),  # Right
+])
+SQUARE = rotation.Polygon([(-1, -1), (1, -1), (1, 1), (-1, 1)])
+
+# Setup Display, done by init() rather than on import
+screen = None
+clock = None
+
+def init():
+    global screen, clock
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption("Asteroids")
+    clock = pygame.time.Clock()
 
 class GameObject:
+    __slots__ = ('x', 'y', 'dx', 'dy', 'size', 'angle', 'shape', 'active')
+
     def __init__(self, x, y, size):
         self.x = x
         self.y = y
@@ -59,7 +89,7 @@ class GameObject:
         self.dy = 0
         self.size = size
         self.angle = 0
-        self.shape = []
+        self.shape = None  # A rotation.Polygon
         self.active = True
 
     def move(self):
@@ -67,16 +97,7 @@ class GameObject:
         self.y = (self.y + self.dy) % WINDOW_HEIGHT
 
     def get_vertices(self):
-        vertices = []
-        for point in self.shape:
-            x = point[0]
-            y = point[1]
-            # Rotate
-            rx = x * math.cos(math.radians(self.angle)) - y * math.sin(math.radians(self.angle))
-            ry = x * math.sin(math.radians(self.angle)) + y * math.cos(math.radians(self.angle))
-            # Translate
-            vertices.append((rx + self.x, ry + self.y))
-        return vertices
+        return self.shape.place(self.x, self.y, self.angle)
 
     def draw(self):
         if not self.active:
@@ -89,27 +110,20 @@ class GameObject:
         if not (self.active and other.active):
             return False
         # Simple circle collision
-        dx = self.x - other.x
-        dy = self.y - other.y
-        distance = math.sqrt(dx * dx + dy * dy)
-        return distance < (self.size + other.size)
+        return collision.circles_overlap(self.x, self.y, self.size, other.x, other.y, other.size)
 
 class Ship(GameObject):
     def __init__(self):
         super().__init__(WINDOW_WIDTH//2, WINDOW_HEIGHT//2, SHIP_SIZE)
-        self.shape = [
-            (0, -self.size),  # Nose
-            (-self.size, self.size),  # Left
-            (0, self.size/2),  # Back center
-            (self.size, self.size),  # Right
-        ]
+        self.shape = SHIP_HULL
         self.thrusting = False
         self.lives = 3
         self.invulnerable = 0  # Invulnerability frames
 
     def thrust(self):
-        self.dx += SHIP_SPEED * math.sin(math.radians(self.angle))
-        self.dy -= SHIP_SPEED * math.cos(math.radians(self.angle))
+        cos, sin = rotation.cos_sin(self.angle)
+        self.dx += SHIP_SPEED * sin
+        self.dy -= SHIP_SPEED * cos
         # Limit speed
         speed = math.sqrt(self.dx * self.dx + self.dy * self.dy)
         if speed > MAX_SPEED:
@@ -133,27 +147,25 @@ class Ship(GameObject):
         super().draw()
         # Draw thrust
         if self.thrusting:
-            thrust_points = [
-                (-self.size/2, self.size),  # Left
-                (0, self.size * 1.5),  # Tip
-                (self.size/2, self.size),  # Right
-            ]
-            vertices = []
-            for point in thrust_points:
-                x = point[0]
-                y = point[1]
-                rx = x * math.cos(math.radians(self.angle)) - y * math.sin(math.radians(self.angle))
-                ry = x * math.sin(math.radians(self.angle)) + y * math.cos(math.radians(self.angle))
-                vertices.append((rx + self.x, ry + self.y))
-            pygame.draw.lines(screen, RED, True, vertices, 2)
+            pygame.draw.lines(screen, RED, True, SHIP_FLAME.place(self.x, self.y, self.angle), 2)
 
 class Bullet(GameObject):
-    def __init__(self, x, y, angle):
-        super().__init__(x, y, 2)
-        self.dx = BULLET_SPEED * math.sin(math.radians(angle))
-        self.dy = -BULLET_SPEED * math.cos(math.radians(angle))
+    # Pooled: created once by the Game's EntityPool, then respawned
+    __slots__ = ('lifetime', 'pool_index')
+
+    def __init__(self):
+        super().__init__(0, 0, 2)
+        self.lifetime = 0
+        self.shape = SQUARE
+
+    def spawn(self, x, y, angle):
+        self.x = x
+        self.y = y
+        cos, sin = rotation.cos_sin(angle)
+        self.dx = BULLET_SPEED * sin
+        self.dy = -BULLET_SPEED * cos
         self.lifetime = BULLET_LIFETIME
-        self.shape = [(-1, -1), (1, -1), (1, 1), (-1, 1)]
+        self.active = True
 
     def move(self):
         super().move()
@@ -168,34 +180,47 @@ class Asteroid(GameObject):
         self.size_index = size_index
         self.points = ASTEROID_POINTS[size_index]
         # Create irregular polygon shape
-        self.shape = []
-        num_vertices = random.randint(8, 12)
+        points = []
+        num_vertices = cosmetic_rng.randint(8, 12)
         for i in range(num_vertices):
             angle = (i / num_vertices) * 2 * math.pi
-            radius = size * random.uniform(0.8, 1.2)
-            self.shape.append((
+            radius = size * cosmetic_rng.uniform(0.8, 1.2)
+            points.append((
                 radius * math.cos(angle),
                 radius * math.sin(angle)
             ))
+        # It turns a little every frame, so rotations aren't worth keeping
+        self.shape = rotation.Polygon(points, keep=0)
         # Random movement
         speed = ASTEROID_SPEEDS[size_index]
-        angle = random.uniform(0, 2 * math.pi)
+        angle = spawn_rng.uniform(0, 2 * math.pi)
         self.dx = speed * math.cos(angle)
         self.dy = speed * math.sin(angle)
-        self.rotation_speed = random.uniform(-3, 3)
+        self.rotation_speed = cosmetic_rng.uniform(-3, 3)
 
     def move(self):
         super().move()
         self.angle = (self.angle + self.rotation_speed) % 360
 
 class Particle(GameObject):
-    def __init__(self, x, y, angle):
-        super().__init__(x, y, 1)
-        speed = random.uniform(1, PARTICLE_SPEED)
-        self.dx = speed * math.cos(math.radians(angle))
-        self.dy = speed * math.sin(math.radians(angle))
-        self.lifetime = random.randint(10, PARTICLE_LIFETIME)
-        self.shape = [(-1, -1), (1, -1), (1, 1), (-1, 1)]
+    # Pooled: created once by the Game's EntityPool, then respawned
+    __slots__ = ('lifetime', 'pool_index')
+
+    def __init__(self):
+        super().__init__(0, 0, 1)
+        self.lifetime = 0
+        self.shape = SQUARE
+
+    def spawn(self, x, y, angle):
+        self.x = x
+        self.y = y
+        speed = cosmetic_rng.uniform(1, PARTICLE_SPEED)
+        # Only for show, so the rounded table will do
+        cos, sin = rotation.table_cos_sin(angle)
+        self.dx = speed * cos
+        self.dy = speed * sin
+        self.lifetime = cosmetic_rng.randint(10, PARTICLE_LIFETIME)
+        self.active = True
 
     def move(self):
         super().move()
@@ -206,9 +231,9 @@ class Particle(GameObject):
 class Game:
     def __init__(self):
         self.ship = Ship()
-        self.bullets = []
+        self.bullets = EntityPool(Bullet, MAX_BULLETS)
         self.asteroids = []
-        self.particles = []
+        self.particles = EntityPool(Particle, MAX_PARTICLES)
         self.score = 0
         self.game_over = False
         self.spawn_asteroids(INITIAL_ASTEROIDS)
@@ -217,16 +242,16 @@ class Game:
         for _ in range(count):
             # Spawn away from the ship
             while True:
-                x = random.randint(0, WINDOW_WIDTH)
-                y = random.randint(0, WINDOW_HEIGHT)
+                x = spawn_rng.randint(0, WINDOW_WIDTH)
+                y = spawn_rng.randint(0, WINDOW_HEIGHT)
                 if math.sqrt((x - self.ship.x)**2 + (y - self.ship.y)**2) > 200:
                     break
             self.asteroids.append(Asteroid(x, y, 0))
 
     def create_particles(self, x, y, count):
         for _ in range(count):
-            angle = random.uniform(0, 360)
-            self.particles.append(Particle(x, y, angle))
+            angle = cosmetic_rng.uniform(0, 360)
+            self.particles.acquire(x, y, angle)
 
     def handle_input(self):
         for event in pygame.event.get():
@@ -236,9 +261,10 @@ class Game:
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE and len(self.bullets) < MAX_BULLETS:
                     # Create bullet at ship's nose
-                    nose_x = self.ship.x + SHIP_SIZE * math.sin(math.radians(self.ship.angle))
-                    nose_y = self.ship.y - SHIP_SIZE * math.cos(math.radians(self.ship.angle))
-                    self.bullets.append(Bullet(nose_x, nose_y, self.ship.angle))
+                    cos, sin = rotation.cos_sin(self.ship.angle)
+                    nose_x = self.ship.x + SHIP_SIZE * sin
+                    nose_y = self.ship.y - SHIP_SIZE * cos
+                    self.bullets.acquire(nose_x, nose_y, self.ship.angle)
                 elif event.key == pygame.K_r and self.game_over:
                     self.__init__()
 
@@ -266,9 +292,9 @@ class Game:
             particle.move()
 
         # Remove inactive objects
-        self.bullets = [b for b in self.bullets if b.active]
+        self.bullets.release_inactive()
         self.asteroids = [a for a in self.asteroids if a.active]
-        self.particles = [p for p in self.particles if p.active]
+        self.particles.release_inactive()
 
         # Check bullet-asteroid collisions
         for bullet in self.bullets:
@@ -339,8 +365,11 @@ class Game:
 
         pygame.display.flip()
 
-def main():
+def run():
+    init()
+    rng.report()
     game = Game()
+    frame_profiler.attach(game)
 
     while True:
         game.handle_input()
@@ -349,4 +378,4 @@ def main():
         clock.tick(FPS)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    run() 
\ No newline at end of file
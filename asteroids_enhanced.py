@@ -6,14 +6,19 @@
 import pygame
 import sys
 import math
-import random
 import json
 import os
 from enum import Enum
 
-# Initialize Pygame
-pygame.init()
-pygame.mixer.init()
+import collision
+from entity_pool import EntityPool
+import frame_profiler
+import rng
+import rotation
+
+# Random streams
+spawn_rng = rng.stream(rng.SPAWN)
+cosmetic_rng = rng.stream(rng.COSMETIC)
 
 # Constants
 WINDOW_WIDTH = 800
@@ -40,7 +45,7 @@ INVULNERABILITY_TIME = 180  # 3 seconds at 60 FPS
 # Bullet Settings
 BULLET_SPEED = 10
 BULLET_LIFETIME = 60  # frames
-MAX_BULLETS = 5
+MAX_BULLETS = 64  # Pool size; shots past this are dropped
 SPREAD_SHOT_ANGLE = 15  # degrees
 
 # Asteroid Settings
@@ -61,13 +66,41 @@ POWERUP_SPEED = 2
 PARTICLE_COUNT = 10
 PARTICLE_LIFETIME = 20  # frames
 PARTICLE_SPEED = 3
+MAX_PARTICLES = 256  # Pool size; explosions past this are trimmed
+
+# Outlines, rotated once per angle and then reused
+SHIP_HULL = rotation.Polygon([
+    (0, -SHIP_SIZE),  # Nose
+    (-SHIP_SIZE, SHIP_SIZE),  # Left
+    (0, SHIP_SIZE/2),  # Back center
+    (SHIP_SIZE, SHIP_SIZE),  # Right
+])
+SHIP_FLAME = rotation.Polygon([
+    (-SHIP_SIZE/2, SHIP_SIZE),  # Left
+    (0, SHIP_SIZE * 1.5),  # Tip
+    (SHIP_SIZE/2, SHIP_SIZE),  # Right
+])
+SQUARE = rotation.Polygon([(-1, -1), (1, -1), (1, 1), (-1, 1)])
+POWERUP_DIAMOND = rotation.Polygon([
+    (0, -10),  # Top
+    (10, 0),   # Right
+    (0, 10),   # Bottom
+    (-10, 0),  # Left
+])
 SCREEN_SHAKE_DURATION = 10  # frames
 SCREEN_SHAKE_INTENSITY = 5
 
-# Setup Display
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Enhanced Asteroids")
-clock = pygame.time.Clock()
+# Setup Display, done by init() rather than on import
+screen = None
+clock = None
+
+def init():
+    global screen, clock
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption("Enhanced Asteroids")
+    clock = pygame.time.Clock()
 
 # Load or create high scores
 def load_high_scores():
@@ -92,6 +125,8 @@ class PowerUpType(Enum):
     LIFE = 'life'
 
 class GameObject:
+    __slots__ = ('x', 'y', 'dx', 'dy', 'size', 'angle', 'shape', 'active')
+
     def __init__(self, x, y, size):
         self.x = x
         self.y = y
@@ -99,7 +134,7 @@ class GameObject:
         self.dy = 0
         self.size = size
         self.angle = 0
-        self.shape = []
+        self.shape = None  # A rotation.Polygon
         self.active = True
 
     def move(self):
@@ -107,16 +142,7 @@ class GameObject:
         self.y = (self.y + self.dy) % WINDOW_HEIGHT
 
     def get_vertices(self):
-        vertices = []
-        for point in self.shape:
-            x = point[0]
-            y = point[1]
-            # Rotate
-            rx = x * math.cos(math.radians(self.angle)) - y * math.sin(math.radians(self.angle))
-            ry = x * math.sin(math.radians(self.angle)) + y * math.cos(math.radians(self.angle))
-            # Translate
-            vertices.append((rx + self.x, ry + self.y))
-        return vertices
+        return self.shape.place(self.x, self.y, self.angle)
 
     def draw(self):
         if not self.active:
@@ -129,20 +155,12 @@ class GameObject:
         if not (self.active and other.active):
             return False
         # Simple circle collision
-        dx = self.x - other.x
-        dy = self.y - other.y
-        distance = math.sqrt(dx * dx + dy * dy)
-        return distance < (self.size + other.size)
+        return collision.circles_overlap(self.x, self.y, self.size, other.x, other.y, other.size)
 
 class Ship(GameObject):
     def __init__(self):
         super().__init__(WINDOW_WIDTH//2, WINDOW_HEIGHT//2, SHIP_SIZE)
-        self.shape = [
-            (0, -self.size),  # Nose
-            (-self.size, self.size),  # Left
-            (0, self.size/2),  # Back center
-            (self.size, self.size),  # Right
-        ]
+        self.shape = SHIP_HULL
         self.thrusting = False
         self.lives = 3
         self.invulnerable = 0
@@ -155,8 +173,9 @@ class Ship(GameObject):
 
     def thrust(self):
         speed = self.base_speed * (1.5 if self.powerups[PowerUpType.SPEED] > 0 else 1.0)
-        self.dx += speed * math.sin(math.radians(self.angle))
-        self.dy -= speed * math.cos(math.radians(self.angle))
+        cos, sin = rotation.cos_sin(self.angle)
+        self.dx += speed * sin
+        self.dy -= speed * cos
         # Limit speed
         current_speed = math.sqrt(self.dx * self.dx + self.dy * self.dy)
         if current_speed > MAX_SPEED:
@@ -184,31 +203,29 @@ class Ship(GameObject):
         super().draw()
         # Draw thrust
         if self.thrusting:
-            thrust_points = [
-                (-self.size/2, self.size),  # Left
-                (0, self.size * 1.5),  # Tip
-                (self.size/2, self.size),  # Right
-            ]
-            vertices = []
-            for point in thrust_points:
-                x = point[0]
-                y = point[1]
-                rx = x * math.cos(math.radians(self.angle)) - y * math.sin(math.radians(self.angle))
-                ry = x * math.sin(math.radians(self.angle)) + y * math.cos(math.radians(self.angle))
-                vertices.append((rx + self.x, ry + self.y))
-            pygame.draw.lines(screen, RED, True, vertices, 2)
+            pygame.draw.lines(screen, RED, True, SHIP_FLAME.place(self.x, self.y, self.angle), 2)
         
         # Draw shield if active
         if self.powerups[PowerUpType.SHIELD] > 0:
             pygame.draw.circle(screen, BLUE, (int(self.x), int(self.y)), self.size * 1.5, 2)
 
 class Bullet(GameObject):
-    def __init__(self, x, y, angle):
-        super().__init__(x, y, 2)
-        self.dx = BULLET_SPEED * math.sin(math.radians(angle))
-        self.dy = -BULLET_SPEED * math.cos(math.radians(angle))
+    # Pooled: created once by the Game's EntityPool, then respawned
+    __slots__ = ('lifetime', 'pool_index')
+
+    def __init__(self):
+        super().__init__(0, 0, 2)
+        self.lifetime = 0
+        self.shape = SQUARE
+
+    def spawn(self, x, y, angle):
+        self.x = x
+        self.y = y
+        cos, sin = rotation.cos_sin(angle)
+        self.dx = BULLET_SPEED * sin
+        self.dy = -BULLET_SPEED * cos
         self.lifetime = BULLET_LIFETIME
-        self.shape = [(-1, -1), (1, -1), (1, 1), (-1, 1)]
+        self.active = True
 
     def move(self):
         super().move()
@@ -223,21 +240,23 @@ class Asteroid(GameObject):
         self.size_index = size_index
         self.points = ASTEROID_POINTS[size_index]
         # Create irregular polygon shape
-        self.shape = []
-        num_vertices = random.randint(8, 12)
+        points = []
+        num_vertices = cosmetic_rng.randint(8, 12)
         for i in range(num_vertices):
             angle = (i / num_vertices) * 2 * math.pi
-            radius = size * random.uniform(0.8, 1.2)
-            self.shape.append((
+            radius = size * cosmetic_rng.uniform(0.8, 1.2)
+            points.append((
                 radius * math.cos(angle),
                 radius * math.sin(angle)
             ))
+        # It turns a little every frame, so rotations aren't worth keeping
+        self.shape = rotation.Polygon(points, keep=0)
         # Random movement
         speed = ASTEROID_SPEEDS[size_index] * speed_multiplier
-        angle = random.uniform(0, 2 * math.pi)
+        angle = spawn_rng.uniform(0, 2 * math.pi)
         self.dx = speed * math.cos(angle)
         self.dy = speed * math.sin(angle)
-        self.rotation_speed = random.uniform(-3, 3)
+        self.rotation_speed = cosmetic_rng.uniform(-3, 3)
 
     def move(self):
         super().move()
@@ -248,15 +267,9 @@ class PowerUp(GameObject):
         super().__init__(x, y, 10)
         self.powerup_type = powerup_type
         self.lifetime = POWERUP_DURATION
-        # Create diamond shape
-        self.shape = [
-            (0, -self.size),  # Top
-            (self.size, 0),   # Right
-            (0, self.size),   # Bottom
-            (-self.size, 0),  # Left
-        ]
+        self.shape = POWERUP_DIAMOND
         # Random movement
-        angle = random.uniform(0, 2 * math.pi)
+        angle = spawn_rng.uniform(0, 2 * math.pi)
         self.dx = POWERUP_SPEED * math.cos(angle)
         self.dy = POWERUP_SPEED * math.sin(angle)
 
@@ -279,14 +292,26 @@ class PowerUp(GameObject):
         pygame.draw.lines(screen, color, True, vertices, 2)
 
 class Particle(GameObject):
-    def __init__(self, x, y, angle, color=WHITE):
-        super().__init__(x, y, 1)
-        speed = random.uniform(1, PARTICLE_SPEED)
-        self.dx = speed * math.cos(math.radians(angle))
-        self.dy = speed * math.sin(math.radians(angle))
-        self.lifetime = random.randint(10, PARTICLE_LIFETIME)
-        self.shape = [(-1, -1), (1, -1), (1, 1), (-1, 1)]
+    # Pooled: created once by the Game's EntityPool, then respawned
+    __slots__ = ('lifetime', 'color', 'pool_index')
+
+    def __init__(self):
+        super().__init__(0, 0, 1)
+        self.lifetime = 0
+        self.shape = SQUARE
+        self.color = WHITE
+
+    def spawn(self, x, y, angle, color=WHITE):
+        self.x = x
+        self.y = y
+        speed = cosmetic_rng.uniform(1, PARTICLE_SPEED)
+        # Only for show, so the rounded table will do
+        cos, sin = rotation.table_cos_sin(angle)
+        self.dx = speed * cos
+        self.dy = speed * sin
+        self.lifetime = cosmetic_rng.randint(10, PARTICLE_LIFETIME)
         self.color = color
+        self.active = True
 
     def move(self):
         super().move()
@@ -306,10 +331,10 @@ class Game:
 
     def reset_game(self):
         self.ship = Ship()
-        self.bullets = []
+        self.bullets = EntityPool(Bullet, MAX_BULLETS)
         self.asteroids = []
         self.powerups = []
-        self.particles = []
+        self.particles = EntityPool(Particle, MAX_PARTICLES)
         self.score = 0
         self.wave = 1
         self.game_over = False
@@ -322,16 +347,16 @@ class Game:
         for _ in range(count):
             # Spawn away from the ship
             while True:
-                x = random.randint(0, WINDOW_WIDTH)
-                y = random.randint(0, WINDOW_HEIGHT)
+                x = spawn_rng.randint(0, WINDOW_WIDTH)
+                y = spawn_rng.randint(0, WINDOW_HEIGHT)
                 if math.sqrt((x - self.ship.x)**2 + (y - self.ship.y)**2) > 200:
                     break
             self.asteroids.append(Asteroid(x, y, 0, speed_multiplier))
 
     def create_particles(self, x, y, count, color=WHITE):
         for _ in range(count):
-            angle = random.uniform(0, 360)
-            self.particles.append(Particle(x, y, angle, color))
+            angle = cosmetic_rng.uniform(0, 360)
+            self.particles.acquire(x, y, angle, color)
 
     def apply_screen_shake(self):
         self.screen_shake = SCREEN_SHAKE_DURATION
@@ -345,14 +370,15 @@ class Game:
                 if event.key == pygame.K_SPACE:
                     if not self.game_over:
                         # Create bullet(s) at ship's nose
-                        nose_x = self.ship.x + SHIP_SIZE * math.sin(math.radians(self.ship.angle))
-                        nose_y = self.ship.y - SHIP_SIZE * math.cos(math.radians(self.ship.angle))
+                        cos, sin = rotation.cos_sin(self.ship.angle)
+                        nose_x = self.ship.x + SHIP_SIZE * sin
+                        nose_y = self.ship.y - SHIP_SIZE * cos
                         if self.ship.powerups[PowerUpType.SPREAD] > 0:
                             # Create spread shot
                             for angle_offset in [-SPREAD_SHOT_ANGLE, 0, SPREAD_SHOT_ANGLE]:
-                                self.bullets.append(Bullet(nose_x, nose_y, self.ship.angle + angle_offset))
+                                self.bullets.acquire(nose_x, nose_y, self.ship.angle + angle_offset)
                         else:
-                            self.bullets.append(Bullet(nose_x, nose_y, self.ship.angle))
+                            self.bullets.acquire(nose_x, nose_y, self.ship.angle)
                 elif event.key == pygame.K_r and self.game_over:
                     self.reset_game()
                 elif event.key == pygame.K_h:
@@ -384,10 +410,10 @@ class Game:
             particle.move()
 
         # Remove inactive objects
-        self.bullets = [b for b in self.bullets if b.active]
+        self.bullets.release_inactive()
         self.asteroids = [a for a in self.asteroids if a.active]
         self.powerups = [p for p in self.powerups if p.active]
-        self.particles = [p for p in self.particles if p.active]
+        self.particles.release_inactive()
 
         # Check bullet-asteroid collisions
         for bullet in self.bullets:
@@ -400,8 +426,8 @@ class Game:
                     self.apply_screen_shake()
                     
                     # Chance to spawn powerup
-                    if random.random() < POWERUP_SPAWN_CHANCE:
-                        powerup_type = random.choice(POWERUP_TYPES)
+                    if spawn_rng.random() < POWERUP_SPAWN_CHANCE:
+                        powerup_type = spawn_rng.choice(POWERUP_TYPES)
                         self.powerups.append(PowerUp(asteroid.x, asteroid.y, PowerUpType(powerup_type)))
                     
                     # Split asteroid if not smallest size
@@ -453,8 +479,8 @@ class Game:
         shake_offset = (0, 0)
         if self.screen_shake > 0:
             shake_offset = (
-                random.randint(-SCREEN_SHAKE_INTENSITY, SCREEN_SHAKE_INTENSITY),
-                random.randint(-SCREEN_SHAKE_INTENSITY, SCREEN_SHAKE_INTENSITY)
+                cosmetic_rng.randint(-SCREEN_SHAKE_INTENSITY, SCREEN_SHAKE_INTENSITY),
+                cosmetic_rng.randint(-SCREEN_SHAKE_INTENSITY, SCREEN_SHAKE_INTENSITY)
             )
 
         screen.fill(BLACK)
@@ -519,8 +545,11 @@ class Game:
 
         pygame.display.flip()
 
-def main():
+def run():
+    init()
+    rng.report()
     game = Game()
+    frame_profiler.attach(game)
 
     while True:
         game.handle_input()
@@ -529,4 +558,4 @@ def main():
         clock.tick(FPS)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    run() 
\ No newline at end of file
@@ -0,0 +1,561 @@
+# Collision Benchmark
+# Description: Checks collision.py against reference formulations, and times both
+#
+#   python bench/collision_bench.py
+#   python bench/collision_bench.py --pairs 50000 --seed 7 --output collision.json
+#
+# Each case runs a reference and its collision.py counterpart over the same
+# random shapes, counts how often they disagree, and times both. The
+# references are the tests the games used to inline, differently written
+# overlap tests, the *_many forms' scalar versions, and for the swept tests
+# a brute force one: step the mover along its path, find the first sample
+# that overlaps and bisect back to the contact. Sweeps are also tried
+# starting exactly touching, already overlapping and standing still.
+#
+# Any disagreement makes it exit non-zero, so it doubles as the module's
+# test. Distance tests landing exactly on the boundary could in principle
+# round differently, but random floats don't land there.
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame
+
+import collision
+
+# Benchmark Settings
+PAIRS = 20000
+SEED = 1
+FIELD = 200       # Shapes land in a FIELD x FIELD square so about half overlap
+MAX_SIZE = 60
+MAX_SPEED = 80
+T_TOLERANCE = 1e-9
+SWEEP_CASES = 2000    # Per swept test; the sampled reference is slow
+SWEEP_SAMPLES = 200   # Steps along each move before bisecting
+T_SAMPLED = 1e-7      # Allowed gap between a contact time and the reference's
+CONTACT_TOLERANCE = 1e-6  # How close the shapes must be at a reported contact
+GRAZE = 1e-7          # Step past a contact the samples missed to confirm it
+
+
+def random_rect(r):
+    return (r.randint(0, FIELD), r.randint(0, FIELD), r.randint(1, MAX_SIZE), r.randint(1, MAX_SIZE))
+
+
+def random_circle(r):
+    return (r.uniform(0, FIELD), r.uniform(0, FIELD), r.uniform(1, MAX_SIZE / 2))
+
+
+def random_velocity(r):
+    return (r.uniform(-MAX_SPEED, MAX_SPEED), r.uniform(-MAX_SPEED, MAX_SPEED))
+
+
+def random_polygon(r, near=None):
+    # Convex: points on a circle at sorted random angles
+    x, y, radius = random_circle(r)
+    if near:
+        x = near[0][0] + r.uniform(-MAX_SIZE, MAX_SIZE)
+        y = near[0][1] + r.uniform(-MAX_SIZE, MAX_SIZE)
+    angles = sorted(r.uniform(0, 2 * math.pi) for _ in range(r.randint(3, 6)))
+    return [(x + radius * math.cos(angle), y + radius * math.sin(angle)) for angle in angles]
+
+
+def face_velocity(r, normal_x, normal_y):
+    """A move into, out of or along a face whose outward normal is given."""
+    speed = r.uniform(1, MAX_SPEED)
+    slide = r.uniform(-MAX_SPEED, MAX_SPEED)
+    way = r.choice((-1, 1, 0))
+    if way == 0:
+        return -normal_y * speed, normal_x * speed
+    return way * speed * normal_x - slide * normal_y, way * speed * normal_y + slide * normal_x
+
+
+def rect_points(left, top, width, height):
+    return [(left, top), (left + width, top), (left + width, top + height), (left, top + height)]
+
+
+def same_hit(a, b):
+    if a is None or b is None:
+        return a is b
+    return all(abs(x - y) <= T_TOLERANCE for x, y in zip(a, b))
+
+
+def timed(fn, inputs):
+    start = time.perf_counter()
+    results = [fn(*args) for args in inputs]
+    return results, (time.perf_counter() - start) * 1000
+
+
+def compare(name, old, new, inputs, equal=None):
+    old_results, old_ms = timed(old, inputs)
+    new_results, new_ms = timed(new, inputs)
+    equal = equal or (lambda a, b: a == b)
+    mismatches = sum(not equal(a, b) for a, b in zip(old_results, new_results))
+    hits = sum(result not in (None, False) for result in new_results)
+    print(f"{name:<30} {len(inputs):>7} {hits:>7} {mismatches:>9} {old_ms:9.1f} {new_ms:9.1f}")
+    return {'pairs': len(inputs), 'hits': hits, 'mismatches': mismatches,
+            'reference_ms': old_ms, 'new_ms': new_ms}
+
+
+def verify(name, fn, check, cases):
+    """Like compare, but check(*case, result) judges each result itself."""
+    results, new_ms = timed(fn, cases)
+    start = time.perf_counter()
+    mismatches = sum(not check(*case, result) for case, result in zip(cases, results))
+    reference_ms = (time.perf_counter() - start) * 1000
+    hits = sum(result not in (None, False) for result in results)
+    print(f"{name:<30} {len(cases):>7} {hits:>7} {mismatches:>9} {reference_ms:9.1f} {new_ms:9.1f}")
+    return {'pairs': len(cases), 'hits': hits, 'mismatches': mismatches,
+            'reference_ms': reference_ms, 'new_ms': new_ms}
+
+
+# The tests as the games wrote them before collision.py
+
+def old_rect(ax, ay, aw, ah, bx, by, bw, bh):
+    return pygame.Rect(ax, ay, aw, ah).colliderect(pygame.Rect(bx, by, bw, bh))
+
+
+def old_centers(ax, ay, bx, by, half_width, half_height):
+    return abs(ax - bx) < half_width and abs(ay - by) < half_height
+
+
+def old_circles(ax, ay, ar, bx, by, br):
+    dx = ax - bx
+    dy = ay - by
+    return math.sqrt(dx * dx + dy * dy) < ar + br
+
+
+def old_point(px, py, cx, cy, radius):
+    return math.sqrt((px - cx) ** 2 + (py - cy) ** 2) < radius
+
+
+def run_scalar(r, pairs):
+    results = {}
+    rects = [random_rect(r) + random_rect(r) for _ in range(pairs)]
+    results['rects_overlap'] = compare('rects_overlap vs Rect', old_rect, collision.rects_overlap, rects)
+    results['polygons_overlap'] = compare(
+        'polygons_overlap vs Rect', old_rect,
+        lambda ax, ay, aw, ah, bx, by, bw, bh: collision.polygons_overlap(
+            rect_points(ax, ay, aw, ah), rect_points(bx, by, bw, bh)),
+        rects)
+
+    centres = [(r.uniform(0, FIELD), r.uniform(0, FIELD), r.uniform(0, FIELD), r.uniform(0, FIELD),
+                r.uniform(1, MAX_SIZE), r.uniform(1, MAX_SIZE)) for _ in range(pairs)]
+    results['centers_within'] = compare('centers_within', old_centers, collision.centers_within, centres)
+
+    circles = [random_circle(r) + random_circle(r) for _ in range(pairs)]
+    results['circles_overlap'] = compare('circles_overlap vs sqrt', old_circles, collision.circles_overlap,
+                                         circles)
+    points = [(r.uniform(0, FIELD), r.uniform(0, FIELD)) + random_circle(r) for _ in range(pairs)]
+    results['point_in_circle'] = compare('point_in_circle vs sqrt', old_point, collision.point_in_circle,
+                                         points)
+
+    moves = [random_rect(r)[:4] + (r.uniform(-MAX_SPEED, MAX_SPEED), r.uniform(-MAX_SPEED, MAX_SPEED))
+             + random_rect(r) for _ in range(pairs)]
+    results['sweep_polygons_rects'] = compare(
+        'sweep_polygons vs sweep_rects', collision.sweep_rects,
+        lambda ax, ay, aw, ah, dx, dy, bx, by, bw, bh: collision.sweep_polygons(
+            rect_points(ax, ay, aw, ah), dx, dy, rect_points(bx, by, bw, bh)),
+        moves, same_hit)
+    return results
+
+
+def run_batches(r, pairs):
+    try:
+        import numpy as np
+    except ImportError:
+        print("numpy isn't installed, skipping the *_many forms")
+        return {}
+    results = {}
+    side = int(math.sqrt(pairs))
+
+    def batch(name, scalar, many, inputs, split, equal):
+        # Every a against every b, as a loop of scalar calls and as one broadcast call
+        a, b = split(inputs)
+        start = time.perf_counter()
+        loop = [[scalar(*x, *y) for y in b] for x in a]
+        loop_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        grid = many(a, b)
+        many_ms = (time.perf_counter() - start) * 1000
+        mismatches = sum(not equal(loop[i][j], grid[i, j]) for i in range(len(a)) for j in range(len(b)))
+        hits = int(np.count_nonzero(grid if grid.dtype == bool else np.isfinite(grid)))
+        print(f"{name:<30} {side * side:>7} {hits:>7} {mismatches:>9} {loop_ms:9.1f} {many_ms:9.1f}")
+        results[name] = {'pairs': side * side, 'hits': hits, 'mismatches': mismatches,
+                         'reference_ms': loop_ms, 'new_ms': many_ms}
+
+    rects = [random_rect(r) for _ in range(2 * side)]
+    batch('rects_overlap_many', collision.rects_overlap,
+          lambda a, b: collision.rects_overlap_many(np.array(a)[:, None, :], np.array(b)[None, :, :]),
+          rects, lambda rs: (rs[:side], rs[side:]), lambda x, y: x == bool(y))
+
+    radius = MAX_SIZE / 2
+    centres = [(r.uniform(0, FIELD), r.uniform(0, FIELD)) for _ in range(2 * side)]
+    batch('centers_within_many', lambda ax, ay, bx, by: collision.centers_within(ax, ay, bx, by, radius, radius),
+          lambda a, b: collision.centers_within_many(np.array(a)[:, None, :], np.array(b)[None, :, :],
+                                                     (radius, radius)),
+          centres, lambda cs: (cs[:side], cs[side:]), lambda x, y: x == bool(y))
+    batch('circles_overlap_many', lambda ax, ay, bx, by: collision.circles_overlap(ax, ay, radius / 2,
+                                                                                  bx, by, radius / 2),
+          lambda a, b: collision.circles_overlap_many(np.array(a)[:, None, :], np.array(b)[None, :, :], radius),
+          centres, lambda cs: (cs[:side], cs[side:]), lambda x, y: x == bool(y))
+
+    velocity = [(r.uniform(-MAX_SPEED, MAX_SPEED), r.uniform(-MAX_SPEED, MAX_SPEED)) for _ in range(side)]
+    movers = [c + v for c, v in zip(centres[:side], velocity)]
+
+    def sweep_t(ax, ay, dx, dy, bx, by):
+        hit = collision.sweep_circles(ax, ay, radius / 2, dx, dy, bx, by, radius / 2)
+        return math.inf if hit is None else hit[0]
+
+    batch('sweep_circles_many', sweep_t,
+          lambda a, b: collision.sweep_circles_many(np.array(a)[:, None, :2], np.array(a)[:, None, 2:],
+                                                    np.array(b)[None, :, :], radius),
+          None, lambda _: (movers, centres[side:]),
+          lambda x, y: x == y or abs(x - y) <= T_TOLERANCE)
+    return results
+
+
+# Independent overlap tests, written differently from collision.py's
+
+def rect_reference(ax, ay, aw, ah, bx, by, bw, bh):
+    # The intersection has some area
+    return (min(ax + aw, bx + bw) - max(ax, bx) > 0 and
+            min(ay + ah, by + bh) - max(ay, by) > 0)
+
+
+def circles_reference(ax, ay, ar, bx, by, br):
+    return math.hypot(ax - bx, ay - by) < ar + br
+
+
+def segment_distance(px, py, x1, y1, x2, y2):
+    length = (x2 - x1) ** 2 + (y2 - y1) ** 2
+    along = max(0, min(1, ((px - x1) * (x2 - x1) + (py - y1) * (y2 - y1)) / length))
+    return math.hypot(px - (x1 + (x2 - x1) * along), py - (y1 + (y2 - y1) * along))
+
+
+def circle_rect_reference(x, y, radius, left, top, width, height):
+    # Centre inside, or closer than radius to an edge
+    if left < x < left + width and top < y < top + height:
+        return True
+    corners = rect_points(left, top, width, height)
+    return any(segment_distance(x, y, *corners[i - 1], *corners[i]) < radius for i in range(4))
+
+
+def cross(ox, oy, ax, ay, bx, by):
+    return (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
+
+
+def inside(x, y, polygon):
+    sides = [cross(*polygon[i - 1], *polygon[i], x, y) for i in range(len(polygon))]
+    return all(side > 0 for side in sides) or all(side < 0 for side in sides)
+
+
+def polygons_reference(a, b):
+    # A corner of one inside the other, or two edges crossing
+    if any(inside(x, y, b) for x, y in a) or any(inside(x, y, a) for x, y in b):
+        return True
+    for i in range(len(a)):
+        for j in range(len(b)):
+            if (cross(*b[j - 1], *b[j], *a[i - 1]) * cross(*b[j - 1], *b[j], *a[i]) < 0 and
+                    cross(*a[i - 1], *a[i], *b[j - 1]) * cross(*a[i - 1], *a[i], *b[j]) < 0):
+                return True
+    return False
+
+
+def first_contact(overlap):
+    """The first t in [0, 1] where overlap(t) starts, found by sampling and
+    then bisecting; None if no sample overlaps."""
+    previous = 0.0
+    for step in range(1, SWEEP_SAMPLES + 1):
+        t = step / SWEEP_SAMPLES
+        if overlap(t):
+            low, high = previous, t
+            for _ in range(60):
+                middle = (low + high) / 2
+                if overlap(middle):
+                    high = middle
+                else:
+                    low = middle
+            return high
+        previous = t
+    return None
+
+
+def check_sweep(result, overlap, moving_in, contact_ok):
+    """Whether a swept test's result agrees with the sampled reference.
+
+    overlap(t) is the reference overlap with the mover t of the way along.
+    moving_in says whether shapes that already overlap should report t=0
+    (None accepts either answer), and contact_ok(t, nx, ny) checks where
+    the shapes are and the normal at a reported contact.
+    """
+    if overlap(0.0):
+        if result is None:
+            return not moving_in
+        return moving_in is not False and result[0] == 0 and contact_ok(*result)
+    expected = first_contact(overlap)
+    if result is None:
+        return expected is None
+    t = result[0]
+    if expected is None:
+        # Too brief a graze for the samples to catch
+        if not overlap(t + GRAZE):
+            return False
+        expected = t
+    return abs(t - expected) <= T_SAMPLED and contact_ok(*result)
+
+
+def shallowest(ways):
+    # ways holds (depth, normal_x, normal_y) for each way out
+    return min(ways)[1:]
+
+
+def check_sweep_rects(ax, ay, aw, ah, dx, dy, bx, by, bw, bh, result):
+    def overlap(t):
+        return rect_reference(ax + dx * t, ay + dy * t, aw, ah, bx, by, bw, bh)
+
+    out = shallowest([(ax + aw - bx, -1, 0), (bx + bw - ax, 1, 0),
+                      (ay + ah - by, 0, -1), (by + bh - ay, 0, 1)])
+
+    def contact_ok(t, normal_x, normal_y):
+        if t == 0 and overlap(0):
+            return (normal_x, normal_y) == out
+        # The faces the normal names must meet
+        x = ax + dx * t
+        y = ay + dy * t
+        faces = {(-1, 0): x + aw - bx, (1, 0): bx + bw - x, (0, -1): y + ah - by, (0, 1): by + bh - y}
+        gap = faces.get((round(normal_x), round(normal_y)), math.inf)
+        return abs(gap) <= CONTACT_TOLERANCE and dx * normal_x + dy * normal_y < 0
+
+    return check_sweep(result, overlap, dx * out[0] + dy * out[1] < 0, contact_ok)
+
+
+def check_sweep_circles(ax, ay, ar, dx, dy, bx, by, br, result):
+    def overlap(t):
+        return circles_reference(ax + dx * t, ay + dy * t, ar, bx, by, br)
+
+    def contact_ok(t, normal_x, normal_y):
+        gap_x = ax + dx * t - bx
+        gap_y = ay + dy * t - by
+        distance = math.hypot(gap_x, gap_y)
+        if not (t == 0 and overlap(0)) and abs(distance - (ar + br)) > CONTACT_TOLERANCE:
+            return False
+        return (abs(normal_x - gap_x / distance) <= CONTACT_TOLERANCE and
+                abs(normal_y - gap_y / distance) <= CONTACT_TOLERANCE)
+
+    return check_sweep(result, overlap, (ax - bx) * dx + (ay - by) * dy < 0, contact_ok)
+
+
+def check_sweep_circle_rect(x, y, dx, dy, radius, left, top, width, height, result):
+    def overlap(t):
+        return circle_rect_reference(x + dx * t, y + dy * t, radius, left, top, width, height)
+
+    right = left + width
+    bottom = top + height
+    out = shallowest([(x - (left - radius), -1, 0), ((right + radius) - x, 1, 0),
+                      (y - (top - radius), 0, -1), ((bottom + radius) - y, 0, 1)])
+
+    def contact_ok(t, normal_x, normal_y):
+        if t == 0 and overlap(0):
+            return (normal_x, normal_y) == out
+        # Touching the closest point of the rect, with the normal pointing from it
+        centre_x = x + dx * t
+        centre_y = y + dy * t
+        gap_x = centre_x - max(left, min(centre_x, right))
+        gap_y = centre_y - max(top, min(centre_y, bottom))
+        distance = math.hypot(gap_x, gap_y)
+        return (abs(distance - radius) <= CONTACT_TOLERANCE and
+                abs(normal_x - gap_x / distance) <= CONTACT_TOLERANCE and
+                abs(normal_y - gap_y / distance) <= CONTACT_TOLERANCE)
+
+    return check_sweep(result, overlap, dx * out[0] + dy * out[1] < 0, contact_ok)
+
+
+def check_sweep_polygons(a, dx, dy, b, result):
+    def overlap(t):
+        return polygons_reference([(x + dx * t, y + dy * t) for x, y in a], b)
+
+    def contact_ok(t, normal_x, normal_y):
+        return (abs(math.hypot(normal_x, normal_y) - 1) <= CONTACT_TOLERANCE and
+                dx * normal_x + dy * normal_y < 0)
+
+    # Which way out is shallowest for overlapping polygons isn't checked
+    return check_sweep(result, overlap, None, contact_ok)
+
+
+def rect_moves(r, count):
+    """Rect sweeps: a quarter each random, standing still, starting
+    in line with one of b's faces (touching it, or off past its corners),
+    and starting overlapping."""
+    cases = []
+    for i in range(count):
+        ax, ay, aw, ah = random_rect(r)
+        bx, by, bw, bh = random_rect(r)
+        dx, dy = random_velocity(r)
+        if i % 4 == 1:
+            dx = dy = 0
+        elif i % 4 == 2:
+            side = r.randrange(4)
+            if side < 2:
+                ax = bx - aw if side == 0 else bx + bw
+                ay = r.randint(by - ah - MAX_SIZE, by + bh + MAX_SIZE)
+                dx, dy = face_velocity(r, -1 if side == 0 else 1, 0)
+            else:
+                ay = by - ah if side == 2 else by + bh
+                ax = r.randint(bx - aw - MAX_SIZE, bx + bw + MAX_SIZE)
+                dx, dy = face_velocity(r, 0, -1 if side == 2 else 1)
+        elif i % 4 == 3:
+            ax = r.randint(bx - aw + 1, bx + bw - 1)
+            ay = r.randint(by - ah + 1, by + bh - 1)
+        cases.append((ax, ay, aw, ah, dx, dy, bx, by, bw, bh))
+    return cases
+
+
+def circle_moves(r, count):
+    """Circle sweeps, split the same way as rect_moves. Touching circles
+    sit on an axis with whole number sizes so they touch exactly."""
+    cases = []
+    for i in range(count):
+        ax, ay, ar = random_circle(r)
+        bx, by, br = random_circle(r)
+        dx, dy = random_velocity(r)
+        if i % 4 == 1:
+            dx = dy = 0
+        elif i % 4 == 2:
+            bx, by, ar, br = r.randint(0, FIELD), r.randint(0, FIELD), r.randint(1, 30), r.randint(1, 30)
+            normal_x, normal_y = r.choice(((1, 0), (-1, 0), (0, 1), (0, -1)))
+            ax = bx + normal_x * (ar + br)
+            ay = by + normal_y * (ar + br)
+            dx, dy = face_velocity(r, normal_x, normal_y)
+        elif i % 4 == 3:
+            angle = r.uniform(0, 2 * math.pi)
+            distance = r.uniform(0, 0.9) * (ar + br)
+            ax = bx + distance * math.cos(angle)
+            ay = by + distance * math.sin(angle)
+        cases.append((ax, ay, ar, dx, dy, bx, by, br))
+    return cases
+
+
+def circle_rect_moves(r, count):
+    """Circle against rect sweeps, split the same way as rect_moves."""
+    cases = []
+    for i in range(count):
+        x, y, radius = random_circle(r)
+        left, top, width, height = random_rect(r)
+        dx, dy = random_velocity(r)
+        if i % 4 == 1:
+            dx = dy = 0
+        elif i % 4 == 2:
+            radius = r.randint(1, 30)
+            side = r.randrange(4)
+            if side < 2:
+                x = left - radius if side == 0 else left + width + radius
+                y = r.uniform(top, top + height)
+                dx, dy = face_velocity(r, -1 if side == 0 else 1, 0)
+            else:
+                y = top - radius if side == 2 else top + height + radius
+                x = r.uniform(left, left + width)
+                dx, dy = face_velocity(r, 0, -1 if side == 2 else 1)
+        elif i % 4 == 3:
+            x = r.uniform(left - radius * 0.7, left + width + radius * 0.7)
+            y = r.uniform(top - radius * 0.7, top + height + radius * 0.7)
+        cases.append((x, y, dx, dy, radius, left, top, width, height))
+    return cases
+
+
+def polygon_moves(r, count):
+    """Convex polygon sweeps from a little way apart (or overlapping),
+    a quarter of them standing still."""
+    cases = []
+    for i in range(count):
+        dx, dy = (0, 0) if i % 4 == 1 else random_velocity(r)
+        a = random_polygon(r)
+        cases.append((a, dx, dy, random_polygon(r, near=a)))
+    return cases
+
+
+def run_references(r, pairs, sweeps):
+    results = {}
+    spots = [(r.uniform(0, FIELD), r.uniform(0, FIELD), r.uniform(1, MAX_SIZE / 2)) + random_rect(r)
+             for _ in range(pairs)]
+    results['circle_rect_overlap'] = verify(
+        'circle_rect_overlap', collision.circle_rect_overlap,
+        lambda *case: case[-1] == circle_rect_reference(*case[:-1]), spots)
+    polygons = [(random_polygon(r), random_polygon(r)) for _ in range(pairs // 10)]
+    results['polygons_overlap_convex'] = verify(
+        'polygons_overlap vs edges', collision.polygons_overlap,
+        lambda a, b, result: result == polygons_reference(a, b), polygons)
+
+    rect_cases = rect_moves(r, sweeps)
+    results['sweep_rects'] = verify('sweep_rects vs sampled', collision.sweep_rects,
+                                    check_sweep_rects, rect_cases)
+    results['sweep_polygons_rects_sampled'] = verify(
+        'sweep_polygons rects sampled',
+        lambda ax, ay, aw, ah, dx, dy, bx, by, bw, bh: collision.sweep_polygons(
+            rect_points(ax, ay, aw, ah), dx, dy, rect_points(bx, by, bw, bh)),
+        check_sweep_rects, rect_cases)
+    results['sweep_polygons_sampled'] = verify('sweep_polygons vs sampled', collision.sweep_polygons,
+                                              check_sweep_polygons, polygon_moves(r, sweeps // 10))
+    circle_cases = circle_moves(r, sweeps)
+    results['sweep_circles'] = verify('sweep_circles vs sampled', collision.sweep_circles,
+                                      check_sweep_circles, circle_cases)
+    results['sweep_circle_rect'] = verify('sweep_circle_rect vs sampled', collision.sweep_circle_rect,
+                                          check_sweep_circle_rect, circle_rect_moves(r, sweeps))
+
+    if collision.np is not None:
+        def sweep_circles_many(ax, ay, ar, dx, dy, bx, by, br):
+            # One pair at a time through the batch form, normals as its docstring says
+            t = float(collision.sweep_circles_many((ax, ay), (dx, dy), (bx, by), ar + br))
+            if t == math.inf:
+                return None
+            gap_x = ax + dx * t - bx
+            gap_y = ay + dy * t - by
+            distance = math.hypot(gap_x, gap_y)
+            return t, gap_x / distance, gap_y / distance
+
+        results['sweep_circles_many_sampled'] = verify('sweep_circles_many vs sampled', sweep_circles_many,
+                                               check_sweep_circles, circle_cases)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="collision.py agreement with reference tests, and timings")
+    parser.add_argument('--pairs', type=int, default=PAIRS, help="shape pairs per case")
+    parser.add_argument('--sweeps', type=int, default=SWEEP_CASES, help="cases per swept test")
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--output', help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    r = random.Random(args.seed)
+    print(f"{'case':<30} {'pairs':>7} {'hits':>7} {'mismatch':>9} {'ref ms':>9} {'new ms':>9}")
+    results = {}
+    for part in (run_scalar(r, args.pairs), run_batches(r, args.pairs),
+                 run_references(r, args.pairs, args.sweeps)):
+        assert not results.keys() & part.keys(), "case names must be unique"
+        results.update(part)
+    mismatches = sum(result['mismatches'] for result in results.values())
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'pairs': args.pairs, 'seed': args.seed, 'python': sys.version.split()[0],
+                       'results': results}, f, indent=2)
+        print(f"Wrote {args.output}")
+
+    if mismatches:
+        print(f"FAILED: {mismatches} mismatches")
+        return 1
+    print("All cases agree")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
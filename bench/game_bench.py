@@ -0,0 +1,438 @@
+# Game Benchmark
+# Description: Times every game's update() and draw() headlessly at several entity scales
+#
+#   python bench/game_bench.py                        # all games, results to bench-results.json
+#   python bench/game_bench.py --games pac command --frames 300
+#   python bench/game_bench.py --output new.json --compare baseline.json
+#
+# Games run under the SDL dummy drivers with a fixed seed and scripted
+# input: each scenario holds or taps keys the way a player would, so the
+# same frames are simulated on every run. The input handler, update() and
+# draw() are timed separately per frame. A game that ends is rebuilt
+# (untimed) and the restart counted.
+#
+# --compare exits with status 1 when the p50 of any update or draw phase
+# is more than --threshold slower than in the baseline file.
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import importlib
+import contextlib
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import rng
+from entity_pool import EntityPool
+from frame_profiler import INPUT_METHODS, percentile
+from replay import InputHooks
+
+# Benchmark Settings
+SEED = 1
+FRAMES = 600
+WARMUP_FRAMES = 60
+FRAME_MS = 1000 / 60
+THRESHOLD = 0.15       # Allowed slowdown before --compare fails
+MIN_DELTA_MS = 0.02    # Ignore regressions smaller than this, they are noise
+PHASES = ('input', 'update', 'draw')
+GATED_PHASES = ('update', 'draw')
+
+
+class ScriptedInput(InputHooks):
+    """Feeds the game the keys and clicks a scenario asks for."""
+
+    def __init__(self):
+        super().__init__()
+        self.events = []
+        self.held = set()
+        self.keys = pygame.key.ScancodeWrapper([False] * 512)
+        self.mouse_pos = (0, 0)
+
+    def press(self, key):
+        self.events.append(pygame.event.Event(pygame.KEYDOWN, key=key))
+        self.events.append(pygame.event.Event(pygame.KEYUP, key=key))
+
+    def hold(self, *keys):
+        if set(keys) != self.held:
+            self.held = set(keys)
+            pressed = [False] * 512
+            for key in keys:
+                # get_pressed() is indexed by scancode
+                pressed[getattr(pygame, 'KSCAN_' + pygame.key.name(key).upper())] = True
+            self.keys = pygame.key.ScancodeWrapper(pressed)
+
+    def click(self, x, y):
+        self.mouse_pos = (x, y)
+        self.events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(x, y)))
+        self.events.append(pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=(x, y)))
+
+    def get_events(self, *args, **kwargs):
+        events, self.events = self.events, []
+        return events
+
+    def get_pressed(self):
+        return self.keys
+
+    def get_mouse_pos(self):
+        return self.mouse_pos
+
+
+# Scenarios: each game gets setup(module, scale) -> game and
+# drive(script, game, frame), called before the frame's input handler
+
+def setup_pong(module, scale):
+    game = module.Game()
+    game.in_menu = False
+    game.in_countdown = False
+    return game
+
+
+def drive_pong(script, game, frame):
+    script.hold(pygame.K_w if frame // 40 % 2 else pygame.K_s)
+
+
+def snake_cycle(module):
+    # A loop through every cell: along row 0, snaking back and forth over
+    # columns 1+ of the other rows, then up column 0
+    width, height = module.GRID_WIDTH, module.GRID_HEIGHT
+    cells = [(x, 0) for x in range(width)]
+    for y in range(1, height):
+        columns = range(width - 1, 0, -1) if y % 2 else range(1, width)
+        cells.extend((x, y) for x in columns)
+    cells.extend((0, y) for y in range(height - 1, 0, -1))
+    return cells
+
+
+def setup_snake(module, scale):
+    game = module.Game()
+    cycle = snake_cycle(module)
+    # Head at the start of the loop with the body trailing behind it
+    game.snake.positions = [cycle[-i] for i in range(scale)]
+    game.snake.length = scale
+    game.bench_next = {cell: cycle[(i + 1) % len(cycle)] for i, cell in enumerate(cycle)}
+    return game
+
+
+def drive_snake(script, game, frame):
+    # Follow the loop, so the snake can't run into itself
+    x, y = game.snake.get_head_position()
+    next_x, next_y = game.bench_next[(x, y)]
+    direction = (next_x - x, next_y - y)
+    if direction != game.snake.direction:
+        script.press({(0, -1): pygame.K_UP, (0, 1): pygame.K_DOWN,
+                      (-1, 0): pygame.K_LEFT, (1, 0): pygame.K_RIGHT}[direction])
+
+
+def setup_breakout(module, scale):
+    # scale is the brick count: the default 5x8 wall, then 2x and 4x as
+    # many rows and columns of smaller bricks
+    factor = int((scale // (module.BLOCK_ROWS * module.BLOCK_COLS)) ** 0.5)
+    game = module.Game()
+    game.blocks = module.BlockWall(rows=module.BLOCK_ROWS * factor, cols=module.BLOCK_COLS * factor,
+                                   block_width=module.BLOCK_WIDTH // factor,
+                                   block_height=module.BLOCK_HEIGHT // factor,
+                                   spacing=module.BLOCK_SPACING // factor)
+    game.create_blocks()
+    game.ball.moving = True
+    return game
+
+
+def drive_breakout(script, game, frame):
+    # Keep the paddle under the ball
+    center = game.paddle.x + game.paddle.width / 2
+    if game.ball.x < center - 10:
+        script.hold(pygame.K_LEFT)
+    elif game.ball.x > center + 10:
+        script.hold(pygame.K_RIGHT)
+    else:
+        script.hold()
+    if not game.ball.moving:
+        script.press(pygame.K_SPACE)
+
+
+def setup_space_war(module, scale):
+    # Two ships is the classic game; more is the arena
+    game = module.Game()
+    game.in_menu = False
+    game.game_mode = '1player' if scale == 2 else 'arena'
+    game.arena_ships = scale
+    game.reset_game()
+    return game
+
+
+def drive_space_war(script, game, frame):
+    script.hold(pygame.K_a, pygame.K_w, pygame.K_SPACE)
+
+
+def setup_asteroids(module, scale):
+    game = module.Game()
+    game.asteroids = []
+    game.spawn_asteroids(scale)
+    return game
+
+
+def drive_asteroids(script, game, frame):
+    script.hold(pygame.K_LEFT)
+    if frame % 8 == 0:
+        script.press(pygame.K_SPACE)
+
+
+def setup_frogger(module, scale):
+    game = module.Game()
+    # Rush hour: scale vehicles spread over the road lanes
+    game.build_lanes(vehicles_per_lane=scale // len(module.ROAD_LANES))
+    return game
+
+
+def drive_frogger(script, game, frame):
+    if frame % 20 == 0:
+        script.press((pygame.K_UP, pygame.K_UP, pygame.K_LEFT, pygame.K_UP, pygame.K_RIGHT)[frame // 20 % 5])
+
+
+def setup_pac(module, scale):
+    game = module.Game()
+    colors = [ghost.color for ghost in game.ghosts]
+    for i in range(len(game.ghosts), scale):
+        source = game.ghosts[i % len(colors)]
+        ghost = module.Ghost(source.start_x, source.start_y, colors[i % len(colors)])
+        ghost.direction = source.direction
+        ghost.leave_timer = -(i // len(colors)) * 30  # Stagger them out of the house
+        game.ghosts.append(ghost)
+    game.game_state = 'playing'
+    return game
+
+
+def drive_pac(script, game, frame):
+    if frame % 30 == 0:
+        script.press((pygame.K_LEFT, pygame.K_UP, pygame.K_RIGHT, pygame.K_DOWN)[frame // 30 % 4])
+
+
+def setup_command(module, scale):
+    game = module.Game()
+    # A sky with scale enemy missiles in flight, topped up as they land
+    game.enemy_missiles = EntityPool(module.Missile, scale)
+    for _ in range(scale):
+        game.enemy_missiles.acquire(module.spawn_rng.randint(0, module.WINDOW_WIDTH),
+                                    module.spawn_rng.randint(0, module.WINDOW_HEIGHT // 2),
+                                    module.spawn_rng.randint(0, module.WINDOW_WIDTH),
+                                    module.WINDOW_HEIGHT, True)
+    game.enemy_spawn_delay = max(1, 240 // scale)
+    return game
+
+
+def drive_command(script, game, frame):
+    if frame % 15 == 0 and game.get_total_missiles_left() > 0:
+        script.click(frame * 37 % game.screen.get_width(), 150 + frame % 200)
+
+
+def setup_joust(module, scale):
+    game = module.Game()
+    for _ in range(scale - len(game.enemies)):
+        enemy = module.Enemy(module.spawn_rng.randint(0, module.WIDTH - 40),
+                             module.spawn_rng.randint(0, module.HEIGHT // 2), game.particles)
+        game.enemies.add(enemy)
+        game.all_sprites.add(enemy)
+    return game
+
+
+def drive_joust(script, game, frame):
+    if frame % 12 == 0:
+        script.press(pygame.K_SPACE)
+    if frame % 90 == 0:
+        script.press(pygame.K_LEFT if frame // 90 % 2 else pygame.K_RIGHT)
+
+
+def setup_cave_runner(module, scale):
+    return module.Game()
+
+
+def drive_cave_runner(script, game, frame):
+    script.hold(pygame.K_RIGHT)
+    if frame % 45 == 0:
+        script.press(pygame.K_SPACE)
+
+
+def setup_maze_runner(module, scale):
+    game = module.Game(scale, scale)
+    game.show_hint = True
+    return game
+
+
+def drive_maze_runner(script, game, frame):
+    script.hold((pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_DOWN)[frame // 20 % 4])
+
+
+def setup_space_shooter(module, scale):
+    return module.Game(rows=scale)
+
+
+def drive_space_shooter(script, game, frame):
+    if frame // 60 % 2:
+        script.hold(pygame.K_LEFT, pygame.K_SPACE)
+    else:
+        script.hold(pygame.K_RIGHT, pygame.K_SPACE)
+
+
+# name: (scale knob, scales, setup, drive)
+SCENARIOS = {
+    'pong': ('balls', [1], setup_pong, drive_pong),
+    'snake': ('length', [1, 100, 800], setup_snake, drive_snake),
+    'breakout': ('bricks', [40, 160, 640], setup_breakout, drive_breakout),
+    'space_war': ('ships', [2, 16, 64], setup_space_war, drive_space_war),
+    'asteroids': ('asteroids', [4, 32, 128], setup_asteroids, drive_asteroids),
+    'asteroids_enhanced': ('asteroids', [4, 32, 128], setup_asteroids, drive_asteroids),
+    'frogger': ('vehicles', [12, 120, 480], setup_frogger, drive_frogger),
+    'pac': ('ghosts', [4, 16, 64], setup_pac, drive_pac),
+    'command': ('missiles', [8, 32, 128], setup_command, drive_command),
+    'joust': ('enemies', [3, 12, 48], setup_joust, drive_joust),
+    'cave_runner': ('platforms', [11], setup_cave_runner, drive_cave_runner),
+    'maze_runner': ('maze size', [20, 60, 150], setup_maze_runner, drive_maze_runner),
+    'space_shooter': ('enemy rows', [4, 6, 8], setup_space_shooter, drive_space_shooter),
+}
+
+
+def finished(game):
+    if getattr(game, 'game_over', False):
+        return True
+    if getattr(game, 'game_state', None) in ('game_over', 'win'):
+        return True
+    return getattr(game, 'lives', 1) <= 0  # Frogger only keeps a life count
+
+
+def summarize(times):
+    ordered = sorted(t * 1000 for t in times)
+    return {'mean': sum(ordered) / len(ordered),
+            'p50': percentile(ordered, 0.5),
+            'p95': percentile(ordered, 0.95)}
+
+
+def run_scenario(name, scale, frames, script):
+    knob, scales, setup, drive = SCENARIOS[name]
+    module = importlib.import_module(name)
+    module.init()
+    # Each run starts from the same seed
+    rng.seed(SEED)
+
+    def build():
+        game = setup(module, scale)
+        handler = next(getattr(game, method) for method in INPUT_METHODS if hasattr(game, method))
+        return game, handler
+
+    game, handle_input = build()
+    times = {phase: [] for phase in PHASES}
+    restarts = 0
+    clock = time.perf_counter
+    for frame in range(WARMUP_FRAMES + frames):
+        drive(script, game, frame)
+        start = clock()
+        handle_input()
+        input_done = clock()
+        game.update()
+        update_done = clock()
+        game.draw()
+        draw_done = clock()
+        script.end_frame(FRAME_MS)
+        if frame >= WARMUP_FRAMES:
+            times['input'].append(input_done - start)
+            times['update'].append(update_done - input_done)
+            times['draw'].append(draw_done - update_done)
+        if finished(game):
+            restarts += 1
+            game, handle_input = build()
+
+    result = {phase: summarize(times[phase]) for phase in PHASES}
+    result['restarts'] = restarts
+    return result
+
+
+def run(games, frames):
+    script = ScriptedInput()
+    script.install()
+    results = {}
+    try:
+        for name in games:
+            knob, scales = SCENARIOS[name][:2]
+            results[name] = {'knob': knob, 'scales': {}}
+            for scale in scales:
+                # Pac-Man's ghosts log to stdout every frame
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    result = run_scenario(name, scale, frames, script)
+                results[name]['scales'][str(scale)] = result
+                print(f"{name:<19} {knob} {scale:<5} "
+                      f"update {result['update']['p50']:7.3f} ms  "
+                      f"draw {result['draw']['p50']:7.3f} ms  "
+                      f"(p95 {result['update']['p95']:.3f} / {result['draw']['p95']:.3f}, "
+                      f"{result['restarts']} restarts)")
+    finally:
+        script.uninstall()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print each gated phase against the baseline and return the regressions."""
+    regressions = []
+    for name, game in results.items():
+        base_game = baseline.get('results', {}).get(name)
+        if base_game is None:
+            continue
+        for scale, result in game['scales'].items():
+            base = base_game['scales'].get(scale)
+            if base is None:
+                continue
+            for phase in GATED_PHASES:
+                old, new = base[phase]['p50'], result[phase]['p50']
+                change = (new - old) / old if old else 0.0
+                flag = ''
+                if change > threshold and new - old > MIN_DELTA_MS:
+                    flag = '  REGRESSION'
+                    regressions.append((name, scale, phase, old, new))
+                print(f"{name:<19} {scale:<5} {phase:<7} {old:7.3f} -> {new:7.3f} ms "
+                      f"({change:+.0%}){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless update/draw benchmark for every game")
+    parser.add_argument('--games', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--frames', type=int, default=FRAMES, help="timed frames per scale")
+    parser.add_argument('--output', default='bench-results.json')
+    parser.add_argument('--compare', metavar='BASELINE', help="results file to check against")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help="allowed p50 slowdown as a fraction (default %(default)s)")
+    args = parser.parse_args()
+
+    results = run(args.games, args.frames)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'seed': SEED,
+            'frames': args.frames,
+            'warmup_frames': WARMUP_FRAMES,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} phase(s) slower than the baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == '__main__':
+    main()
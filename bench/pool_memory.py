@@ -0,0 +1,70 @@
+# Pool Memory Benchmark
+# Description: Compares allocating particles per spawn against EntityPool reuse
+
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entity_pool import EntityPool
+import rng
+from asteroids import Particle, MAX_PARTICLES, PARTICLE_COUNT
+
+# Benchmark Settings
+FRAMES = 3000
+EXPLOSION_CHANCE = 0.2  # Chance per frame of an asteroid exploding
+
+
+def run_allocating(frames, seed):
+    random.seed(seed)
+    rng.seed(seed)
+    particles = []
+    allocated = 0
+    for _ in range(frames):
+        if random.random() < EXPLOSION_CHANCE:
+            for _ in range(PARTICLE_COUNT):
+                if len(particles) < MAX_PARTICLES:
+                    particle = Particle()
+                    allocated += 1
+                    particle.spawn(400, 300, random.uniform(0, 360))
+                    particles.append(particle)
+        for particle in particles:
+            particle.move()
+        particles = [p for p in particles if p.active]
+    return allocated
+
+
+def run_pooled(frames, seed):
+    random.seed(seed)
+    rng.seed(seed)
+    particles = EntityPool(Particle, MAX_PARTICLES)
+    for _ in range(frames):
+        if random.random() < EXPLOSION_CHANCE:
+            for _ in range(PARTICLE_COUNT):
+                particles.acquire(400, 300, random.uniform(0, 360))
+        for particle in particles:
+            particle.move()
+        particles.release_inactive()
+    return particles.capacity
+
+
+def measure(name, run):
+    # The pool's peak includes its up-front allocation of MAX_PARTICLES
+    tracemalloc.start()
+    start = time.perf_counter()
+    allocated = run(FRAMES, 1)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<12} {elapsed * 1000:8.1f} ms  peak {peak / 1024:8.1f} KiB  "
+          f"particles allocated {allocated}")
+
+
+if __name__ == '__main__':
+    measure('allocating', run_allocating)
+    measure('pooled', run_pooled)
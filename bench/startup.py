@@ -0,0 +1,115 @@
+# Startup Benchmark
+# Description: Measures each game's cold import time and time to first frame
+#
+#   python bench/startup.py                     # every game, 5 fresh processes each
+#   python bench/startup.py --games joust pac --repeats 10 --output startup.json
+#
+# Every sample is a new Python process, so nothing is warm. The child
+# reports how long `import pygame` took, how long importing the game
+# module took on top of that, and how long its run() took to put the
+# first frame on screen (ended by the first display flip or update).
+# The parent also times the whole process, interpreter start included.
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Benchmark Settings
+GAMES = ['pong', 'snake', 'breakout', 'space_war', 'asteroids', 'asteroids_enhanced', 'frogger',
+         'pac', 'command', 'joust', 'cave_runner', 'maze_runner', 'space_shooter']
+REPEATS = 5
+METRICS = ('pygame_import_ms', 'import_ms', 'first_frame_ms', 'process_ms')
+
+
+class FirstFrame(Exception):
+    pass
+
+
+def measure_child(name):
+    """Runs in the child process: import the game, run it to its first frame, print the timings."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    sys.path.insert(0, ROOT)
+    clock = time.perf_counter
+
+    start = clock()
+    import pygame
+    pygame_done = clock()
+    import importlib
+    module = importlib.import_module(name)
+    import_done = clock()
+
+    def first_frame(*args):
+        raise FirstFrame
+
+    pygame.display.flip = first_frame
+    pygame.display.update = first_frame
+    run_start = clock()
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull  # Seed reports and the like
+        try:
+            module.run()
+        except FirstFrame:
+            pass
+        finally:
+            sys.stdout = stdout
+    frame_done = clock()
+
+    print(json.dumps({
+        'pygame_import_ms': (pygame_done - start) * 1000,
+        'import_ms': (import_done - pygame_done) * 1000,
+        'first_frame_ms': (frame_done - run_start) * 1000,
+    }))
+
+
+def measure(name):
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', name],
+                            capture_output=True, text=True, check=True).stdout
+    sample = json.loads(output.strip().splitlines()[-1])
+    sample['process_ms'] = (time.perf_counter() - start) * 1000
+    return sample
+
+
+def median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import and first-frame timings")
+    parser.add_argument('--games', nargs='+', choices=GAMES, default=GAMES)
+    parser.add_argument('--repeats', type=int, default=REPEATS, help="fresh processes per game")
+    parser.add_argument('--output', help="write the medians to this JSON file")
+    parser.add_argument('--child', metavar='GAME', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_child(args.child)
+        return
+
+    print(f"{'game':<19} {'pygame':>8} {'import':>8} {'1st frame':>10} {'process':>9}   (median ms)")
+    results = {}
+    for name in args.games:
+        samples = [measure(name) for _ in range(args.repeats)]
+        results[name] = {metric: median([s[metric] for s in samples]) for metric in METRICS}
+        row = results[name]
+        print(f"{name:<19} {row['pygame_import_ms']:8.1f} {row['import_ms']:8.1f} "
+              f"{row['first_frame_ms']:10.1f} {row['process_ms']:9.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'repeats': args.repeats, 'python': sys.version.split()[0], 'results': results},
+                      f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
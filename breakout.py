@@ -5,11 +5,14 @@
 
 import pygame
 import sys
-import random
 import math
 
-# Initialize Pygame
-pygame.init()
+import collision
+import frame_profiler
+import rng
+
+# Random streams
+spawn_rng = rng.stream(rng.SPAWN)
 
 # Constants
 WINDOW_WIDTH = 800
@@ -37,6 +40,7 @@ PADDLE_COLOR = WHITE
 BALL_SIZE = 8
 BALL_SPEED = 5
 BALL_COLOR = WHITE
+BALL_MAX_IMPACTS = 8  # Bounces resolved per frame before the ball just stops
 
 # Block Settings
 BLOCK_WIDTH = 80
@@ -46,10 +50,20 @@ BLOCK_COLS = 8
 BLOCK_SPACING = 10
 BLOCK_TOP_OFFSET = 50
 
-# Setup Display
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Block Breaker")
-clock = pygame.time.Clock()
+# Render Settings
+USE_DIRTY_RECTS = True  # Only push changed screen areas to the display
+
+# Setup Display, done by init() rather than on import
+screen = None
+clock = None
+
+def init():
+    global screen, clock
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption("Block Breaker")
+    clock = pygame.time.Clock()
 
 class Paddle:
     def __init__(self):
@@ -62,12 +76,13 @@ class Paddle:
 
     def draw(self):
         # Draw paddle as rectangle with inner line
-        pygame.draw.rect(screen, self.color, 
-                        (self.x, self.y, self.width, self.height))
+        rect = pygame.draw.rect(screen, self.color, 
+                               (self.x, self.y, self.width, self.height))
         pygame.draw.rect(screen, BLACK,
                         (self.x + 2, self.y + 2, self.width - 4, self.height - 4))
         pygame.draw.rect(screen, self.color,
                         (self.x + 4, self.y + 4, self.width - 8, self.height - 8))
+        return rect
 
     def move(self, direction):
         self.x += direction * self.speed
@@ -85,111 +100,228 @@ class Ball:
         self.speed = BALL_SPEED
         self.color = BALL_COLOR
         # Random angle between -45 and 45 degrees
-        angle = random.uniform(-math.pi/4, math.pi/4)
+        angle = spawn_rng.uniform(-math.pi/4, math.pi/4)
         self.dx = math.sin(angle) * self.speed
         self.dy = -math.cos(angle) * self.speed
         self.moving = False
 
     def draw(self):
         # Draw ball as circle with inner circle
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
+        rect = pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
         pygame.draw.circle(screen, BLACK, (int(self.x), int(self.y)), self.size - 2)
         pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size - 4)
+        return rect
 
-    def update(self, paddle):
+    def update(self, paddle, blocks):
+        """Move the ball for one frame, bouncing off everything in its path.
+
+        Returns (lost, broken) where broken lists the blocks hit this frame
+        in the order they were hit.
+        """
+        broken = []
         if not self.moving:
             self.x = paddle.x + paddle.width // 2
             self.y = WINDOW_HEIGHT - 60
-            return False
-
-        self.x += self.dx
-        self.y += self.dy
-
-        # Wall collisions
-        if self.x <= self.size or self.x >= WINDOW_WIDTH - self.size:
-            self.dx *= -1
-        if self.y <= self.size:
-            self.dy *= -1
-
-        # Paddle collision
-        if (self.y >= paddle.y - self.size and 
-            paddle.x <= self.x <= paddle.x + paddle.width):
-            # Calculate reflection angle based on where ball hits paddle
-            relative_intersect_x = (paddle.x + (paddle.width / 2)) - self.x
-            normalized_intersect = relative_intersect_x / (paddle.width / 2)
-            bounce_angle = normalized_intersect * math.pi/3  # 60 degrees max angle
-            
-            self.dx = -math.sin(bounce_angle) * self.speed
-            self.dy = -math.cos(bounce_angle) * self.speed
-            
-            # Ensure ball doesn't get stuck in paddle
-            self.y = paddle.y - self.size
+            return False, broken
+
+        # Sweep the ball along its path, stopping at each impact in time
+        # order so fast balls can't tunnel through bricks or the paddle
+        remaining = 1.0
+        for _ in range(BALL_MAX_IMPACTS):
+            move_x = self.dx * remaining
+            move_y = self.dy * remaining
+            hit = self.find_first_hit(move_x, move_y, paddle, blocks)
+            if hit is None:
+                self.x += move_x
+                self.y += move_y
+                break
+
+            t, normal_x, normal_y, target = hit
+            self.x += move_x * t
+            self.y += move_y * t
+            remaining *= 1 - t
+
+            if target is paddle and normal_y < 0:
+                self.bounce_off_paddle(paddle)
+                # Ensure ball doesn't get stuck in paddle
+                self.y = min(self.y, paddle.y - self.size)
+            else:
+                # Reflect the velocity about the surface normal
+                dot = self.dx * normal_x + self.dy * normal_y
+                self.dx -= 2 * dot * normal_x
+                self.dy -= 2 * dot * normal_y
+
+            if isinstance(target, Block):
+                blocks.remove(target)
+                broken.append(target)
 
         # Check if ball is lost
         if self.y >= WINDOW_HEIGHT + self.size:
-            return True
+            return True, broken
+        
+        return False, broken
+
+    def find_first_hit(self, move_x, move_y, paddle, blocks):
+        best = None
+
+        # Side and top walls
+        if move_x < 0 and self.x + move_x <= self.size:
+            best = (max(0.0, (self.size - self.x) / move_x), 1, 0, None)
+        elif move_x > 0 and self.x + move_x >= WINDOW_WIDTH - self.size:
+            best = (max(0.0, (WINDOW_WIDTH - self.size - self.x) / move_x), -1, 0, None)
+        if move_y < 0 and self.y + move_y <= self.size:
+            t = max(0.0, (self.size - self.y) / move_y)
+            if best is None or t < best[0]:
+                best = (t, 0, 1, None)
+
+        # Paddle, then only the blocks under the swept path
+        targets = [paddle] + blocks.blocks_in(
+            min(self.x, self.x + move_x) - self.size, min(self.y, self.y + move_y) - self.size,
+            max(self.x, self.x + move_x) + self.size, max(self.y, self.y + move_y) + self.size)
+        for target in targets:
+            hit = collision.sweep_circle_rect(self.x, self.y, move_x, move_y, self.size,
+                                    target.x, target.y, target.width, target.height)
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = hit + (target,)
+
+        return best
+
+    def bounce_off_paddle(self, paddle):
+        # Calculate reflection angle based on where ball hits paddle
+        relative_intersect_x = (paddle.x + (paddle.width / 2)) - self.x
+        normalized_intersect = max(-1, min(relative_intersect_x / (paddle.width / 2), 1))
+        bounce_angle = normalized_intersect * math.pi/3  # 60 degrees max angle
         
-        return False
+        self.dx = -math.sin(bounce_angle) * self.speed
+        self.dy = -math.cos(bounce_angle) * self.speed
 
 class Block:
-    def __init__(self, x, y, color, points):
+    def __init__(self, x, y, color, points, width=BLOCK_WIDTH, height=BLOCK_HEIGHT):
         self.x = x
         self.y = y
-        self.width = BLOCK_WIDTH
-        self.height = BLOCK_HEIGHT
+        self.width = width
+        self.height = height
         self.color = color
         self.points = points
         self.active = True
 
-    def draw(self):
+    def draw(self, surface):
         if not self.active:
             return
         # Draw block as rectangle with inner rectangle
-        pygame.draw.rect(screen, self.color,
+        pygame.draw.rect(surface, self.color,
                         (self.x, self.y, self.width, self.height))
-        pygame.draw.rect(screen, BLACK,
+        pygame.draw.rect(surface, BLACK,
                         (self.x + 2, self.y + 2, self.width - 4, self.height - 4))
-        pygame.draw.rect(screen, self.color,
+        pygame.draw.rect(surface, self.color,
                         (self.x + 4, self.y + 4, self.width - 8, self.height - 8))
 
-    def check_collision(self, ball):
-        if not self.active:
-            return False
-
-        if (ball.x + ball.size > self.x and
-            ball.x - ball.size < self.x + self.width and
-            ball.y + ball.size > self.y and
-            ball.y - ball.size < self.y + self.height):
-            
-            # Determine which side was hit
-            if ball.x < self.x or ball.x > self.x + self.width:
-                ball.dx *= -1
-            else:
-                ball.dy *= -1
-                
-            self.active = False
-            return True
-        return False
+class BlockWall:
+    """Blocks stored in a (row, col) grid laid out like the classic wall.
+
+    Any rectangle maps straight to the handful of grid cells under it, so
+    collision lookups cost the same no matter how many bricks a level has.
+    The wall is also kept pre-rendered on a window-sized background
+    surface; broken bricks are erased from it and their rects queued in
+    erased for the next partial display update.
+    """
+
+    def __init__(self, rows=BLOCK_ROWS, cols=BLOCK_COLS, block_width=BLOCK_WIDTH,
+                 block_height=BLOCK_HEIGHT, spacing=BLOCK_SPACING, top=BLOCK_TOP_OFFSET):
+        self.rows = rows
+        self.cols = cols
+        self.block_width = block_width
+        self.block_height = block_height
+        self.pitch_x = block_width + spacing
+        self.pitch_y = block_height + spacing
+        self.left = (WINDOW_WIDTH - (cols * self.pitch_x - spacing)) // 2
+        self.top = top
+        self.grid = [[None] * cols for _ in range(rows)]
+        self.remaining = 0
+        self.surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.surface.fill(BLACK)
+        self.erased = []
+        self.stale = False  # Surface no longer matches the grid
+
+    def add(self, row, col, color, points):
+        x = col * self.pitch_x + self.left
+        y = row * self.pitch_y + self.top
+        block = Block(x, y, color, points, self.block_width, self.block_height)
+        self.grid[row][col] = block
+        self.remaining += 1
+        block.draw(self.surface)
+        return block
+
+    def remove(self, block):
+        block.active = False
+        self.remaining -= 1
+        rect = pygame.Rect(block.x, block.y, block.width, block.height)
+        self.surface.fill(BLACK, rect)
+        self.erased.append(rect)
+
+    def redraw(self):
+        self.surface.fill(BLACK)
+        for block in self:
+            if block.active:
+                block.draw(self.surface)
+        self.erased = []
+        self.stale = False
+
+    def take_erased(self):
+        erased = self.erased
+        self.erased = []
+        return erased
+
+    def blocks_in(self, left, top, right, bottom):
+        """Active blocks whose cells overlap the given rectangle, row-major."""
+        first_col = max(0, int(left - self.left) // self.pitch_x)
+        last_col = min(self.cols - 1, int(right - self.left) // self.pitch_x)
+        first_row = max(0, int(top - self.top) // self.pitch_y)
+        last_row = min(self.rows - 1, int(bottom - self.top) // self.pitch_y)
+
+        found = []
+        for row in range(first_row, last_row + 1):
+            cells = self.grid[row]
+            for col in range(first_col, last_col + 1):
+                block = cells[col]
+                if block is not None and block.active:
+                    found.append(block)
+        return found
+
+    def __iter__(self):
+        for cells in self.grid:
+            for block in cells:
+                if block is not None:
+                    yield block
 
 class Game:
     def __init__(self):
         self.paddle = Paddle()
         self.ball = Ball()
-        self.blocks = []
+        self.blocks = BlockWall()
         self.score = 0
         self.lives = 3
         self.game_over = False
+        self.font = pygame.font.Font(None, 36)
+        # Screen areas drawn over the background last frame
+        self.dirty = []
+        self.full_redraw = True
         self.create_blocks()
 
+    def state_restored(self):
+        # The pre-rendered wall is shared with the snapshot, so repaint it
+        # before it is next shown
+        self.blocks.stale = True
+        self.full_redraw = True
+
     def create_blocks(self):
         colors = [RED, ORANGE, YELLOW, GREEN, CYAN]
         points = [50, 40, 30, 20, 10]
         
-        for row in range(BLOCK_ROWS):
-            y = row * (BLOCK_HEIGHT + BLOCK_SPACING) + BLOCK_TOP_OFFSET
-            for col in range(BLOCK_COLS):
-                x = col * (BLOCK_WIDTH + BLOCK_SPACING) + (WINDOW_WIDTH - (BLOCK_COLS * (BLOCK_WIDTH + BLOCK_SPACING) - BLOCK_SPACING)) // 2
-                self.blocks.append(Block(x, y, colors[row], points[row]))
+        for row in range(self.blocks.rows):
+            for col in range(self.blocks.cols):
+                self.blocks.add(row, col, colors[row % len(colors)],
+                                points[row % len(points)])
 
     def handle_input(self):
         for event in pygame.event.get():
@@ -213,39 +345,54 @@ class Game:
         if self.game_over:
             return
 
-        # Update ball
-        if self.ball.update(self.paddle):
+        # Update ball, which also breaks any blocks in its path
+        lost, broken = self.ball.update(self.paddle, self.blocks)
+        for block in broken:
+            self.score += block.points
+        if lost:
             self.lives -= 1
             if self.lives <= 0:
                 self.game_over = True
             else:
                 self.ball.reset()
 
-        # Check block collisions
-        for block in self.blocks:
-            if block.check_collision(self.ball):
-                self.score += block.points
-
         # Check win condition
-        if all(not block.active for block in self.blocks):
+        if self.blocks.remaining == 0:
             self.game_over = True
 
     def draw(self):
-        screen.fill(BLACK)
-        
+        if self.full_redraw or self.game_over or not USE_DIRTY_RECTS:
+            # Background is black plus the pre-rendered wall
+            if self.blocks.stale:
+                self.blocks.redraw()
+            screen.blit(self.blocks.surface, (0, 0))
+            self.blocks.take_erased()
+            self.dirty = self.draw_sprites()
+            self.draw_game_over()
+            pygame.display.flip()
+            self.full_redraw = False
+            return
+
+        # Restore the background under last frame's sprites and any bricks
+        # broken since, then redraw sprites and push only those areas
+        restored = self.dirty + self.blocks.take_erased()
+        for rect in restored:
+            screen.blit(self.blocks.surface, rect, rect)
+        self.dirty = self.draw_sprites()
+        pygame.display.update(restored + self.dirty)
+
+    def draw_sprites(self):
         # Draw game objects
-        self.paddle.draw()
-        self.ball.draw()
-        for block in self.blocks:
-            block.draw()
+        rects = [self.paddle.draw(), self.ball.draw()]
 
         # Draw score and lives
-        font = pygame.font.Font(None, 36)
-        score_text = font.render(f"Score: {self.score}", True, WHITE)
-        lives_text = font.render(f"Lives: {self.lives}", True, WHITE)
-        screen.blit(score_text, (10, 10))
-        screen.blit(lives_text, (WINDOW_WIDTH - 100, 10))
+        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
+        lives_text = self.font.render(f"Lives: {self.lives}", True, WHITE)
+        rects.append(screen.blit(score_text, (10, 10)))
+        rects.append(screen.blit(lives_text, (WINDOW_WIDTH - 100, 10)))
+        return rects
 
+    def draw_game_over(self):
         # Draw game over or win
         if self.game_over:
             font = pygame.font.Font(None, 72)
@@ -265,10 +412,11 @@ class Game:
             restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + 50))
             screen.blit(restart_text, restart_rect)
 
-        pygame.display.flip()
-
-def main():
+def run():
+    init()
+    rng.report()
     game = Game()
+    frame_profiler.attach(game)
 
     while True:
         game.handle_input()
@@ -277,4 +425,4 @@ def main():
         clock.tick(FPS)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    run() 
\ No newline at end of file
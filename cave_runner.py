@@ -5,11 +5,15 @@
 
 import pygame
 import sys
-import random
 import math
 
-# Initialize Pygame
-pygame.init()
+import collision
+import frame_profiler
+import rng
+
+# Random streams
+level_rng = rng.stream(rng.LEVEL)
+cosmetic_rng = rng.stream(rng.COSMETIC)
 
 # Constants
 WINDOW_WIDTH = 800
@@ -62,10 +66,17 @@ SPIKES_PER_PLATFORM = 2
 # Camera Settings
 CAMERA_SLACK = 200
 
-# Setup Display
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Cave Runner")
-clock = pygame.time.Clock()
+# Setup Display, done by init() rather than on import
+screen = None
+clock = None
+
+def init():
+    global screen, clock
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption("Cave Runner")
+    clock = pygame.time.Clock()
 
 class Player:
     def __init__(self, x, y):
@@ -107,10 +118,8 @@ class Player:
             self.on_ground = False
 
     def check_collision(self, other):
-        return (self.x < other.x + other.width and
-                self.x + self.width > other.x and
-                self.y < other.y + other.height and
-                self.y + self.height > other.y)
+        return collision.rects_overlap(self.x, self.y, self.width, self.height,
+                                       other.x, other.y, other.width, other.height)
 
     def draw(self, camera_x):
         screen_x = self.x - camera_x
@@ -202,7 +211,7 @@ class Platform:
     def generate_hazards(self):
         # Add gems
         for _ in range(GEMS_PER_PLATFORM):
-            gem_x = random.randint(int(self.x + GEM_SIZE),
+            gem_x = level_rng.randint(int(self.x + GEM_SIZE),
                                  int(self.x + self.width - GEM_SIZE))
             gem_y = self.y - GEM_SIZE - 10
             self.gems.append(Gem(gem_x, gem_y))
@@ -211,7 +220,7 @@ class Platform:
         safe_edge = PLAYER_WIDTH * 1.5  # Safe zone at edges
         if self.width > safe_edge * 2 + SPIKE_WIDTH * 2:  # Only add spikes if platform is wide enough
             for _ in range(SPIKES_PER_PLATFORM):
-                spike_x = random.randint(int(self.x + safe_edge),
+                spike_x = level_rng.randint(int(self.x + safe_edge),
                                       int(self.x + self.width - safe_edge - SPIKE_WIDTH))
                 self.spikes.append(Spike(spike_x, self.y - SPIKE_HEIGHT))
 
@@ -244,7 +253,7 @@ class Gem:
         self.width = self.size  # Add width for collision detection
         self.height = self.size  # Add height for collision detection
         self.collected = False
-        self.bob_offset = random.randint(0, 360)  # For floating animation
+        self.bob_offset = cosmetic_rng.randint(0, 360)  # For floating animation
 
     def draw(self, camera_x):
         if self.collected:
@@ -350,11 +359,11 @@ class Game:
             last_x = self.generate_platform(last_x)
 
     def generate_platform(self, last_x):
-        width = random.randint(MIN_PLATFORM_WIDTH, MAX_PLATFORM_WIDTH)
+        width = level_rng.randint(MIN_PLATFORM_WIDTH, MAX_PLATFORM_WIDTH)
         
         # Calculate gap size
         actual_max_gap = min(MAX_GAP, MAX_JUMP_DISTANCE - width)
-        gap = random.randint(MIN_GAP, max(MIN_GAP + 1, int(actual_max_gap)))
+        gap = level_rng.randint(MIN_GAP, max(MIN_GAP + 1, int(actual_max_gap)))
         x = last_x + gap
         
         # Get previous platform height
@@ -364,7 +373,7 @@ class Game:
         max_height_diff = PEAK_HEIGHT * 0.8  # 80% of maximum jump height
         min_y = max(WINDOW_HEIGHT - 200, prev_platform.y - max_height_diff)
         max_y = min(WINDOW_HEIGHT - 100, prev_platform.y + max_height_diff)
-        y = random.randint(int(min_y), int(max_y))
+        y = level_rng.randint(int(min_y), int(max_y))
         
         self.platforms.append(Platform(x, y, width))
         return x + width
@@ -458,15 +467,11 @@ class Game:
         if isinstance(obj2, Gem):
             # Use a smaller collision box for gems (70% of size)
             effective_size = obj2.size * 0.7
-            return (obj1.x < obj2.x + effective_size and
-                    obj1.x + obj1.width > obj2.x and
-                    obj1.y < obj2.y + effective_size and
-                    obj1.y + obj1.height > obj2.y)
+            return collision.rects_overlap(obj1.x, obj1.y, obj1.width, obj1.height,
+                                           obj2.x, obj2.y, effective_size, effective_size)
         # Regular rectangle collision for other objects
-        return (obj1.x < obj2.x + obj2.width and
-                obj1.x + obj1.width > obj2.x and
-                obj1.y < obj2.y + obj2.height and
-                obj1.y + obj1.height > obj2.y)
+        return collision.rects_overlap(obj1.x, obj1.y, obj1.width, obj1.height,
+                                       obj2.x, obj2.y, obj2.width, obj2.height)
 
     def draw(self):
         screen.fill(BLACK)
@@ -508,8 +513,11 @@ class Game:
 
         pygame.display.flip()
 
-def main():
+def run():
+    init()
+    rng.report()
     game = Game()
+    frame_profiler.attach(game)
 
     while True:
         game.handle_input()
@@ -518,4 +526,4 @@ def main():
         clock.tick(FPS)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    run() 
\ No newline at end of file
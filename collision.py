@@ -0,0 +1,319 @@
+# Collision
+# Description: Overlap and swept tests for rects, circles and convex polygons, singly or as numpy batches
+#
+# Rects are passed as left, top, width, height; circles as x, y, radius;
+# polygons as a sequence of (x, y) points, convex, wound either way.
+# Overlap tests are strict like pygame.Rect.colliderect: shapes that only
+# touch don't overlap. Nothing here builds a Rect or any other object, so
+# the tests are cheap enough to run in an inner loop.
+#
+# Swept tests move the first shape by (dx, dy) over one step and return
+# (t, normal_x, normal_y) for its first contact with the second, t in
+# [0, 1] along the move and the normal pointing out of the second shape,
+# or None if the move misses or only slides away. A shape that already
+# overlaps and is moving further in reports t=0 with the normal of the
+# shallowest way out.
+#
+# The *_many forms take numpy arrays and broadcast like numpy arithmetic,
+# so giving one side an extra axis tests every pair:
+#
+#   hit = collision.circles_overlap_many(bullets[:, None, :], rocks[None, :, :], radius)
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # Only the *_many forms need it
+    np = None
+
+
+def rects_overlap(ax, ay, aw, ah, bx, by, bw, bh):
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+def centers_within(ax, ay, bx, by, half_width, half_height):
+    """True when the centres are closer than half_width across and
+    half_height down: boxes centred there overlap when the halves are the
+    sums of their half sizes."""
+    return abs(ax - bx) < half_width and abs(ay - by) < half_height
+
+
+def point_in_circle(px, py, cx, cy, radius):
+    dx = px - cx
+    dy = py - cy
+    return dx * dx + dy * dy < radius * radius
+
+
+def circles_overlap(ax, ay, ar, bx, by, br):
+    dx = ax - bx
+    dy = ay - by
+    reach = ar + br
+    return dx * dx + dy * dy < reach * reach
+
+
+def circle_rect_overlap(x, y, radius, left, top, width, height):
+    # Distance to the closest point of the rect
+    dx = x - max(left, min(x, left + width))
+    dy = y - max(top, min(y, top + height))
+    return dx * dx + dy * dy < radius * radius
+
+
+def _axes(points):
+    """Unit normals of a polygon's edges."""
+    axes = []
+    for i, (x1, y1) in enumerate(points):
+        x2, y2 = points[i - 1]
+        length = math.hypot(x2 - x1, y2 - y1)
+        if length:
+            axes.append(((y1 - y2) / length, (x2 - x1) / length))
+    return axes
+
+
+def _project(points, axis_x, axis_y):
+    low = high = points[0][0] * axis_x + points[0][1] * axis_y
+    for x, y in points:
+        distance = x * axis_x + y * axis_y
+        if distance < low:
+            low = distance
+        elif distance > high:
+            high = distance
+    return low, high
+
+
+def polygons_overlap(a, b):
+    """Separating axis test: convex polygons overlap unless some edge
+    normal of either one separates their projections."""
+    for axis_x, axis_y in _axes(a) + _axes(b):
+        a_low, a_high = _project(a, axis_x, axis_y)
+        b_low, b_high = _project(b, axis_x, axis_y)
+        if a_high <= b_low or b_high <= a_low:
+            return False
+    return True
+
+
+def _push_out(overlaps, dx, dy):
+    # overlaps holds (depth, normal_x, normal_y) for each way out
+    _, normal_x, normal_y = min(overlaps)
+    if dx * normal_x + dy * normal_y < 0:
+        return 0.0, normal_x, normal_y
+    return None
+
+
+def sweep_rects(ax, ay, aw, ah, dx, dy, bx, by, bw, bh):
+    """Earliest hit of rect a moving by (dx, dy) against rect b: a ray from
+    a's corner against b grown by a's size."""
+    low_x, high_x = bx - aw, bx + bw
+    low_y, high_y = by - ah, by + bh
+    if low_x < ax < high_x and low_y < ay < high_y:
+        return _push_out([(ax - low_x, -1, 0), (high_x - ax, 1, 0),
+                          (ay - low_y, 0, -1), (high_y - ay, 0, 1)], dx, dy)
+
+    t_enter = -math.inf
+    t_exit = math.inf
+    normal_x = normal_y = 0
+    for position, delta, low, high, axis in ((ax, dx, low_x, high_x, 0), (ay, dy, low_y, high_y, 1)):
+        if delta == 0:
+            if position <= low or position >= high:
+                return None
+            continue
+        t_low = (low - position) / delta
+        t_high = (high - position) / delta
+        sign = -1
+        if t_low > t_high:
+            t_low, t_high = t_high, t_low
+            sign = 1
+        if t_low > t_enter:
+            t_enter = t_low
+            normal_x, normal_y = (sign, 0) if axis == 0 else (0, sign)
+        t_exit = min(t_exit, t_high)
+
+    if t_enter >= t_exit or not 0 <= t_enter <= 1:
+        return None
+    return t_enter, normal_x, normal_y
+
+
+def sweep_circles(ax, ay, ar, dx, dy, bx, by, br):
+    """Earliest hit of circle a moving by (dx, dy) against circle b."""
+    offset_x = ax - bx
+    offset_y = ay - by
+    reach = ar + br
+    c = offset_x * offset_x + offset_y * offset_y - reach * reach
+    b = offset_x * dx + offset_y * dy
+    if c < 0:
+        # Already overlapping; moving apart (or sitting dead centre) isn't a hit
+        if b >= 0:
+            return None
+        distance = math.sqrt(offset_x * offset_x + offset_y * offset_y)
+        return 0.0, offset_x / distance, offset_y / distance
+
+    a = dx * dx + dy * dy
+    discriminant = b * b - a * c
+    if a == 0 or b >= 0 or discriminant < 0:
+        return None
+    t = (-b - math.sqrt(discriminant)) / a
+    if t > 1:
+        return None
+    return t, (offset_x + dx * t) / reach, (offset_y + dy * t) / reach
+
+
+def sweep_circle_rect(x, y, dx, dy, radius, left, top, width, height):
+    """Earliest hit of a circle moving by (dx, dy) against a rectangle.
+
+    This is a ray cast against the rectangle grown by the radius, with
+    rounded corners so glancing corner hits bounce off the right normal.
+    """
+    right = left + width
+    bottom = top + height
+
+    # Already touching or overlapping: push out along the shallowest axis
+    if left - radius < x < right + radius and top - radius < y < bottom + radius:
+        closest_x = max(left, min(x, right))
+        closest_y = max(top, min(y, bottom))
+        if (x - closest_x) ** 2 + (y - closest_y) ** 2 < radius * radius:
+            return _push_out([
+                (x - (left - radius), -1, 0),
+                ((right + radius) - x, 1, 0),
+                (y - (top - radius), 0, -1),
+                ((bottom + radius) - y, 0, 1),
+            ], dx, dy)
+
+    # Slab test against the expanded rectangle
+    t_enter = -math.inf
+    t_exit = math.inf
+    normal_x = normal_y = 0
+    for position, delta, low, high, axis in ((x, dx, left - radius, right + radius, 0),
+                                             (y, dy, top - radius, bottom + radius, 1)):
+        if delta == 0:
+            if position < low or position > high:
+                return None
+            continue
+        t_low = (low - position) / delta
+        t_high = (high - position) / delta
+        sign = -1
+        if t_low > t_high:
+            t_low, t_high = t_high, t_low
+            sign = 1
+        if t_low > t_enter:
+            t_enter = t_low
+            normal_x, normal_y = (sign, 0) if axis == 0 else (0, sign)
+        t_exit = min(t_exit, t_high)
+
+    if t_enter > t_exit or t_exit <= 0 or t_enter > 1:
+        return None
+
+    if t_enter >= 0:
+        hit_x = x + dx * t_enter
+        hit_y = y + dy * t_enter
+        if left <= hit_x <= right or top <= hit_y <= bottom:
+            return t_enter, normal_x, normal_y
+    else:
+        # Starting inside the expanded rectangle without overlapping means
+        # sitting on a face moving away, or inside a corner's cut-off
+        hit_x = x
+        hit_y = y
+        if left <= hit_x <= right or top <= hit_y <= bottom:
+            return None
+
+    # The entry point is in a corner region, so test the rounded corner
+    corner_x = left if hit_x < left else right
+    corner_y = top if hit_y < top else bottom
+    offset_x = x - corner_x
+    offset_y = y - corner_y
+    a = dx * dx + dy * dy
+    b = offset_x * dx + offset_y * dy
+    c = offset_x * offset_x + offset_y * offset_y - radius * radius
+    discriminant = b * b - a * c
+    if discriminant < 0 or b >= 0:
+        return None
+    t = (-b - math.sqrt(discriminant)) / a
+    if not 0 <= t <= 1:
+        return None
+    normal_x = (offset_x + dx * t) / radius
+    normal_y = (offset_y + dy * t) / radius
+    return t, normal_x, normal_y
+
+
+def sweep_polygons(a, dx, dy, b):
+    """Earliest hit of convex polygon a moving by (dx, dy) against convex
+    polygon b: the separating axis test, solved for when every axis's
+    projections start and stop overlapping."""
+    t_enter = -math.inf
+    t_exit = math.inf
+    normal = (0, 0)
+    overlaps = []
+    for axis_x, axis_y in _axes(a) + _axes(b):
+        a_low, a_high = _project(a, axis_x, axis_y)
+        b_low, b_high = _project(b, axis_x, axis_y)
+        # Ways out at t=0, in case they already overlap
+        overlaps.append((a_high - b_low, -axis_x, -axis_y))
+        overlaps.append((b_high - a_low, axis_x, axis_y))
+        speed = dx * axis_x + dy * axis_y
+        if speed == 0:
+            if a_high <= b_low or b_high <= a_low:
+                return None
+            continue
+        t_low = (b_low - a_high) / speed
+        t_high = (b_high - a_low) / speed
+        sign = -1 if speed > 0 else 1
+        if t_low > t_high:
+            t_low, t_high = t_high, t_low
+        if t_low > t_enter:
+            t_enter = t_low
+            normal = (sign * axis_x, sign * axis_y)
+        t_exit = min(t_exit, t_high)
+
+    if t_enter >= t_exit or t_exit <= 0 or t_enter > 1:
+        return None
+    if t_enter < 0:
+        return _push_out(overlaps, dx, dy)
+    return (t_enter,) + normal
+
+
+def _need_numpy():
+    if np is None:
+        raise RuntimeError("The *_many collision tests need numpy")
+
+
+def rects_overlap_many(a, b):
+    """a and b hold rects as (..., 4) arrays of left, top, width, height."""
+    _need_numpy()
+    a = np.asarray(a)
+    b = np.asarray(b)
+    return ((a[..., 0] < b[..., 0] + b[..., 2]) & (b[..., 0] < a[..., 0] + a[..., 2]) &
+            (a[..., 1] < b[..., 1] + b[..., 3]) & (b[..., 1] < a[..., 1] + a[..., 3]))
+
+
+def centers_within_many(a, b, half_size):
+    """a and b hold (..., 2) centres; half_size is (half_width, half_height)
+    or arrays of them."""
+    _need_numpy()
+    return (np.abs(np.asarray(a) - np.asarray(b)) < half_size).all(axis=-1)
+
+
+def circles_overlap_many(a, b, reach):
+    """a and b hold (..., 2) centres; reach is the sum of the radii, as a
+    number or an array that broadcasts with them."""
+    _need_numpy()
+    gap = np.asarray(a) - np.asarray(b)
+    return gap[..., 0] * gap[..., 0] + gap[..., 1] * gap[..., 1] < np.square(reach)
+
+
+def sweep_circles_many(a, velocity, b, reach):
+    """sweep_circles for arrays of (..., 2) centres and velocities of a
+    against centres b; returns t, with inf where a misses. The normals point
+    along a + velocity * t - b: divide by reach for a contact, or by its
+    length for pairs that already overlapped."""
+    _need_numpy()
+    offset = np.asarray(a, dtype=float) - np.asarray(b, dtype=float)
+    velocity = np.asarray(velocity, dtype=float)
+    offset, velocity = np.broadcast_arrays(offset, velocity)
+    reach = np.square(reach)
+    c = offset[..., 0] ** 2 + offset[..., 1] ** 2 - reach
+    b = offset[..., 0] * velocity[..., 0] + offset[..., 1] * velocity[..., 1]
+    a = velocity[..., 0] ** 2 + velocity[..., 1] ** 2
+    discriminant = b * b - a * c
+    approaching = (b < 0) & (discriminant >= 0) & (a > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(approaching, (-b - np.sqrt(np.maximum(discriminant, 0))) / np.where(a > 0, a, 1), np.inf)
+    t = np.where(c < 0, np.where(b < 0, 0.0, np.inf), t)
+    return np.where(t <= 1, t, np.inf)
@@ -1,7 +1,15 @@
 
 import pygame
 import math
-import random
+
+import collision
+from entity_pool import EntityPool
+import frame_profiler
+import rng
+
+# Random streams
+spawn_rng = rng.stream(rng.SPAWN)
+cosmetic_rng = rng.stream(rng.COSMETIC)
 
 # Constants
 WINDOW_WIDTH = 800
@@ -13,6 +21,8 @@ ENEMY_MISSILE_SPEED = 3
 PLAYER_MISSILE_SPEED = 5
 EXPLOSION_RADIUS = 30
 EXPLOSION_DURATION = 30
+MAX_PLAYER_MISSILES = MISSILE_BASES * MISSILES_PER_BASE
+MAX_ENEMY_MISSILES = 64  # Pool size; spawns past this are skipped
 
 # Colors
 BLACK = (0, 0, 0)
@@ -99,7 +109,15 @@ class MissileBase:
                 screen.blit(text, text_rect)
 
 class Missile:
-    def __init__(self, x, y, target_x, target_y, is_enemy=False):
+    # Pooled: created once by an EntityPool, then respawned
+    __slots__ = ('x', 'y', 'target_x', 'target_y', 'is_enemy', 'speed', 'active',
+                 'exploded', 'explosion_timer', 'trail_points', 'dx', 'dy', 'pool_index')
+
+    def __init__(self):
+        self.trail_points = []  # Store trail points
+        self.active = False
+
+    def spawn(self, x, y, target_x, target_y, is_enemy=False):
         self.x = x
         self.y = y
         self.target_x = target_x
@@ -109,7 +127,7 @@ class Missile:
         self.active = True
         self.exploded = False
         self.explosion_timer = 0
-        self.trail_points = []  # Store trail points
+        self.trail_points.clear()
         
         # Calculate direction
         dx = target_x - x
@@ -190,7 +208,6 @@ class Missile:
 
 class Game:
     def __init__(self):
-        pygame.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Missile Command")
         self.clock = pygame.time.Clock()
@@ -216,8 +233,8 @@ class Game:
             self.missile_bases.append(MissileBase(x, y))
         
         # Initialize missiles
-        self.player_missiles = []
-        self.enemy_missiles = []
+        self.player_missiles = EntityPool(Missile, MAX_PLAYER_MISSILES)
+        self.enemy_missiles = EntityPool(Missile, MAX_ENEMY_MISSILES)
         
         # Enemy missile spawn timer
         self.enemy_spawn_timer = 0
@@ -251,11 +268,11 @@ class Game:
                     
                     if closest_base:
                         closest_base.missiles_left -= 1
-                        self.player_missiles.append(Missile(
+                        self.player_missiles.acquire(
                             closest_base.x + closest_base.width // 2,
                             closest_base.y,
                             mouse_x, mouse_y
-                        ))
+                        )
                 else:
                     # No missiles left, game over
                     self.game_over = True
@@ -265,57 +282,54 @@ class Game:
             return
 
         # Update player missiles
-        for missile in self.player_missiles[:]:
+        for missile in self.player_missiles:
             missile.update()
-            if not missile.active:
-                self.player_missiles.remove(missile)
+        self.player_missiles.release_inactive()
 
         # Update enemy missiles
-        for missile in self.enemy_missiles[:]:
+        for missile in self.enemy_missiles:
             missile.update()
-            if not missile.active:
-                self.enemy_missiles.remove(missile)
+        self.enemy_missiles.release_inactive()
 
         # Spawn enemy missiles
         self.enemy_spawn_timer += 1
         if self.enemy_spawn_timer >= self.enemy_spawn_delay:
             self.enemy_spawn_timer = 0
-            target_x = random.randint(0, WINDOW_WIDTH)
-            self.enemy_missiles.append(Missile(
-                random.randint(0, WINDOW_WIDTH),
+            target_x = spawn_rng.randint(0, WINDOW_WIDTH)
+            self.enemy_missiles.acquire(
+                spawn_rng.randint(0, WINDOW_WIDTH),
                 0,
                 target_x,
                 WINDOW_HEIGHT,
                 True
-            ))
+            )
 
         # Check collisions
-        for missile in self.player_missiles[:]:
+        for missile in self.player_missiles:
             if missile.exploded:
-                for enemy_missile in self.enemy_missiles[:]:
+                for enemy_missile in self.enemy_missiles:
                     if not enemy_missile.exploded:
-                        distance = math.sqrt(
-                            (missile.x - enemy_missile.x) ** 2 +
-                            (missile.y - enemy_missile.y) ** 2
-                        )
-                        if distance < EXPLOSION_RADIUS:
+                        if collision.point_in_circle(enemy_missile.x, enemy_missile.y,
+                                                     missile.x, missile.y, EXPLOSION_RADIUS):
                             enemy_missile.explode()
                             self.score += 100
 
-        for missile in self.enemy_missiles[:]:
+        for missile in self.enemy_missiles:
             if missile.exploded:
                 # Check collision with cities
                 for city in self.cities:
                     if not city.destroyed:
-                        if (abs(missile.x - (city.x + city.width/2)) < city.width/2 and
-                            abs(missile.y - (city.y + city.height/2)) < city.height/2):
+                        if collision.centers_within(missile.x, missile.y,
+                                                    city.x + city.width/2, city.y + city.height/2,
+                                                    city.width/2, city.height/2):
                             city.destroyed = True
                 
                 # Check collision with missile bases
                 for base in self.missile_bases:
                     if not base.destroyed:
-                        if (abs(missile.x - (base.x + base.width/2)) < base.width/2 and
-                            abs(missile.y - (base.y + base.height/2)) < base.height/2):
+                        if collision.centers_within(missile.x, missile.y,
+                                                    base.x + base.width/2, base.y + base.height/2,
+                                                    base.width/2, base.height/2):
                             base.destroyed = True
 
         # Check game over conditions
@@ -327,8 +341,8 @@ class Game:
         
         # Draw stars in background
         for _ in range(50):
-            x = random.randint(0, WINDOW_WIDTH)
-            y = random.randint(0, WINDOW_HEIGHT)
+            x = cosmetic_rng.randint(0, WINDOW_WIDTH)
+            y = cosmetic_rng.randint(0, WINDOW_HEIGHT)
             pygame.draw.circle(self.screen, WHITE, (x, y), 1)
         
         # Draw cities
@@ -374,7 +388,17 @@ class Game:
             self.draw()
             self.clock.tick(60)
 
-if __name__ == "__main__":
+def init():
+    pygame.display.init()
+    pygame.font.init()
+
+def run():
+    init()
+    rng.report()
     game = Game()
+    frame_profiler.attach(game)
     game.run()
-    pygame.quit() 
\ No newline at end of file
+    pygame.quit()
+
+if __name__ == "__main__":
+    run()
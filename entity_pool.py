@@ -0,0 +1,91 @@
+# Entity Pool
+# Description: Fixed-capacity object pools for short-lived game entities
+
+from itertools import islice
+
+
+class EntityPool:
+    """A fixed number of reusable entities, allocated once up front.
+
+    Live entities are packed at the front of the list, so iteration only
+    touches live entries and releasing one just swaps it with the last
+    live entity. Pooled classes need a no-argument constructor, a
+    spawn(*args) method that re-initialises them, and a pool_index slot.
+
+    Don't release entities while iterating over the pool; use release_if
+    afterwards instead, which is safe because it walks backwards.
+    """
+
+    def __init__(self, factory, capacity):
+        self.factory = factory
+        self.capacity = capacity
+        self.items = [factory() for _ in range(capacity)]
+        for index, item in enumerate(self.items):
+            item.pool_index = index
+        self.count = 0
+
+    def acquire(self, *args):
+        """Spawn a pooled entity, or return None if the pool is full."""
+        if self.count == self.capacity:
+            return None
+        if self.count == len(self.items):
+            self.grow()
+        item = self.items[self.count]
+        self.count += 1
+        item.spawn(*args)
+        return item
+
+    def release(self, item):
+        index = item.pool_index
+        last = self.count - 1
+        if index > last or self.items[index] is not item:
+            return  # Already released
+        self.release_at(index)
+
+    def release_at(self, index):
+        last = self.count - 1
+        items = self.items
+        if index != last:
+            moved = items[last]
+            items[index], items[last] = moved, items[index]
+            moved.pool_index = index
+            items[last].pool_index = last
+        self.count = last
+
+    def release_if(self, predicate):
+        """Release every live entity for which predicate(entity) is true."""
+        items = self.items
+        # Walking backwards means a swapped-in entity was already checked
+        for index in range(self.count - 1, -1, -1):
+            if predicate(items[index]):
+                self.release_at(index)
+
+    def release_inactive(self):
+        """Release every live entity whose active flag has been cleared."""
+        items = self.items
+        for index in range(self.count - 1, -1, -1):
+            if not items[index].active:
+                self.release_at(index)
+
+    def grow(self):
+        item = self.factory()
+        item.pool_index = len(self.items)
+        self.items.append(item)
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __iter__(self):
+        return islice(self.items, self.count)
+
+    def __getstate__(self):
+        # Save states only keep live entities; free slots are rebuilt on demand
+        state = self.__dict__.copy()
+        state['items'] = self.items[:self.count]
+        return state
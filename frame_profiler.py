@@ -0,0 +1,273 @@
+# Frame Profiler
+# Description: Per-phase frame timing with an in-game overlay and CSV / Chrome trace export
+#
+# Call attach(game) after creating a game. Timing is always collected;
+# F3 toggles the overlay and F4 writes the recorded frames to
+# profile-<game>.csv and profile-<game>.json (open the JSON in
+# chrome://tracing or Perfetto).
+#
+# attach() wraps the game's methods and pygame.display.flip/update;
+# detach() puts them back. Only one game is profiled at a time, so
+# attaching another detaches the last. Anything that runs games inside
+# one process (replay.run_game, so the launcher too) detaches when the
+# game ends.
+#
+# Phases are the game's input handler, update(), draw() and the display
+# flip. Whatever is left of the frame is "wait": mostly Clock.tick
+# sleeping, or vsync when flips block.
+
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+
+import pygame
+
+import savestate
+from entity_pool import EntityPool
+
+# Profiler Settings
+WINDOW_FRAMES = 300     # Rolling window for percentiles and the sparkline
+HISTORY_FRAMES = 3600   # Frames kept for export
+STATS_INTERVAL = 15     # Frames between percentile refreshes
+TOGGLE_KEY = pygame.K_F3
+EXPORT_KEY = pygame.K_F4
+INPUT_METHODS = ('handle_input', 'handle_events', 'handle_game_input')
+PHASES = ('input', 'update', 'draw', 'flip', 'wait')
+PHASE_COLORS = {
+    'input': (120, 120, 255),
+    'update': (0, 220, 0),
+    'draw': (255, 200, 0),
+    'flip': (255, 80, 80),
+    'wait': (160, 160, 160),
+}
+OVERLAY_WIDTH = WINDOW_FRAMES + 10  # Room for one sparkline column per frame
+SPARKLINE_HEIGHT = 40
+FRAME_BUDGET_MS = 1000 / 60
+
+_attached = None  # The profiler whose wrappers are installed
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class TimedMethod:
+    """Replaces one of the game's methods and charges its run time to a phase."""
+
+    def __init__(self, profiler, phase, method):
+        self.profiler = profiler
+        self.phase = phase
+        self.method = method
+
+    def __call__(self, *args, **kwargs):
+        profiler = self.profiler
+        if self.phase == 'input':
+            profiler.start_frame()
+        flip_before = profiler.current['flip']
+        start = time.perf_counter()
+        try:
+            return self.method(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            # draw() usually flips itself; that time belongs to 'flip'
+            profiler.current[self.phase] += elapsed - (profiler.current['flip'] - flip_before)
+
+
+# Profilers are tooling, not game state
+savestate.share_type(TimedMethod)
+
+
+class FrameProfiler:
+    def __init__(self, game, name):
+        self.game = game
+        self.name = name
+        self.visible = False
+        self.toggle_down = self.export_down = False
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = None
+        self.frame = 0
+        self.window = deque(maxlen=WINDOW_FRAMES)    # Frame totals in ms
+        self.history = deque(maxlen=HISTORY_FRAMES)  # (frame, start, phase times)
+        self.stats = {}
+        self.font = None
+        self.real_flip = pygame.display.flip
+        self.real_update = pygame.display.update
+        self.wrapped = {}  # Method name -> the game's own attribute it shadows, if any
+
+    def wrap(self, phase, name):
+        game = self.game
+        self.wrapped[name] = vars(game).get(name)
+        setattr(game, name, TimedMethod(self, phase, getattr(game, name)))
+
+    def install(self):
+        for method in INPUT_METHODS:
+            if hasattr(self.game, method):
+                self.wrap('input', method)
+                break
+        self.wrap('update', 'update')
+        self.wrap('draw', 'draw')
+        pygame.display.flip = self.flip
+        pygame.display.update = self.update_display
+
+    def detach(self):
+        """Put back the game's methods and pygame's flip and update."""
+        global _attached
+        for name, own in self.wrapped.items():
+            if own is None:
+                delattr(self.game, name)
+            else:
+                setattr(self.game, name, own)
+        self.wrapped = {}
+        # Unless something has replaced them since
+        if pygame.display.flip == self.flip:
+            pygame.display.flip = self.real_flip
+        if pygame.display.update == self.update_display:
+            pygame.display.update = self.real_update
+        if _attached is self:
+            _attached = None
+
+    def start_frame(self):
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            current = self.current
+            total = now - self.frame_start
+            current['wait'] = max(0.0, total - sum(current[phase] for phase in PHASES[:-1]))
+            self.history.append((self.frame, self.frame_start, current))
+            self.window.append(total * 1000)
+            self.frame += 1
+            if self.frame % STATS_INTERVAL == 0:
+                self.refresh_stats()
+        self.frame_start = now
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.check_keys()
+
+    def check_keys(self):
+        # Polled rather than read from the event queue, which the game owns
+        keys = pygame.key.get_pressed()
+        if keys[TOGGLE_KEY] and not self.toggle_down:
+            self.visible = not self.visible
+        if keys[EXPORT_KEY] and not self.export_down:
+            self.export_csv(f"profile-{self.name}.csv")
+            self.export_chrome_trace(f"profile-{self.name}.json")
+        self.toggle_down = keys[TOGGLE_KEY]
+        self.export_down = keys[EXPORT_KEY]
+
+    def refresh_stats(self):
+        recent = list(self.history)[-WINDOW_FRAMES:]
+        stats = {}
+        for phase in PHASES:
+            ordered = sorted(times[phase] * 1000 for _, _, times in recent)
+            stats[phase] = (percentile(ordered, 0.5), percentile(ordered, 0.95),
+                            percentile(ordered, 0.99))
+        self.stats = stats
+
+    def entity_counts(self):
+        counts = []
+        for name, value in vars(self.game).items():
+            if isinstance(value, (list, dict, EntityPool, pygame.sprite.AbstractGroup)):
+                counts.append((name, len(value)))
+            elif hasattr(value, 'count') and isinstance(value.count, int):
+                counts.append((name, value.count))  # Formations and similar
+        return counts
+
+    def flip(self, *args):
+        self.timed_flip(self.real_flip, *args)
+
+    def update_display(self, *args):
+        self.timed_flip(self.real_update, *args)
+
+    def timed_flip(self, real, *args):
+        if self.visible:
+            rect = self.draw_overlay(pygame.display.get_surface())
+            if args and args[0] is not None:
+                # Partial updates have to include the overlay too
+                rects = [args[0]] if isinstance(args[0], pygame.Rect) else list(args[0])
+                args = (rects + [rect],)
+        start = time.perf_counter()
+        real(*args)
+        self.current['flip'] += time.perf_counter() - start
+
+    def draw_overlay(self, surface):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+        lines = [f"{self.name}  frame {self.frame}"]
+        if self.window:
+            mean = sum(self.window) / len(self.window)
+            lines[0] += f"  {1000 / mean:.0f} fps"
+        lines.append("phase     p50    p95    p99 ms")
+        for phase in PHASES:
+            p50, p95, p99 = self.stats.get(phase, (0, 0, 0))
+            lines.append(f"{phase:<7}{p50:6.2f} {p95:6.2f} {p99:6.2f}")
+        counts = self.entity_counts()[:6]
+        for i in range(0, len(counts), 3):
+            lines.append("  ".join(f"{name} {count}" for name, count in counts[i:i + 3]))
+
+        line_height = self.font.get_linesize()
+        height = len(lines) * line_height + SPARKLINE_HEIGHT + 12
+        panel = pygame.Rect(surface.get_width() - OVERLAY_WIDTH - 4, 4, OVERLAY_WIDTH, height)
+        pygame.draw.rect(surface, (0, 0, 0), panel)
+        pygame.draw.rect(surface, (80, 80, 80), panel, 1)
+        y = panel.y + 4
+        for i, line in enumerate(lines):
+            color = PHASE_COLORS[PHASES[i - 2]] if 2 <= i < 2 + len(PHASES) else (255, 255, 255)
+            surface.blit(self.font.render(line, True, color), (panel.x + 6, y))
+            y += line_height
+
+        # Frame time sparkline, newest on the right, with the 60 FPS budget marked
+        bottom = panel.bottom - 4
+        scale = SPARKLINE_HEIGHT / (FRAME_BUDGET_MS * 2)
+        x = panel.right - 4 - len(self.window)
+        for total in self.window:
+            height = min(SPARKLINE_HEIGHT, int(total * scale) + 1)
+            color = PHASE_COLORS['flip'] if total > FRAME_BUDGET_MS * 1.5 else PHASE_COLORS['update']
+            pygame.draw.line(surface, color, (x, bottom), (x, bottom - height))
+            x += 1
+        budget_y = bottom - int(FRAME_BUDGET_MS * scale)
+        pygame.draw.line(surface, (200, 200, 200), (panel.x + 4, budget_y), (panel.right - 4, budget_y))
+        return panel
+
+    def export_csv(self, path):
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'start_ms'] + [f"{phase}_ms" for phase in PHASES] + ['total_ms'])
+            for frame, start, times in self.history:
+                values = [times[phase] * 1000 for phase in PHASES]
+                writer.writerow([frame, f"{start * 1000:.3f}"] + [f"{v:.3f}" for v in values] +
+                                [f"{sum(values):.3f}"])
+
+    def export_chrome_trace(self, path):
+        events = []
+        for frame, start, times in self.history:
+            ts = start * 1e6
+            events.append({'name': f"frame {frame}", 'ph': 'X', 'pid': 1, 'tid': 1,
+                           'ts': ts, 'dur': sum(times.values()) * 1e6})
+            for phase in PHASES:
+                # Phases are laid end to end; their real order within a frame varies by game
+                events.append({'name': phase, 'ph': 'X', 'pid': 1, 'tid': 2,
+                               'ts': ts, 'dur': times[phase] * 1e6})
+                ts += times[phase] * 1e6
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+def attach(game, name=None):
+    """Start profiling a game object's input, update, draw and flip phases."""
+    global _attached
+    if name is None:
+        # The module's file name, which also works for games run as __main__
+        module = sys.modules[type(game).__module__]
+        name = os.path.splitext(os.path.basename(module.__file__))[0]
+    detach()
+    profiler = FrameProfiler(game, name)
+    profiler.install()
+    _attached = profiler
+    return profiler
+
+
+def detach():
+    """Stop profiling whichever game is attached, if any."""
+    if _attached is not None:
+        _attached.detach()
@@ -1,9 +1,14 @@
 import pygame
-import random
 import math
+from bisect import bisect_left, bisect_right, insort
+from functools import cache
+from operator import attrgetter
 
-# Initialize Pygame
-pygame.init()
+import frame_profiler
+import rng
+
+# Random streams
+level_rng = rng.stream(rng.LEVEL)
 
 # Constants
 WINDOW_WIDTH = 600
@@ -27,6 +32,7 @@ DARK_BROWN = (99, 49, 14)
 GRASS_GREEN = (34, 139, 34)
 ROAD_GRAY = (50, 50, 50)
 LIGHT_GRAY = (70, 70, 70)
+SPRITE_KEY = (255, 0, 255)  # Transparent in sprites; nothing is drawn in it
 
 # Game settings
 FROG_SIZE = GRID_SIZE - 4
@@ -34,6 +40,130 @@ CAR_WIDTH = GRID_SIZE * 2
 LOG_WIDTH = GRID_SIZE * 3
 STARTING_LIVES = 3
 
+# Lane Settings
+ROAD_LANES = range(7, 11)    # Rows with traffic
+RIVER_LANES = range(2, 6)    # Rows with logs
+VEHICLES_PER_LANE = 3
+LOGS_PER_LANE = 2
+LANE_HEIGHT = GRID_SIZE - 8  # Height of everything that moves along a lane
+
+entity_x = attrgetter('x')
+
+# Water Settings
+WAVE_WIDTH = 20
+WAVE_HEIGHT = 3      # How far waves rise and fall
+WAVE_PERIOD = 60     # The wave strip repeats every this many pixels
+WAVE_SPEED = 0.1     # Pixels the water scrolls per millisecond
+
+def create_background():
+    """Everything that never moves: grass, river, road and lily pads."""
+    background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+    background.fill(GRASS_GREEN)
+    
+    # Draw river
+    pygame.draw.rect(background, DARK_BLUE,
+                    (0, RIVER_LANES[0] * GRID_SIZE,
+                     WINDOW_WIDTH, len(RIVER_LANES) * GRID_SIZE))
+    
+    # Draw road
+    pygame.draw.rect(background, ROAD_GRAY,
+                    (0, ROAD_LANES[0] * GRID_SIZE,
+                     WINDOW_WIDTH, len(ROAD_LANES) * GRID_SIZE))
+    
+    # Draw road lines
+    for y in ROAD_LANES:
+        if y % 2 == 0:  # Dashed lines between lanes
+            for x in range(0, WINDOW_WIDTH, GRID_SIZE):
+                pygame.draw.line(background, YELLOW,
+                               (x, y * GRID_SIZE),
+                               (x + GRID_SIZE//2, y * GRID_SIZE),
+                               2)
+    
+    # Draw goal area with empty lily pads
+    for i in range(5):
+        x = (WINDOW_WIDTH // 5) * i + (WINDOW_WIDTH // 10)
+        pygame.draw.circle(background, DARK_GREEN,
+                         (x, GRID_SIZE//2), GRID_SIZE//2)
+        pygame.draw.circle(background, GREEN,
+                         (x, GRID_SIZE//2), GRID_SIZE//2 - 2)
+    
+    return background.convert()
+
+def create_wave_strip():
+    """One row of waves, a period wider than the window so it can scroll."""
+    strip = pygame.Surface((WINDOW_WIDTH + WAVE_PERIOD, 10 + 2 * WAVE_HEIGHT))
+    strip.fill(SPRITE_KEY)
+    strip.set_colorkey(SPRITE_KEY)
+    for x in range(0, strip.get_width(), WAVE_WIDTH):
+        offset = math.sin(x * 2 * math.pi / WAVE_PERIOD) * WAVE_HEIGHT
+        pygame.draw.arc(strip, BLUE,
+                      (x, WAVE_HEIGHT + offset, WAVE_WIDTH, 10),
+                      0, math.pi, 2)
+    return strip.convert()
+
+@cache
+def create_vehicle_sprite(width, height, is_truck, color, dark_color):
+    """A vehicle with its top left at (0, 0); wheels hang below the body."""
+    wheel_radius = height // 4
+    y = height // 2
+    sprite = pygame.Surface((math.ceil(width), y + height//3 + wheel_radius + 1))
+    sprite.fill(SPRITE_KEY)
+    sprite.set_colorkey(SPRITE_KEY)
+    
+    # Draw vehicle body
+    pygame.draw.rect(sprite, dark_color, (0, 0, width, height))
+    pygame.draw.rect(sprite, color, (2, 2, width - 4, height - 4))
+    
+    # Draw windows
+    if is_truck:
+        window_width = width // 4
+    else:
+        window_width = width // 3
+    
+    pygame.draw.rect(sprite, LIGHT_GRAY, (4, 4, window_width, height - 8))
+    
+    # Draw wheels
+    wheel_positions = [(wheel_radius + 2, y + height//3),
+                     (width - wheel_radius - 2, y + height//3)]
+    if is_truck:
+        wheel_positions.append((width//2, y + height//3))
+    
+    for wx, wy in wheel_positions:
+        pygame.draw.circle(sprite, BLACK, (int(wx), int(wy)), wheel_radius)
+        pygame.draw.circle(sprite, LIGHT_GRAY, (int(wx), int(wy)), wheel_radius-2)
+    return sprite
+
+LOG_MARGIN = 4  # Grain lines and the highlight spill a little past the log
+
+@cache
+def create_log_sprite(width, height):
+    """A log with its body's top left at (LOG_MARGIN, LOG_MARGIN)."""
+    sprite = pygame.Surface((width + 2 * LOG_MARGIN, height + 2 * LOG_MARGIN))
+    sprite.fill(SPRITE_KEY)
+    sprite.set_colorkey(SPRITE_KEY)
+    x = LOG_MARGIN
+    y = LOG_MARGIN + height//2
+    
+    # Draw main log body
+    pygame.draw.rect(sprite, DARK_BROWN, (x, y - height//2, width, height))
+    
+    # Draw wood grain lines
+    num_lines = width // 10
+    for i in range(num_lines):
+        x_pos = x + (i * 10)
+        curve_offset = math.sin(i * 0.5) * 3
+        pygame.draw.line(sprite, BROWN,
+                       (x_pos, y - height//2 + curve_offset),
+                       (x_pos, y + height//2 + curve_offset),
+                       2)
+    
+    # Draw highlights
+    pygame.draw.line(sprite, BROWN,
+                    (x, y - height//2),
+                    (x + width, y - height//2),
+                    3)
+    return sprite
+
 class Frog:
     def __init__(self):
         self.reset_position()
@@ -101,91 +231,100 @@ class Vehicle:
         self.x = x
         self.y = y
         self.width = CAR_WIDTH
-        self.height = GRID_SIZE - 8
+        self.height = LANE_HEIGHT
         self.speed = speed
         self.lane = lane
-        self.is_truck = random.random() > 0.7
+        self.is_truck = level_rng.random() > 0.7
         if self.is_truck:
             self.width = CAR_WIDTH * 1.5
         self.color = RED if lane % 2 == 0 else YELLOW
         self.dark_color = DARK_RED if lane % 2 == 0 else DARK_YELLOW
     
-    def update(self):
-        self.x += self.speed
+    def wrap(self):
         # Wrap around when off screen
         if self.speed > 0 and self.x > WINDOW_WIDTH + self.width:
             self.x = -self.width
         elif self.speed < 0 and self.x < -self.width:
             self.x = WINDOW_WIDTH + self.width
+        else:
+            return False
+        return True
     
     def draw(self, screen):
-        # Draw vehicle body
-        pygame.draw.rect(screen, self.dark_color,
-                        (self.x, self.y - self.height//2,
-                         self.width, self.height))
-        pygame.draw.rect(screen, self.color,
-                        (self.x + 2, self.y - self.height//2 + 2,
-                         self.width - 4, self.height - 4))
-        
-        # Draw windows
-        if self.is_truck:
-            window_width = self.width // 4
-        else:
-            window_width = self.width // 3
-        
-        pygame.draw.rect(screen, LIGHT_GRAY,
-                        (self.x + 4, self.y - self.height//2 + 4,
-                         window_width, self.height - 8))
-        
-        # Draw wheels
-        wheel_radius = self.height // 4
-        wheel_positions = [(self.x + wheel_radius + 2, self.y + self.height//3),
-                         (self.x + self.width - wheel_radius - 2, self.y + self.height//3)]
-        if self.is_truck:
-            wheel_positions.append((self.x + self.width//2, self.y + self.height//3))
-        
-        for wx, wy in wheel_positions:
-            pygame.draw.circle(screen, BLACK, (int(wx), int(wy)), wheel_radius)
-            pygame.draw.circle(screen, LIGHT_GRAY, (int(wx), int(wy)), wheel_radius-2)
+        sprite = create_vehicle_sprite(self.width, self.height, self.is_truck, self.color, self.dark_color)
+        screen.blit(sprite, (self.x, self.y - self.height//2))
 
 class Log:
     def __init__(self, x, y, speed, lane):
         self.x = x
         self.y = y
         self.width = LOG_WIDTH
-        self.height = GRID_SIZE - 8
+        self.height = LANE_HEIGHT
         self.speed = speed
         self.lane = lane
     
-    def update(self):
-        self.x += self.speed
+    def wrap(self):
         # Wrap around when off screen
         if self.speed > 0 and self.x > WINDOW_WIDTH + self.width:
             self.x = -self.width
         elif self.speed < 0 and self.x < -self.width:
             self.x = WINDOW_WIDTH + self.width
+        else:
+            return False
+        return True
     
     def draw(self, screen):
-        # Draw main log body
-        pygame.draw.rect(screen, DARK_BROWN,
-                        (self.x, self.y - self.height//2,
-                         self.width, self.height))
-        
-        # Draw wood grain lines
-        num_lines = self.width // 10
-        for i in range(num_lines):
-            x_pos = self.x + (i * 10)
-            curve_offset = math.sin(i * 0.5) * 3
-            pygame.draw.line(screen, BROWN,
-                           (x_pos, self.y - self.height//2 + curve_offset),
-                           (x_pos, self.y + self.height//2 + curve_offset),
-                           2)
-        
-        # Draw highlights
-        pygame.draw.line(screen, BROWN,
-                        (self.x, self.y - self.height//2),
-                        (self.x + self.width, self.y - self.height//2),
-                        3)
+        sprite = create_log_sprite(self.width, self.height)
+        screen.blit(sprite, (self.x - LOG_MARGIN, self.y - self.height//2 - LOG_MARGIN))
+
+class Lane:
+    """Everything moving along one row, kept sorted by x. It all shares the
+    lane's speed, so the order only changes when something wraps round."""
+
+    def __init__(self, row, speed):
+        self.row = row
+        self.speed = speed
+        self.entities = []
+        self.widest = 0
+
+    def add(self, entity):
+        insort(self.entities, entity, key=entity_x)
+        self.widest = max(self.widest, entity.width)
+
+    def update(self):
+        entities = self.entities
+        speed = self.speed
+        for entity in entities:
+            entity.x += speed
+
+        # Only entities past the edge they're heading for can wrap, and
+        # those sit at that end of the list
+        wrapped = []
+        if speed > 0:
+            for entity in reversed(entities):
+                if entity.x <= WINDOW_WIDTH:
+                    break
+                if entity.wrap():
+                    wrapped.append(entity)
+        else:
+            for entity in entities:
+                if entity.x >= 0:
+                    break
+                if entity.wrap():
+                    wrapped.append(entity)
+        for entity in wrapped:
+            entities.remove(entity)
+            insort(entities, entity, key=entity_x)
+
+    def touching(self, left, right):
+        """The leftmost entity overlapping left to right along the lane, if any."""
+        # Only entities starting within the widest one's width of left can reach it
+        start = bisect_right(self.entities, left - self.widest, key=entity_x)
+        end = bisect_left(self.entities, right, key=entity_x)
+        for entity in self.entities[start:end]:
+            if entity.x + entity.width > left:
+                return entity
+        return None
 
 class Game:
     def __init__(self):
@@ -193,6 +332,10 @@ class Game:
         pygame.display.set_caption("Frogger")
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 36)
+        self.background = create_background()
+        self.wave_strip = create_wave_strip()
+        self.hud = None
+        self.hud_values = None
         self.reset()
     
     def reset(self):
@@ -200,28 +343,37 @@ class Game:
         self.lives = STARTING_LIVES
         self.score = 0
         self.reached_spots = [False] * 5  # 5 spots to reach at top
-        
+        self.build_lanes()
+
+    def build_lanes(self, vehicles_per_lane=VEHICLES_PER_LANE, logs_per_lane=LOGS_PER_LANE):
         # Create vehicles in lanes
         self.vehicles = []
-        vehicle_lanes = range(7, 11)  # 4 lanes of traffic
-        for lane in vehicle_lanes:
+        self.road = {}
+        for lane in ROAD_LANES:
             y = lane * GRID_SIZE
             speed = (2 + lane % 2) * (1 if lane % 2 == 0 else -1)
+            self.road[lane] = Lane(lane, speed)
             # Add multiple vehicles per lane
-            for i in range(3):
-                x = (WINDOW_WIDTH // 3) * i
-                self.vehicles.append(Vehicle(x, y, speed, lane))
+            for i in range(vehicles_per_lane):
+                x = WINDOW_WIDTH * i // vehicles_per_lane
+                vehicle = Vehicle(x, y, speed, lane)
+                self.vehicles.append(vehicle)
+                self.road[lane].add(vehicle)
         
         # Create logs in river
         self.logs = []
-        log_lanes = range(2, 6)  # 4 lanes of river
-        for lane in log_lanes:
+        self.river = {}
+        for lane in RIVER_LANES:
             y = lane * GRID_SIZE
             speed = (1 + lane % 2) * (1 if lane % 2 == 0 else -1)
+            self.river[lane] = Lane(lane, speed)
             # Add multiple logs per lane
-            for i in range(2):
-                x = (WINDOW_WIDTH // 2) * i
-                self.logs.append(Log(x, y, speed, lane))
+            for i in range(logs_per_lane):
+                x = WINDOW_WIDTH * i // logs_per_lane
+                log = Log(x, y, speed, lane)
+                self.logs.append(log)
+                self.river[lane].add(log)
+        self.lanes = list(self.road.values()) + list(self.river.values())
     
     def handle_input(self):
         for event in pygame.event.get():
@@ -249,38 +401,32 @@ class Game:
         
         return True
     
+    def touching(self, lanes):
+        """The first entity the frog's hitbox overlaps in lanes, top row first."""
+        left = self.frog.x - self.frog.size//2
+        top = self.frog.y - self.frog.size//2
+        # The frog sits between rows, so its hitbox can reach into two lanes
+        first_row = (top - LANE_HEIGHT + LANE_HEIGHT//2) // GRID_SIZE + 1
+        last_row = -((-(top + self.frog.size + LANE_HEIGHT//2)) // GRID_SIZE) - 1
+        for row in range(first_row, last_row + 1):
+            lane = lanes.get(row)
+            if lane:
+                entity = lane.touching(left, left + self.frog.size)
+                if entity:
+                    return entity
+        return None
+
     def check_collisions(self):
-        # Get frog hitbox
-        frog_rect = pygame.Rect(
-            self.frog.x - self.frog.size//2,
-            self.frog.y - self.frog.size//2,
-            self.frog.size,
-            self.frog.size
-        )
-        
         # Check vehicle collisions
-        for vehicle in self.vehicles:
-            vehicle_rect = pygame.Rect(
-                vehicle.x, vehicle.y - vehicle.height//2,
-                vehicle.width, vehicle.height
-            )
-            if frog_rect.colliderect(vehicle_rect):
-                return False
+        if self.touching(self.road):
+            return False
         
         # Check if in river
-        if 2 * GRID_SIZE < self.frog.y < 6 * GRID_SIZE:
-            on_any_log = False
-            for log in self.logs:
-                log_rect = pygame.Rect(
-                    log.x, log.y - log.height//2,
-                    log.width, log.height
-                )
-                if frog_rect.colliderect(log_rect):
-                    self.frog.on_log = log
-                    on_any_log = True
-                    break
-            if not on_any_log:
+        if RIVER_LANES[0] * GRID_SIZE < self.frog.y < (RIVER_LANES[-1] + 1) * GRID_SIZE:
+            log = self.touching(self.river)
+            if not log:
                 return False
+            self.frog.on_log = log
         
         # Check if reached top
         if self.frog.y < GRID_SIZE:
@@ -297,13 +443,9 @@ class Game:
         return True
     
     def update(self):
-        # Update vehicles
-        for vehicle in self.vehicles:
-            vehicle.update()
-        
-        # Update logs
-        for log in self.logs:
-            log.update()
+        # Update vehicles and logs
+        for lane in self.lanes:
+            lane.update()
         
         # Update frog
         if not self.frog.update() or not self.check_collisions():
@@ -314,57 +456,35 @@ class Game:
         
         return True
     
+    def draw_hud(self):
+        # Text only changes with the lives or score, so render it then
+        if self.hud_values != (self.lives, self.score):
+            self.hud_values = (self.lives, self.score)
+            self.hud = []
+            for color, offset in ((BLACK, 1), (WHITE, 0)):  # Shadow first
+                lives_text = self.font.render(f"Lives: {self.lives}", True, color)
+                score_text = self.font.render(f"Score: {self.score}", True, color)
+                self.hud.append((lives_text, (10 + offset, WINDOW_HEIGHT - 30 + offset)))
+                self.hud.append((score_text, (WINDOW_WIDTH - 150 + offset, WINDOW_HEIGHT - 30 + offset)))
+        for text, position in self.hud:
+            self.screen.blit(text, position)
+    
     def draw(self):
-        self.screen.fill(GRASS_GREEN)
-        
-        # Draw river with wave effect
-        pygame.draw.rect(self.screen, DARK_BLUE,
-                        (0, 2 * GRID_SIZE,
-                         WINDOW_WIDTH, 4 * GRID_SIZE))
+        self.screen.blit(self.background, (0, 0))
         
-        # Draw waves
-        for y in range(2, 6):
-            wave_y = y * GRID_SIZE
-            for x in range(0, WINDOW_WIDTH, 20):
-                offset = math.sin((x + pygame.time.get_ticks() * 0.1) * 0.1) * 3
-                pygame.draw.arc(self.screen, BLUE,
-                              (x, wave_y + offset, 20, 10),
-                              0, math.pi, 2)
+        # Waves: the same strip, slid further left every frame
+        scroll = int(pygame.time.get_ticks() * WAVE_SPEED) % WAVE_PERIOD
+        for y in RIVER_LANES:
+            self.screen.blit(self.wave_strip, (-scroll, y * GRID_SIZE - WAVE_HEIGHT))
         
-        # Draw road
-        pygame.draw.rect(self.screen, ROAD_GRAY,
-                        (0, 7 * GRID_SIZE,
-                         WINDOW_WIDTH, 4 * GRID_SIZE))
-        
-        # Draw road lines
-        for y in range(7, 11):
-            if y % 2 == 0:  # Dashed lines between lanes
-                for x in range(0, WINDOW_WIDTH, GRID_SIZE):
-                    pygame.draw.line(self.screen, YELLOW,
-                                   (x, y * GRID_SIZE),
-                                   (x + GRID_SIZE//2, y * GRID_SIZE),
-                                   2)
-        
-        # Draw goal area with lily pads
+        # Draw small frogs on the reached lily pads
         for i in range(5):
-            x = (WINDOW_WIDTH // 5) * i + (WINDOW_WIDTH // 10)
             if self.reached_spots[i]:
-                # Draw filled lily pad with frog
-                pygame.draw.circle(self.screen, DARK_GREEN,
-                                 (x, GRID_SIZE//2), GRID_SIZE//2)
-                pygame.draw.circle(self.screen, GREEN,
-                                 (x, GRID_SIZE//2), GRID_SIZE//2 - 2)
-                # Draw small frog
+                x = (WINDOW_WIDTH // 5) * i + (WINDOW_WIDTH // 10)
                 small_frog_size = GRID_SIZE//3
                 pygame.draw.ellipse(self.screen, DARK_GREEN,
                                   (x - small_frog_size//2, GRID_SIZE//2 - small_frog_size//2,
                                    small_frog_size, small_frog_size))
-            else:
-                # Draw empty lily pad
-                pygame.draw.circle(self.screen, DARK_GREEN,
-                                 (x, GRID_SIZE//2), GRID_SIZE//2)
-                pygame.draw.circle(self.screen, GREEN,
-                                 (x, GRID_SIZE//2), GRID_SIZE//2 - 2)
         
         # Draw logs
         for log in self.logs:
@@ -378,15 +498,7 @@ class Game:
         self.frog.draw(self.screen)
         
         # Draw HUD with shadow effect
-        lives_text = self.font.render(f"Lives: {self.lives}", True, BLACK)
-        score_text = self.font.render(f"Score: {self.score}", True, BLACK)
-        self.screen.blit(lives_text, (11, WINDOW_HEIGHT - 29))
-        self.screen.blit(score_text, (WINDOW_WIDTH - 149, WINDOW_HEIGHT - 29))
-        
-        lives_text = self.font.render(f"Lives: {self.lives}", True, WHITE)
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
-        self.screen.blit(lives_text, (10, WINDOW_HEIGHT - 30))
-        self.screen.blit(score_text, (WINDOW_WIDTH - 150, WINDOW_HEIGHT - 30))
+        self.draw_hud()
         
         pygame.display.flip()
     
@@ -397,9 +509,16 @@ class Game:
             self.draw()
             self.clock.tick(FPS)
 
-def main():
+def init():
+    pygame.display.init()
+    pygame.font.init()
+
+def run():
+    init()
+    rng.report()
     game = Game()
+    frame_profiler.attach(game)
     game.run()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    run() 
\ No newline at end of file
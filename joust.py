@@ -1,9 +1,14 @@
 import pygame
-import random
 import math
 
-# Initialize Pygame
-pygame.init()
+from entity_pool import EntityPool
+import frame_profiler
+import rng
+
+# Random streams
+ai_rng = rng.stream(rng.AI)
+spawn_rng = rng.stream(rng.SPAWN)
+cosmetic_rng = rng.stream(rng.COSMETIC)
 
 # Constants
 WIDTH, HEIGHT = 800, 600
@@ -12,6 +17,7 @@ GRAVITY = 0.5
 FLAP_STRENGTH = -8
 HORIZONTAL_SPEED = 4
 PLATFORM_HEIGHT = 20
+MAX_PARTICLES = 512  # Shared particle pool size
 
 # Colors
 WHITE = (255, 255, 255)
@@ -25,19 +31,36 @@ SKY_BLUE = (135, 206, 235)
 CLOUD_WHITE = (240, 240, 240)
 GOLD = (255, 215, 0)
 
-# Set up the display
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Joust")
-clock = pygame.time.Clock()
+# Set up the display, done by init() rather than on import
+screen = None
+clock = None
+
+def init():
+    global screen, clock
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Joust")
+    clock = pygame.time.Clock()
 
 class Particle:
-    def __init__(self, x, y, color):
+    # Pooled: created once by the particle EntityPool, then respawned
+    __slots__ = ('x', 'y', 'color', 'size', 'speed_x', 'speed_y', 'life', 'pool_index')
+
+    def __init__(self):
+        self.x = self.y = 0
+        self.color = WHITE
+        self.size = 0
+        self.speed_x = self.speed_y = 0
+        self.life = 0
+
+    def spawn(self, x, y, color):
         self.x = x
         self.y = y
         self.color = color
-        self.size = random.randint(2, 5)
-        self.speed_x = random.uniform(-2, 2)
-        self.speed_y = random.uniform(-2, 2)
+        self.size = cosmetic_rng.randint(2, 5)
+        self.speed_x = cosmetic_rng.uniform(-2, 2)
+        self.speed_y = cosmetic_rng.uniform(-2, 2)
         self.life = 30  # frames to live
 
     def update(self):
@@ -74,9 +97,9 @@ def create_background():
     
     # Draw clouds
     for _ in range(10):
-        x = random.randint(0, WIDTH)
-        y = random.randint(0, HEIGHT // 2)
-        size = random.randint(30, 60)
+        x = cosmetic_rng.randint(0, WIDTH)
+        y = cosmetic_rng.randint(0, HEIGHT // 2)
+        size = cosmetic_rng.randint(30, 60)
         pygame.draw.ellipse(background, CLOUD_WHITE, (x, y, size, size // 2))
     
     return background
@@ -141,8 +164,9 @@ def create_platform_sprite(width):
     return sprite
 
 class Player(pygame.sprite.Sprite):
-    def __init__(self):
+    def __init__(self, particles):
         super().__init__()
+        self.particles = particles
         self.direction = 1
         self.wing_angle = 0
         self.wing_direction = 1
@@ -152,7 +176,6 @@ class Player(pygame.sprite.Sprite):
         self.velocity_y = 0
         self.velocity_x = 0
         self.is_flapping = False
-        self.particles = []
 
     def update(self):
         # Apply gravity
@@ -189,23 +212,13 @@ class Player(pygame.sprite.Sprite):
             self.wing_angle = 0
             
         self.image = create_knight_sprite(WHITE, self.direction, self.wing_angle)
-        
-        # Update particles
-        for particle in self.particles[:]:
-            particle.update()
-            if particle.life <= 0:
-                self.particles.remove(particle)
 
     def flap(self):
         self.velocity_y = FLAP_STRENGTH
         self.is_flapping = True
         # Add flap particles
         for _ in range(5):
-            self.particles.append(Particle(
-                self.rect.centerx,
-                self.rect.centery,
-                WHITE
-            ))
+            self.particles.acquire(self.rect.centerx, self.rect.centery, WHITE)
 
     def move_left(self):
         self.velocity_x = -HORIZONTAL_SPEED
@@ -228,9 +241,10 @@ class Platform(pygame.sprite.Sprite):
         self.rect.y = y
 
 class Enemy(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    def __init__(self, x, y, particles):
         super().__init__()
-        self.direction = random.choice([-1, 1])
+        self.particles = particles
+        self.direction = spawn_rng.choice([-1, 1])
         self.wing_angle = 0
         self.wing_direction = 1
         self.image = create_knight_sprite(RED, self.direction, self.wing_angle)
@@ -238,15 +252,14 @@ class Enemy(pygame.sprite.Sprite):
         self.rect.x = x
         self.rect.y = y
         self.velocity_y = 0
-        self.velocity_x = random.choice([-2, 2])
-        self.particles = []
+        self.velocity_x = spawn_rng.choice([-2, 2])
         self.state = "patrol"  # patrol, attack, or flee
         self.target_platform = None
         self.flap_cooldown = 0
         self.change_direction_cooldown = 0
         self.attack_cooldown = 0
 
-    def update(self):
+    def update(self, player, platforms):
         # Update cooldowns
         if self.flap_cooldown > 0:
             self.flap_cooldown -= 1
@@ -276,12 +289,12 @@ class Enemy(pygame.sprite.Sprite):
             
             # Decide next action when on platform
             if self.attack_cooldown <= 0:
-                if random.random() < 0.3:  # 30% chance to attack
+                if ai_rng.random() < 0.3:  # 30% chance to attack
                     self.state = "attack"
                     self.attack_cooldown = 120
                 else:
                     self.state = "patrol"
-                    self.target_platform = random.choice(platforms.sprites())
+                    self.target_platform = ai_rng.choice(platforms.sprites())
             
             # Flap when ready to take off
             if self.flap_cooldown <= 0 and self.velocity_y >= 0:
@@ -312,7 +325,7 @@ class Enemy(pygame.sprite.Sprite):
                     self.direction = 1
                 
                 # Flap occasionally while patrolling
-                if self.flap_cooldown <= 0 and random.random() < 0.1:
+                if self.flap_cooldown <= 0 and ai_rng.random() < 0.1:
                     self.flap()
                     self.flap_cooldown = 30
         
@@ -322,22 +335,12 @@ class Enemy(pygame.sprite.Sprite):
             self.wing_direction *= -1
             
         self.image = create_knight_sprite(RED, self.direction, self.wing_angle)
-        
-        # Update particles
-        for particle in self.particles[:]:
-            particle.update()
-            if particle.life <= 0:
-                self.particles.remove(particle)
 
     def flap(self):
         self.velocity_y = FLAP_STRENGTH
         # Add flap particles
         for _ in range(5):
-            self.particles.append(Particle(
-                self.rect.centerx,
-                self.rect.centery,
-                RED
-            ))
+            self.particles.acquire(self.rect.centerx, self.rect.centery, RED)
 
 class Lava(pygame.sprite.Sprite):
     def __init__(self, x, y, width):
@@ -353,7 +356,7 @@ class Lava(pygame.sprite.Sprite):
         self.image.fill((0, 0, 0, 0))
         self.animation_frame = (self.animation_frame + 1) % 10
         for i in range(0, self.rect.width, 10):
-            height = random.randint(5, 15)
+            height = cosmetic_rng.randint(5, 15)
             color = (
                 LAVA[0],
                 LAVA[1],
@@ -362,137 +365,156 @@ class Lava(pygame.sprite.Sprite):
             )
             pygame.draw.rect(self.image, color, (i, 20-height, 10, height))
 
-# Create sprite groups
-all_sprites = pygame.sprite.Group()
-platforms = pygame.sprite.Group()
-enemies = pygame.sprite.Group()
-lava_pits = pygame.sprite.Group()
-
-# Create background
-background = create_background()
-
-# Create player
-player = Player()
-all_sprites.add(player)
-
-# Create platforms
-platform_positions = [
-    (100, 400, 200),
-    (400, 300, 200),
-    (600, 500, 200),
-    (200, 200, 200),
-]
-
-for x, y, width in platform_positions:
-    platform = Platform(x, y, width)
-    platforms.add(platform)
-    all_sprites.add(platform)
-
-# Create lava pits
-lava_positions = [
-    (0, HEIGHT - 20, WIDTH),
-]
-
-for x, y, width in lava_positions:
-    lava = Lava(x, y, width)
-    lava_pits.add(lava)
-    all_sprites.add(lava)
-
-# Create enemies
-for _ in range(3):
-    x = random.randint(0, WIDTH - 40)
-    y = random.randint(0, HEIGHT // 2)
-    enemy = Enemy(x, y)
-    enemies.add(enemy)
-    all_sprites.add(enemy)
-
-# Game loop
-running = True
-score = 0
-font = pygame.font.Font(None, 36)
-score_popups = []
-
-while running:
-    # Keep loop running at the right speed
-    clock.tick(FPS)
-    
-    # Process input/events
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_SPACE:
-                player.flap()
-            elif event.key == pygame.K_LEFT:
-                player.move_left()
-            elif event.key == pygame.K_RIGHT:
-                player.move_right()
-        elif event.type == pygame.KEYUP:
-            if event.key in (pygame.K_LEFT, pygame.K_RIGHT):
-                player.stop_horizontal()
-    
-    # Update
-    all_sprites.update()
-    
-    # Update lava animation
-    for lava in lava_pits:
-        lava.update_animation()
-    
-    # Check for platform collisions
-    platform_hits = pygame.sprite.spritecollide(player, platforms, False)
-    if platform_hits:
-        player.rect.bottom = platform_hits[0].rect.top
-        player.velocity_y = 0
-    
-    # Check for enemy collisions
-    enemy_hits = pygame.sprite.spritecollide(player, enemies, False)
-    for enemy in enemy_hits:
-        if player.velocity_y < enemy.velocity_y and player.rect.bottom < enemy.rect.centery:
-            # Player wins the joust
-            score += 100
-            score_popups.append(ScorePopup(enemy.rect.centerx, enemy.rect.centery, 100))
-            # Add explosion particles
-            for _ in range(20):
-                player.particles.append(Particle(
-                    enemy.rect.centerx,
-                    enemy.rect.centery,
-                    RED
-                ))
-            enemy.kill()
-        else:
-            # Player loses
-            running = False
-    
-    # Check for lava collisions
-    if pygame.sprite.spritecollide(player, lava_pits, False):
-        running = False
-    
-    # Update score popups
-    for popup in score_popups[:]:
-        popup.update()
-        if popup.life <= 0:
-            score_popups.remove(popup)
-    
-    # Draw / render
-    screen.blit(background, (0, 0))
-    all_sprites.draw(screen)
-    
-    # Draw particles
-    for particle in player.particles:
-        particle.draw(screen)
-    for enemy in enemies:
-        for particle in enemy.particles:
+class Game:
+    def __init__(self):
+        self.font = pygame.font.Font(None, 36)
+        self.background = create_background()
+        # Flap and explosion particles for every knight share one pool
+        self.particles = EntityPool(Particle, MAX_PARTICLES)
+        self.reset_game()
+
+    def reset_game(self):
+        # Create sprite groups
+        self.all_sprites = pygame.sprite.Group()
+        self.platforms = pygame.sprite.Group()
+        self.enemies = pygame.sprite.Group()
+        self.lava_pits = pygame.sprite.Group()
+        self.particles.clear()
+        self.score_popups = []
+        self.score = 0
+        self.game_over = False
+
+        # Create player
+        self.player = Player(self.particles)
+        self.all_sprites.add(self.player)
+
+        # Create platforms
+        platform_positions = [
+            (100, 400, 200),
+            (400, 300, 200),
+            (600, 500, 200),
+            (200, 200, 200),
+        ]
+
+        for x, y, width in platform_positions:
+            platform = Platform(x, y, width)
+            self.platforms.add(platform)
+            self.all_sprites.add(platform)
+
+        # Create lava pits
+        lava_positions = [
+            (0, HEIGHT - 20, WIDTH),
+        ]
+
+        for x, y, width in lava_positions:
+            lava = Lava(x, y, width)
+            self.lava_pits.add(lava)
+            self.all_sprites.add(lava)
+
+        # Create enemies
+        for _ in range(3):
+            x = spawn_rng.randint(0, WIDTH - 40)
+            y = spawn_rng.randint(0, HEIGHT // 2)
+            enemy = Enemy(x, y, self.particles)
+            self.enemies.add(enemy)
+            self.all_sprites.add(enemy)
+
+    def handle_input(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.game_over = True
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    self.player.flap()
+                elif event.key == pygame.K_LEFT:
+                    self.player.move_left()
+                elif event.key == pygame.K_RIGHT:
+                    self.player.move_right()
+            elif event.type == pygame.KEYUP:
+                if event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                    self.player.stop_horizontal()
+
+    def update(self):
+        player = self.player
+        player.update()
+        self.enemies.update(player, self.platforms)
+
+        # Update particles
+        for particle in self.particles:
+            particle.update()
+        self.particles.release_if(lambda particle: particle.life <= 0)
+
+        # Update lava animation
+        for lava in self.lava_pits:
+            lava.update_animation()
+
+        # Check for platform collisions
+        platform_hits = pygame.sprite.spritecollide(player, self.platforms, False)
+        if platform_hits:
+            player.rect.bottom = platform_hits[0].rect.top
+            player.velocity_y = 0
+
+        # Check for enemy collisions
+        enemy_hits = pygame.sprite.spritecollide(player, self.enemies, False)
+        for enemy in enemy_hits:
+            if player.velocity_y < enemy.velocity_y and player.rect.bottom < enemy.rect.centery:
+                # Player wins the joust
+                self.score += 100
+                self.score_popups.append(ScorePopup(enemy.rect.centerx, enemy.rect.centery, 100))
+                # Add explosion particles
+                for _ in range(20):
+                    self.particles.acquire(enemy.rect.centerx, enemy.rect.centery, RED)
+                enemy.kill()
+            else:
+                # Player loses
+                self.game_over = True
+
+        # Check for lava collisions
+        if pygame.sprite.spritecollide(player, self.lava_pits, False):
+            self.game_over = True
+
+        # Update score popups
+        for popup in self.score_popups[:]:
+            popup.update()
+            if popup.life <= 0:
+                self.score_popups.remove(popup)
+
+    def draw(self):
+        screen.blit(self.background, (0, 0))
+        self.all_sprites.draw(screen)
+
+        # Draw particles
+        for particle in self.particles:
             particle.draw(screen)
-    
-    # Draw score popups
-    for popup in score_popups:
-        popup.draw(screen)
-    
-    # Draw score
-    score_text = font.render(f'Score: {score}', True, WHITE)
-    screen.blit(score_text, (10, 10))
-    
-    # Flip the display
-    pygame.display.flip()
 
-pygame.quit() 
\ No newline at end of file
+        # Draw score popups
+        for popup in self.score_popups:
+            popup.draw(screen)
+
+        # Draw score
+        score_text = self.font.render(f'Score: {self.score}', True, WHITE)
+        screen.blit(score_text, (10, 10))
+
+        # Flip the display
+        pygame.display.flip()
+
+    def run(self):
+        while not self.game_over:
+            # Keep loop running at the right speed
+            clock.tick(FPS)
+            self.handle_input()
+            if self.game_over:
+                break
+            self.update()
+            self.draw()
+
+def run():
+    init()
+    rng.report()
+    game = Game()
+    frame_profiler.attach(game)
+    game.run()
+    pygame.quit()
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,216 @@
+# Launcher
+# Description: Arcade menu that switches between the games inside one warm pygame process
+#
+# Usage:
+#   python launcher.py
+#
+# Games are discovered by scanning this directory for modules that set a
+# window caption; nothing is imported until a game is picked, and a game
+# imported once stays loaded for the next switch. pygame is initialised
+# once, every game draws to the same display surface, and fonts come from
+# one cache shared by all of them.
+#
+# F10 returns from a game to the menu, as does the game quitting itself.
+# Closing the window exits the launcher.
+
+import os
+import re
+import sys
+import time
+
+import pygame
+
+import rng
+from replay import CachedFont, run_game
+
+# Launcher Settings
+MENU_SIZE = (800, 600)
+MENU_KEY = pygame.K_F10
+CAPTION = "Retro Game Revival"
+CAPTION_PATTERN = re.compile(r"""pygame\.display\.set_caption\(\s*["']([^"']+)["']""")
+
+# Colors
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+GRAY = (128, 128, 128)
+YELLOW = (255, 255, 0)
+
+
+class BackToMenu(Exception):
+    """Raised from inside a game's event polling to unwind its main loop."""
+
+
+def discover(directory):
+    """Return (module name, title) for every game in directory, without importing any."""
+    games = []
+    for filename in sorted(os.listdir(directory)):
+        name, ext = os.path.splitext(filename)
+        if ext != '.py' or name == 'launcher':
+            continue
+        with open(os.path.join(directory, filename), encoding='utf-8') as f:
+            match = CAPTION_PATTERN.search(f.read())
+        if match:
+            games.append((name, match.group(1)))
+    return sorted(games, key=lambda game: game[1])
+
+
+class Launcher:
+    def __init__(self, games):
+        self.games = games
+        self.selected = 0
+        self.running = True
+        self.current = None       # Module name of the game being played
+        self.fonts = {}
+        self.switch_start = None  # When the current game was picked
+        self.last_switch = None   # (title, ms to first frame)
+
+        pygame.display.init()
+        pygame.font.init()
+        self.real = {
+            'set_mode': pygame.display.set_mode,
+            'flip': pygame.display.flip,
+            'update': pygame.display.update,
+            'quit': pygame.quit,
+            'get': pygame.event.get,
+            'font': pygame.font.Font,
+        }
+        self.screen = self.real['set_mode'](MENU_SIZE)
+        pygame.display.set_caption(CAPTION)
+        self.clock = pygame.time.Clock()
+
+    def install(self):
+        pygame.display.set_mode = self.set_mode
+        pygame.display.flip = self.flip
+        pygame.display.update = self.update_display
+        pygame.quit = self.quit_game
+        pygame.event.get = self.get_events
+        pygame.font.Font = self.get_font
+
+    def uninstall(self):
+        pygame.display.set_mode = self.real['set_mode']
+        pygame.display.flip = self.real['flip']
+        pygame.display.update = self.real['update']
+        pygame.quit = self.real['quit']
+        pygame.event.get = self.real['get']
+        pygame.font.Font = self.real['font']
+
+    # Stand-ins for the pygame functions games call
+
+    def set_mode(self, size=(0, 0), *args, **kwargs):
+        size = tuple(size)
+        surface = pygame.display.get_surface()
+        if surface is not None and surface.get_size() == size:
+            return surface  # Keep the window rather than recreating it
+        return self.real['set_mode'](size, *args, **kwargs)
+
+    def flip(self):
+        self.first_frame_shown()
+        self.real['flip']()
+
+    def update_display(self, *args):
+        self.first_frame_shown()
+        self.real['update'](*args)
+
+    def first_frame_shown(self):
+        if self.switch_start is not None:
+            elapsed = (time.perf_counter() - self.switch_start) * 1000
+            self.last_switch = (dict(self.games)[self.current], elapsed)
+            self.switch_start = None
+            print(f"{self.current}: first frame in {elapsed:.1f} ms")
+
+    def quit_game(self):
+        pass  # The display belongs to the launcher
+
+    def get_events(self, *args, **kwargs):
+        events = self.real['get'](*args, **kwargs)
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.running = False
+                raise BackToMenu
+            if event.type == pygame.KEYDOWN and event.key == MENU_KEY:
+                raise BackToMenu
+        return events
+
+    def get_font(self, *args):
+        font = self.fonts.get(args)
+        if font is None:
+            font = self.fonts[args] = CachedFont(*args)
+        return font
+
+    # Switching games
+
+    def play(self, name):
+        self.current = name
+        rng.seed()
+        self.switch_start = time.perf_counter()
+        try:
+            run_game(name)
+        except (BackToMenu, SystemExit):
+            pass
+        finally:
+            self.current = None
+            self.switch_start = None
+            self.screen = self.set_mode(MENU_SIZE)
+            pygame.display.set_caption(CAPTION)
+            self.real['get']()  # Drop input meant for the game
+
+    # Menu
+
+    def handle_menu_input(self):
+        for event in self.real['get']():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    self.running = False
+                elif event.key == pygame.K_UP:
+                    self.selected = (self.selected - 1) % len(self.games)
+                elif event.key == pygame.K_DOWN:
+                    self.selected = (self.selected + 1) % len(self.games)
+                elif event.key == pygame.K_RETURN:
+                    self.play(self.games[self.selected][0])
+
+    def draw_menu(self):
+        self.screen.fill(BLACK)
+        title = self.get_font(None, 72).render(CAPTION, True, WHITE)
+        self.screen.blit(title, title.get_rect(center=(MENU_SIZE[0] // 2, 70)))
+
+        font = self.get_font(None, 36)
+        for i, (name, game_title) in enumerate(self.games):
+            color = YELLOW if i == self.selected else WHITE
+            text = font.render(game_title, True, color)
+            self.screen.blit(text, text.get_rect(center=(MENU_SIZE[0] // 2, 140 + i * 30)))
+
+        small_font = self.get_font(None, 24)
+        help_text = small_font.render("UP/DOWN to choose, ENTER to play, F10 for the menu, ESC to quit",
+                                      True, GRAY)
+        self.screen.blit(help_text, help_text.get_rect(center=(MENU_SIZE[0] // 2, MENU_SIZE[1] - 40)))
+        if self.last_switch:
+            game_title, elapsed = self.last_switch
+            switch_text = small_font.render(f"{game_title}: first frame in {elapsed:.0f} ms", True, GRAY)
+            self.screen.blit(switch_text, (10, MENU_SIZE[1] - 20))
+        self.real['flip']()
+
+    def run(self):
+        self.install()
+        try:
+            while self.running:
+                self.handle_menu_input()
+                if self.running:
+                    self.draw_menu()
+                self.clock.tick(30)
+        finally:
+            self.uninstall()
+            pygame.quit()
+
+
+def main():
+    games = discover(os.path.dirname(os.path.abspath(__file__)))
+    if not games:
+        print("No games found")
+        return 1
+    Launcher(games).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
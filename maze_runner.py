@@ -5,11 +5,21 @@
 
 import pygame
 import sys
-import random
+from collections import deque
 from enum import Enum
 
-# Initialize Pygame
-pygame.init()
+try:
+    import numpy as np
+except ImportError:  # Distance fields fall back to a plain BFS
+    np = None
+
+import collision
+import frame_profiler
+import rng
+import savestate
+
+# Random streams
+level_rng = rng.stream(rng.LEVEL)
 
 # Constants
 WINDOW_WIDTH = 800
@@ -31,6 +41,11 @@ GRID_WIDTH = WINDOW_WIDTH // CELL_SIZE
 GRID_HEIGHT = WINDOW_HEIGHT // CELL_SIZE
 WALL_THICKNESS = 4
 
+# Render Settings
+TILE_SIZE = 512  # Maze walls are pre-rendered into square tiles of this size
+MAX_CACHED_TILES = 64  # Least recently used tiles are dropped past this
+CAMERA_SLACK = 0.1  # Fraction of the remaining distance the camera closes per frame
+
 # Player Settings
 PLAYER_SIZE = CELL_SIZE - 10
 PLAYER_SPEED = 5
@@ -41,10 +56,24 @@ COIN_SIZE = 10
 COIN_COLOR = YELLOW
 COINS_COUNT = 5
 
-# Setup Display
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Maze Runner")
-clock = pygame.time.Clock()
+# Solver Settings
+EXACT_TOUR_LIMIT = 8  # Coin tours up to this many coins are solved exactly
+MAX_CACHED_FIELDS = 32  # Distance fields kept per maze before evicting
+HINT_COLOR = BLUE
+HINT_DOT_SIZE = 3
+HINT_WALK_STEPS = 2000  # Hint path cells walked per frame, player's end first
+
+# Setup Display, done by init() rather than on import
+screen = None
+clock = None
+
+def init():
+    global screen, clock
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption("Maze Runner")
+    clock = pygame.time.Clock()
 
 class Cell:
     def __init__(self, x, y):
@@ -56,20 +85,22 @@ class Cell:
     def get_pos(self):
         return (self.x * CELL_SIZE, self.y * CELL_SIZE)
 
-    def draw(self):
+    def draw(self, surface, offset_x=0, offset_y=0):
         x, y = self.get_pos()
+        x -= offset_x
+        y -= offset_y
         
         if self.walls["top"]:
-            pygame.draw.line(screen, WHITE, (x, y), 
+            pygame.draw.line(surface, WHITE, (x, y), 
                            (x + CELL_SIZE, y), WALL_THICKNESS)
         if self.walls["right"]:
-            pygame.draw.line(screen, WHITE, (x + CELL_SIZE, y),
+            pygame.draw.line(surface, WHITE, (x + CELL_SIZE, y),
                            (x + CELL_SIZE, y + CELL_SIZE), WALL_THICKNESS)
         if self.walls["bottom"]:
-            pygame.draw.line(screen, WHITE, (x + CELL_SIZE, y + CELL_SIZE),
+            pygame.draw.line(surface, WHITE, (x + CELL_SIZE, y + CELL_SIZE),
                            (x, y + CELL_SIZE), WALL_THICKNESS)
         if self.walls["left"]:
-            pygame.draw.line(screen, WHITE, (x, y + CELL_SIZE),
+            pygame.draw.line(surface, WHITE, (x, y + CELL_SIZE),
                            (x, y), WALL_THICKNESS)
 
 class Player:
@@ -86,13 +117,16 @@ class Player:
         self.cell_x = 0
         self.cell_y = 0
 
-    def draw(self):
+    def draw(self, camera_x=0, camera_y=0):
+        screen_x = self.x - camera_x
+        screen_y = self.y - camera_y
+
         # Draw player as a square with inner square
         pygame.draw.rect(screen, self.color,
-                        (self.x - self.size//2, self.y - self.size//2,
+                        (screen_x - self.size//2, screen_y - self.size//2,
                          self.size, self.size))
         pygame.draw.rect(screen, BLACK,
-                        (self.x - self.size//4, self.y - self.size//4,
+                        (screen_x - self.size//4, screen_y - self.size//4,
                          self.size//2, self.size//2))
 
     def move(self, dx, dy):
@@ -116,8 +150,8 @@ class Player:
             new_y = max(new_y, self.cell_y * CELL_SIZE + self.size//2)
         
         # Update position
-        self.x = max(self.size//2, min(new_x, WINDOW_WIDTH - self.size//2))
-        self.y = max(self.size//2, min(new_y, WINDOW_HEIGHT - self.size//2))
+        self.x = max(self.size//2, min(new_x, self.maze.pixel_width - self.size//2))
+        self.y = max(self.size//2, min(new_y, self.maze.pixel_height - self.size//2))
         
         # Update cell position
         self.cell_x = int(self.x // CELL_SIZE)
@@ -125,32 +159,47 @@ class Player:
 
 class Coin:
     def __init__(self, x, y):
+        self.cell_x = x
+        self.cell_y = y
         self.x = x * CELL_SIZE + CELL_SIZE // 2
         self.y = y * CELL_SIZE + CELL_SIZE // 2
         self.size = COIN_SIZE
         self.color = COIN_COLOR
         self.collected = False
 
-    def draw(self):
+    def draw(self, camera_x=0, camera_y=0):
         if not self.collected:
+            screen_x = self.x - camera_x
+            screen_y = self.y - camera_y
+
+            # Don't draw if off screen
+            if (screen_x + self.size < 0 or screen_x - self.size > WINDOW_WIDTH or
+                screen_y + self.size < 0 or screen_y - self.size > WINDOW_HEIGHT):
+                return
+
             # Draw coin as a circle with inner circle
-            pygame.draw.circle(screen, self.color, (self.x, self.y), self.size)
-            pygame.draw.circle(screen, BLACK, (self.x, self.y), self.size - 2)
-            pygame.draw.circle(screen, self.color, (self.x, self.y), self.size - 4)
+            pygame.draw.circle(screen, self.color, (screen_x, screen_y), self.size)
+            pygame.draw.circle(screen, BLACK, (screen_x, screen_y), self.size - 2)
+            pygame.draw.circle(screen, self.color, (screen_x, screen_y), self.size - 4)
 
     def check_collision(self, player):
         if not self.collected:
-            dx = abs(self.x - player.x)
-            dy = abs(self.y - player.y)
-            if dx < (player.size + self.size)//2 and dy < (player.size + self.size)//2:
+            reach = (player.size + self.size)//2
+            if collision.centers_within(self.x, self.y, player.x, player.y, reach, reach):
                 self.collected = True
                 return True
         return False
 
 class Maze:
-    def __init__(self):
-        self.grid = [[Cell(x, y) for x in range(GRID_WIDTH)]
-                    for y in range(GRID_HEIGHT)]
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT):
+        self.width = width
+        self.height = height
+        self.pixel_width = width * CELL_SIZE
+        self.pixel_height = height * CELL_SIZE
+        self.grid = [[Cell(x, y) for x in range(width)]
+                    for y in range(height)]
+        # Pre-rendered wall tiles keyed by (tile_x, tile_y), oldest first
+        self.tiles = {}
         self.generate()
 
     def get_neighbors(self, cell):
@@ -161,7 +210,7 @@ class Maze:
             new_x = cell.x + dx
             new_y = cell.y + dy
             
-            if (0 <= new_x < GRID_WIDTH and 0 <= new_y < GRID_HEIGHT and
+            if (0 <= new_x < self.width and 0 <= new_y < self.height and
                 not self.grid[new_y][new_x].visited):
                 neighbors.append((self.grid[new_y][new_x], dx, dy))
                 
@@ -191,7 +240,7 @@ class Maze:
             neighbors = self.get_neighbors(current)
             
             if neighbors:
-                next_cell, dx, dy = random.choice(neighbors)
+                next_cell, dx, dy = level_rng.choice(neighbors)
                 stack.append(current)
                 
                 self.remove_walls(current, next_cell, dx, dy)
@@ -208,29 +257,409 @@ class Maze:
             for cell in row:
                 cell.visited = False
 
-    def draw(self):
-        for row in self.grid:
-            for cell in row:
-                cell.draw()
+        # Walls changed, so any cached tiles are stale
+        self.tiles = {}
+
+    def render_tile(self, tile_x, tile_y):
+        # Walls never change after generation, so each tile is drawn once
+        origin_x = tile_x * TILE_SIZE
+        origin_y = tile_y * TILE_SIZE
+        tile = pygame.Surface((TILE_SIZE, TILE_SIZE))
+        tile.fill(BLACK)
+        tile.set_colorkey(BLACK)
+
+        # Include one extra cell on each side so walls straddling the
+        # tile border are drawn on both tiles
+        first_x = max(0, origin_x // CELL_SIZE - 1)
+        first_y = max(0, origin_y // CELL_SIZE - 1)
+        last_x = min(self.width, (origin_x + TILE_SIZE) // CELL_SIZE + 1)
+        last_y = min(self.height, (origin_y + TILE_SIZE) // CELL_SIZE + 1)
+
+        for y in range(first_y, last_y):
+            row = self.grid[y]
+            for x in range(first_x, last_x):
+                row[x].draw(tile, origin_x, origin_y)
+
+        return tile
+
+    def get_tile(self, tile_x, tile_y):
+        key = (tile_x, tile_y)
+        tile = self.tiles.pop(key, None)
+        if tile is None:
+            tile = self.render_tile(tile_x, tile_y)
+            if len(self.tiles) >= MAX_CACHED_TILES:
+                # Dicts keep insertion order, so the first key is the stalest
+                del self.tiles[next(iter(self.tiles))]
+        # Re-insert to mark as most recently used
+        self.tiles[key] = tile
+        return tile
+
+    def draw(self, camera_x=0, camera_y=0):
+        # Only blit the tiles overlapping the viewport, so the cost depends
+        # on the window size rather than the maze size. Walls are drawn
+        # centred on cell edges, so include the half-thickness overhang.
+        overhang = WALL_THICKNESS
+        first_x = max(0, int(camera_x - overhang) // TILE_SIZE)
+        first_y = max(0, int(camera_y - overhang) // TILE_SIZE)
+        last_x = min((self.pixel_width + overhang) // TILE_SIZE,
+                     int(camera_x + WINDOW_WIDTH) // TILE_SIZE)
+        last_y = min((self.pixel_height + overhang) // TILE_SIZE,
+                     int(camera_y + WINDOW_HEIGHT) // TILE_SIZE)
+
+        for tile_y in range(first_y, last_y + 1):
+            for tile_x in range(first_x, last_x + 1):
+                screen.blit(self.get_tile(tile_x, tile_y),
+                            (tile_x * TILE_SIZE - camera_x,
+                             tile_y * TILE_SIZE - camera_y))
+
+class MazeSolver:
+    """Shortest paths and coin tours over a generated maze.
+
+    Distance fields are rooted at targets (coins or any fixed cell) rather
+    than at the player: the maze is undirected, so a field from a coin
+    answers "how far is the player from this coin" for every cell at once,
+    and stays valid however the player moves. Fields are cached per maze.
+
+    Generated mazes are trees (one route between any two cells), so with
+    numpy a field comes from the tree's depths in a few array passes
+    instead of a BFS; see tree_field().
+    """
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.width = maze.width
+        self.height = maze.height
+        self.fields = {}
+        self.targets = set()
+        self.tour_cache = {}
+
+        # Flatten the walls into per-cell neighbour index tuples so the
+        # BFS inner loop never touches Cell objects or wall dicts
+        width = self.width
+        self.neighbors = []
+        for y, row in enumerate(maze.grid):
+            for x, cell in enumerate(row):
+                index = y * width + x
+                open_cells = []
+                if not cell.walls["top"]:
+                    open_cells.append(index - width)
+                if not cell.walls["right"]:
+                    open_cells.append(index + 1)
+                if not cell.walls["bottom"]:
+                    open_cells.append(index + width)
+                if not cell.walls["left"]:
+                    open_cells.append(index - 1)
+                self.neighbors.append(tuple(open_cells))
+        self.tree = self.build_tree()
+
+    def index(self, cell):
+        x, y = cell
+        return y * self.width + x
+
+    def cell(self, index):
+        return (index % self.width, index // self.width)
+
+    def build_tree(self):
+        """The maze as a tree rooted at cell 0, or None if it has loops or
+        unreachable cells (or numpy is missing).
+
+        Cells are numbered in depth-first order, so each cell's subtree is
+        the run of numbers from its enter to its leave.
+        """
+        count = self.width * self.height
+        neighbors = self.neighbors
+        if np is None or sum(map(len, neighbors)) != 2 * (count - 1):
+            return None
+
+        depth = [-1] * count
+        parent = [0] * count
+        depth[0] = 0
+        order = []
+        stack = [0]
+        while stack:
+            current = stack.pop()
+            order.append(current)
+            next_depth = depth[current] + 1
+            for neighbor in neighbors[current]:
+                if depth[neighbor] < 0:
+                    depth[neighbor] = next_depth
+                    parent[neighbor] = current
+                    stack.append(neighbor)
+        if len(order) != count:
+            return None
+
+        size = [1] * count
+        for current in reversed(order[1:]):
+            size[parent[current]] += size[current]
+        enter = np.empty(count, dtype=np.int64)
+        enter[order] = np.arange(count)
+        return depth, parent, np.array(depth), enter, enter + np.array(size)
+
+    def tree_field(self, source):
+        """distance_field() for a tree: the distance to a cell is both
+        depths minus twice the depth where their routes to the root meet."""
+        depth, parent, depths, enter, leave = self.tree
+        ancestors = [source]
+        current = source
+        for _ in range(depth[source]):
+            current = parent[current]
+            ancestors.append(current)
+        ancestors = np.array(ancestors)
+
+        # How many of source's ancestors contain each cell in their subtree
+        # is one more than the depth of the deepest one
+        count = len(depth)
+        shared = np.cumsum(np.bincount(enter[ancestors], minlength=count + 1) -
+                           np.bincount(leave[ancestors], minlength=count + 1))
+        return (depths + depth[source] - 2 * (shared[enter] - 1)).tolist()
+
+    def distance_field(self, cell):
+        """Step counts from cell to every cell (-1 if unreachable)."""
+        source = self.index(cell)
+        field = self.fields.pop(source, None)
+        if field is None:
+            if self.tree is not None:
+                field = self.tree_field(source)
+            else:
+                field = [-1] * (self.width * self.height)
+                field[source] = 0
+                queue = [source]
+                neighbors = self.neighbors
+                for current in queue:
+                    next_distance = field[current] + 1
+                    for neighbor in neighbors[current]:
+                        if field[neighbor] < 0:
+                            field[neighbor] = next_distance
+                            queue.append(neighbor)
+
+            if len(self.fields) >= MAX_CACHED_FIELDS:
+                del self.fields[next(iter(self.fields))]
+        # Re-insert to mark as most recently used
+        self.fields[source] = field
+        return field
+
+    def distance(self, start, goal):
+        return self.distance_field(goal)[self.index(start)]
+
+    def walk(self, field, index, steps):
+        """Up to steps cell indices after index on the way down field."""
+        neighbors = self.neighbors
+        distance = field[index]
+        indices = []
+        for _ in range(min(steps, distance)):
+            distance -= 1
+            for neighbor in neighbors[index]:
+                if field[neighbor] == distance:
+                    index = neighbor
+                    break
+            indices.append(index)
+        return indices
+
+    def path(self, start, goal):
+        """Cells from start to goal inclusive, walking down goal's field."""
+        field = self.distance_field(goal)
+        current = self.index(start)
+        distance = field[current]
+        if distance < 0:
+            return []
+
+        indices = [current] + self.walk(field, current, distance)
+        width = self.width
+        return [(index % width, index // width) for index in indices]
+
+    def set_targets(self, cells):
+        self.targets = set(cells)
+        self.tour_cache = {}
+
+    def remove_target(self, cell):
+        # Collected coins no longer need their fields
+        self.targets.discard(cell)
+        self.fields.pop(self.index(cell), None)
+
+    def nearest_target(self, start, targets=None):
+        """Closest target to start as (cell, distance), or (None, -1)."""
+        if targets is None:
+            targets = self.targets
+        if not targets:
+            return None, -1
+
+        if len(targets) <= MAX_CACHED_FIELDS:
+            start_index = self.index(start)
+            best = None
+            for target in targets:
+                distance = self.distance_field(target)[start_index]
+                if distance >= 0 and (best is None or distance < best[1]):
+                    best = (target, distance)
+            return best if best else (None, -1)
+
+        # Too many targets to keep a field each, so search outward from
+        # start and stop at the first target reached
+        target_indices = {self.index(target) for target in targets}
+        source = self.index(start)
+        distances = {source: 0}
+        queue = [source]
+        for current in queue:
+            if current in target_indices:
+                return self.cell(current), distances[current]
+            for neighbor in self.neighbors[current]:
+                if neighbor not in distances:
+                    distances[neighbor] = distances[current] + 1
+                    queue.append(neighbor)
+        return None, -1
+
+    def tour_length(self, start):
+        """Steps to collect every remaining target starting from start.
+
+        Exact (Held-Karp) for up to EXACT_TOUR_LIMIT targets, otherwise a
+        greedy nearest-target estimate. Results are cached per start cell
+        and set of remaining targets.
+        """
+        key = (start, frozenset(self.targets))
+        if key in self.tour_cache:
+            return self.tour_cache[key]
+
+        targets = list(self.targets)
+        if len(targets) <= EXACT_TOUR_LIMIT:
+            length = self.exact_tour_length(start, targets)
+        else:
+            length = self.greedy_tour_length(start)
+
+        self.tour_cache[key] = length
+        return length
+
+    def exact_tour_length(self, start, targets):
+        count = len(targets)
+        if count == 0:
+            return 0
+
+        fields = [self.distance_field(target) for target in targets]
+        start_index = self.index(start)
+        target_indices = [self.index(target) for target in targets]
+        from_start = [field[start_index] for field in fields]
+        between = [[fields[j][target_indices[i]] for j in range(count)]
+                   for i in range(count)]
+        if min(from_start) < 0:
+            return -1
+
+        # best[mask][i]: shortest walk visiting mask and ending at target i
+        full = (1 << count) - 1
+        infinity = float("inf")
+        best = [[infinity] * count for _ in range(full + 1)]
+        for i in range(count):
+            best[1 << i][i] = from_start[i]
+
+        for mask in range(1, full + 1):
+            row = best[mask]
+            for i in range(count):
+                length = row[i]
+                if length == infinity:
+                    continue
+                for j in range(count):
+                    if mask & (1 << j):
+                        continue
+                    candidate = length + between[i][j]
+                    next_row = best[mask | (1 << j)]
+                    if candidate < next_row[j]:
+                        next_row[j] = candidate
+
+        return min(best[full])
+
+    def greedy_tour_length(self, start):
+        remaining = set(self.targets)
+        current = start
+        total = 0
+        while remaining:
+            target, distance = self.nearest_target(current, remaining)
+            if target is None:
+                return -1
+            total += distance
+            remaining.discard(target)
+            current = target
+        return total
+
+    def dead_ends(self):
+        return sum(1 for cells in self.neighbors if len(cells) == 1)
+
+
+# A maze never changes once generated, and the solver only caches what
+# follows from it, so save states share both instead of copying them
+savestate.share_type(Maze)
+savestate.share_type(MazeSolver)
+
+def pick_coin_cells(width, height, count):
+    # Any cell except the player's starting corner
+    available_cells = [(x, y) for x in range(width)
+                      for y in range(height) if not (x == 0 and y == 0)]
+    return level_rng.sample(available_cells, count)
+
+
+def rate_mazes(count, width=GRID_WIDTH, height=GRID_HEIGHT, coins=COINS_COUNT):
+    """Generate and rate mazes offline, without opening a game.
+
+    Returns one dict per maze with the optimal (or estimated, for large
+    coin counts) tour length from the start cell and the dead-end count.
+    """
+    ratings = []
+    for _ in range(count):
+        maze = Maze(width, height)
+        solver = MazeSolver(maze)
+        solver.set_targets(pick_coin_cells(width, height, coins))
+        ratings.append({
+            "tour_length": solver.tour_length((0, 0)),
+            "dead_ends": solver.dead_ends(),
+        })
+    return ratings
+
 
 class Game:
-    def __init__(self):
-        self.maze = Maze()
+    def __init__(self, maze_width=GRID_WIDTH, maze_height=GRID_HEIGHT,
+                 coins_count=COINS_COUNT):
+        self.maze_width = maze_width
+        self.maze_height = maze_height
+        self.coins_count = coins_count
+        self.maze = Maze(maze_width, maze_height)
         self.player = Player(self.maze)
+        self.solver = MazeSolver(self.maze)
+        self.camera_x = 0
+        self.camera_y = 0
         self.coins = []
+        self.coin_cells = {}
+        self.coins_collected = 0
+        self.coins_remaining = 0
+        self.steps = 0
+        self.show_hint = False
+        # Hint path from the player towards the nearest coin, walked a few
+        # thousand cells a frame so a long new path never stalls a frame
+        self.hint_path = deque()
+        self.hint_cells = set()
+        self.hint_cell = None
+        self.hint_target = None
         self.start_time = pygame.time.get_ticks()
         self.game_over = False
         self.won = False
         self.create_coins()
+        self.optimal_steps = self.solver.tour_length((0, 0))
+        self.update_camera(snap=True)
 
     def create_coins(self):
         self.coins = []
-        available_cells = [(x, y) for x in range(GRID_WIDTH) 
-                          for y in range(GRID_HEIGHT) if not (x == 0 and y == 0)]
-        coin_positions = random.sample(available_cells, COINS_COUNT)
+        # Coins bucketed by cell, so collisions only look near the player
+        self.coin_cells = {}
+        coin_positions = pick_coin_cells(self.maze.width, self.maze.height,
+                                         self.coins_count)
         
         for x, y in coin_positions:
-            self.coins.append(Coin(x, y))
+            coin = Coin(x, y)
+            self.coins.append(coin)
+            self.coin_cells.setdefault((x, y), []).append(coin)
+        self.coins_collected = 0
+        self.coins_remaining = len(self.coins)
+        self.solver.set_targets(coin_positions)
+
+    def state_restored(self):
+        # The shared solver still holds the targets from before the restore
+        self.solver.targets = set(self.coin_cells)
+        self.hint_cell = None
 
     def handle_input(self):
         for event in pygame.event.get():
@@ -239,43 +668,162 @@ class Game:
                 sys.exit()
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE and self.game_over:
-                    self.__init__()
+                    self.__init__(self.maze_width, self.maze_height, self.coins_count)
+                elif event.key == pygame.K_h:
+                    self.show_hint = not self.show_hint
 
         if not self.game_over:
             keys = pygame.key.get_pressed()
             dx = keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]
             dy = keys[pygame.K_DOWN] - keys[pygame.K_UP]
+            previous_cell = (self.player.cell_x, self.player.cell_y)
             self.player.move(dx, dy)
+            if (self.player.cell_x, self.player.cell_y) != previous_cell:
+                self.steps += 1
+
+    def update_camera(self, snap=False):
+        # Keep the player centred, but never scroll past the maze edges
+        max_x = max(0, self.maze.pixel_width - WINDOW_WIDTH)
+        max_y = max(0, self.maze.pixel_height - WINDOW_HEIGHT)
+        target_x = max(0, min(self.player.x - WINDOW_WIDTH // 2, max_x))
+        target_y = max(0, min(self.player.y - WINDOW_HEIGHT // 2, max_y))
+
+        if snap:
+            self.camera_x = target_x
+            self.camera_y = target_y
+        else:
+            self.camera_x += (target_x - self.camera_x) * CAMERA_SLACK
+            self.camera_y += (target_y - self.camera_y) * CAMERA_SLACK
 
     def update(self):
         if self.game_over:
             return
 
-        # Check coin collisions
-        coins_collected = 0
-        for coin in self.coins:
-            if coin.check_collision(self.player):
-                coins_collected += 1
+        self.update_camera()
+
+        # Check coin collisions. The player is smaller than a cell, so it
+        # can only touch coins in its own cell or the ones around it.
+        for cell_y in range(self.player.cell_y - 1, self.player.cell_y + 2):
+            for cell_x in range(self.player.cell_x - 1, self.player.cell_x + 2):
+                bucket = self.coin_cells.get((cell_x, cell_y))
+                if not bucket:
+                    continue
+                for coin in bucket[:]:
+                    if coin.check_collision(self.player):
+                        bucket.remove(coin)
+                        self.coins_collected += 1
+                        self.coins_remaining -= 1
+                if not bucket:
+                    del self.coin_cells[(cell_x, cell_y)]
+                    self.solver.remove_target((cell_x, cell_y))
 
         # Check win condition
-        if all(coin.collected for coin in self.coins):
+        if self.coins_remaining == 0:
             self.game_over = True
             self.won = True
 
+    def update_hint(self):
+        """Keep the hint path from the player to the nearest coin current.
+
+        Only a new cell or a collected target changes it. A step along the
+        path or straight back off it moves the player's end; anything else
+        starts a new path. Either way the far end then walks on by up to
+        HINT_WALK_STEPS cells until it reaches the target.
+        """
+        player_cell = (self.player.cell_x, self.player.cell_y)
+        if player_cell != self.hint_cell or self.hint_target not in self.solver.targets:
+            self.move_hint(player_cell)
+        path = self.hint_path
+        if not path or path[-1] == self.hint_target:
+            return
+
+        solver = self.solver
+        width = solver.width
+        indices = solver.walk(solver.distance_field(self.hint_target),
+                              solver.index(path[-1]), HINT_WALK_STEPS)
+        cells = [(index % width, index // width) for index in indices]
+        path.extend(cells)
+        self.hint_cells.update(cells)
+
+    def move_hint(self, player_cell):
+        target, _ = self.solver.nearest_target(player_cell)
+        path = self.hint_path
+        self.hint_cell = player_cell
+        if target is not None and target == self.hint_target and path:
+            field = self.solver.distance_field(target)
+            old = self.solver.index(path[0])
+            new = self.solver.index(player_cell)
+            if len(path) > 1 and path[1] == player_cell:
+                self.hint_cells.discard(path.popleft())
+                return
+            if new in self.solver.neighbors[old] and field[new] == field[old] + 1:
+                path.appendleft(player_cell)
+                self.hint_cells.add(player_cell)
+                return
+
+        self.hint_path = deque([player_cell] if target is not None else [])
+        self.hint_cells = set(self.hint_path)
+        self.hint_target = target
+
+    def draw_hint(self, camera_x, camera_y):
+        # Dotted shortest path from the player to the nearest coin, only
+        # where it crosses the screen
+        self.update_hint()
+        first_x = camera_x // CELL_SIZE
+        first_y = camera_y // CELL_SIZE
+        last_x = (camera_x + WINDOW_WIDTH) // CELL_SIZE
+        last_y = (camera_y + WINDOW_HEIGHT) // CELL_SIZE
+        if (last_x - first_x + 1) * (last_y - first_y + 1) > len(self.hint_path):
+            cells = self.hint_path
+        else:
+            cells = [(x, y) for y in range(first_y, last_y + 1)
+                     for x in range(first_x, last_x + 1)
+                     if (x, y) in self.hint_cells]
+
+        for x, y in cells:
+            if (x, y) == self.hint_cell or (x, y) == self.hint_target:
+                continue
+            pygame.draw.circle(screen, HINT_COLOR,
+                             (x * CELL_SIZE + CELL_SIZE // 2 - camera_x,
+                              y * CELL_SIZE + CELL_SIZE // 2 - camera_y),
+                             HINT_DOT_SIZE)
+
+    def draw_coins(self, camera_x, camera_y):
+        # Only visit the cells on screen instead of every coin in the maze
+        first_x = camera_x // CELL_SIZE
+        first_y = camera_y // CELL_SIZE
+        last_x = (camera_x + WINDOW_WIDTH) // CELL_SIZE
+        last_y = (camera_y + WINDOW_HEIGHT) // CELL_SIZE
+        if (last_x - first_x + 1) * (last_y - first_y + 1) > len(self.coin_cells):
+            buckets = self.coin_cells.values()
+        else:
+            buckets = [self.coin_cells[(x, y)]
+                       for y in range(first_y, last_y + 1)
+                       for x in range(first_x, last_x + 1)
+                       if (x, y) in self.coin_cells]
+
+        for bucket in buckets:
+            for coin in bucket:
+                coin.draw(camera_x, camera_y)
+
     def draw(self):
         screen.fill(BLACK)
         
-        # Draw maze and game objects
-        self.maze.draw()
-        for coin in self.coins:
-            coin.draw()
-        self.player.draw()
+        # Draw maze and game objects, rounding the camera so walls and
+        # sprites scroll together
+        camera_x = int(self.camera_x)
+        camera_y = int(self.camera_y)
+        self.maze.draw(camera_x, camera_y)
+        if self.show_hint and not self.game_over:
+            self.draw_hint(camera_x, camera_y)
+        self.draw_coins(camera_x, camera_y)
+        self.player.draw(camera_x, camera_y)
 
         # Draw time and coins
         font = pygame.font.Font(None, 36)
         elapsed_time = (pygame.time.get_ticks() - self.start_time) // 1000
         time_text = font.render(f"Time: {elapsed_time}s", True, WHITE)
-        coins_text = font.render(f"Coins: {sum(coin.collected for coin in self.coins)}/{COINS_COUNT}", 
+        coins_text = font.render(f"Coins: {self.coins_collected}/{len(self.coins)}", 
                                True, WHITE)
         screen.blit(time_text, (10, 10))
         screen.blit(coins_text, (WINDOW_WIDTH - 150, 10))
@@ -295,14 +843,22 @@ class Game:
             screen.blit(game_over_text, text_rect)
             
             font = pygame.font.Font(None, 36)
+            if self.won:
+                path_text = font.render(f"Path: {self.steps} cells (best {self.optimal_steps})",
+                                        True, WHITE)
+                path_rect = path_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + 90))
+                screen.blit(path_text, path_rect)
             restart_text = font.render("Press SPACE to restart", True, WHITE)
             restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + 50))
             screen.blit(restart_text, restart_rect)
 
         pygame.display.flip()
 
-def main():
+def run():
+    init()
+    rng.report()
     game = Game()
+    frame_profiler.attach(game)
 
     while True:
         game.handle_input()
@@ -311,4 +867,4 @@ def main():
         clock.tick(FPS)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    run() 
\ No newline at end of file
@@ -0,0 +1,603 @@
+# Netplay
+# Description: Two-machine Pong and Space War over UDP with rollback netcode
+#
+# Usage:
+#   python netplay.py host pong                  # waits for a player on port 4242
+#   python netplay.py join 192.168.1.20          # the game comes from the host
+#   python netplay.py host space_war --delay 1 --latency 40 --jitter 10 --loss 0.05
+#   python netplay.py check pong --frames 3600 --latency 60 --jitter 20 --loss 0.1
+#   python netplay.py check space_war --delay 0 1 3    # one run per input delay
+#
+# Both machines run the same deterministic simulation (pong's Paddle and
+# Ball, or space_war's Ship) from the same rng seed, and only exchange
+# inputs: one byte per player per frame. Local input is applied in the
+# frame it was read, so it feels as immediate as a local game. The other
+# player's input is predicted (their last known input held) until it
+# arrives; if the prediction was wrong, the match is restored from the
+# savestate taken before that frame and re-simulated with the real input.
+# Every packet carries all the inputs the peer hasn't acknowledged, so a
+# lost packet is covered by the next one. A peer running ahead of the
+# other waits a frame now and then so rollbacks stay short.
+#
+# --latency/--jitter/--loss delay, reorder and drop outgoing packets, to
+# try bad networks over loopback or a LAN. check runs both peers in one
+# process over loopback on a simulated clock, with random inputs, and
+# confirms they end in the same state as an offline run of those inputs,
+# with no input delay and with some (CHECK_DELAYS) unless --delay says otherwise.
+#
+# F1 toggles the overlay: round trip time, rollback depth, frames ahead
+# of the peer and frames spent waiting for it. ESC quits.
+
+import argparse
+import heapq
+import os
+import random
+import socket
+import struct
+import sys
+import time
+import zlib
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+
+import pong
+import rng
+import savestate
+import space_war
+
+# Network Settings
+PORT = 4242
+FPS = 60
+MAX_ROLLBACK = 8         # Frames the simulation may run ahead of the peer's inputs
+MAX_SEND = 64            # Most inputs resent in one packet
+RTT_SMOOTHING = 0.1      # Weight of each new round trip sample
+HANDSHAKE_INTERVAL = 0.25
+CHECK_DELAYS = [0, 2]    # Input delays check runs by default
+OVERLAY_KEY = pygame.K_F1
+
+# Packet kinds
+HELLO, WELCOME, INPUT = 1, 2, 3
+
+# kind, sender's next frame, last contiguous frame it has from us (-1 for
+# none), first input frame in the payload, send time, echoed send time and
+# how long the echoed packet was held. The payload is one byte per frame.
+HEADER = struct.Struct('!BIiIddd')
+
+# Colors
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+GRAY = (128, 128, 128)
+GREEN = (0, 255, 0)
+YELLOW = (255, 255, 0)
+
+
+class PongMatch:
+    """Two human paddles and a ball, stepped one frame of inputs at a time."""
+
+    UP, DOWN, RESTART = 1, 2, 4
+    KEYS = ((UP, (pygame.K_w, pygame.K_UP)), (DOWN, (pygame.K_s, pygame.K_DOWN)),
+            (RESTART, (pygame.K_r,)))
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.left = pong.Paddle(50, pong.WINDOW_HEIGHT/2 - pong.PADDLE_HEIGHT/2)
+        self.right = pong.Paddle(pong.WINDOW_WIDTH - 50 - pong.PADDLE_WIDTH,
+                                 pong.WINDOW_HEIGHT/2 - pong.PADDLE_HEIGHT/2)
+        self.ball = pong.Ball()
+        self.game_over = False
+
+    def step(self, inputs):
+        if self.game_over:
+            if any(bits & self.RESTART for bits in inputs):
+                self.reset()
+            return
+        for paddle, bits in zip((self.left, self.right), inputs):
+            if bits & self.UP:
+                paddle.move(True)
+            if bits & self.DOWN:
+                paddle.move(False)
+        self.ball.update(self.left, self.right)
+        self.game_over = max(self.left.score, self.right.score) >= pong.POINTS_TO_WIN
+
+    def random_input(self, bot):
+        return bot.choice((0, self.UP, self.DOWN))
+
+    def draw(self, screen, font):
+        screen.fill(BLACK)
+        for y in range(0, pong.WINDOW_HEIGHT, 20):
+            pygame.draw.rect(screen, GRAY, (pong.WINDOW_WIDTH/2 - 5, y, 10, 10))
+        self.left.draw(screen)
+        self.right.draw(screen)
+        self.ball.draw(screen)
+        screen.blit(font.render(str(self.left.score), True, WHITE), (pong.WINDOW_WIDTH/4, 20))
+        screen.blit(font.render(str(self.right.score), True, WHITE), (3*pong.WINDOW_WIDTH/4, 20))
+        if self.game_over:
+            winner = "Left" if self.left.score > self.right.score else "Right"
+            text = font.render(f"{winner} wins! Press R for a rematch", True, WHITE)
+            screen.blit(text, text.get_rect(center=(pong.WINDOW_WIDTH/2, pong.WINDOW_HEIGHT/2)))
+
+
+class SpaceWarMatch:
+    """Two human ships around one star, stepped one frame of inputs at a time."""
+
+    LEFT, RIGHT, THRUST, FIRE, HYPERSPACE, RESTART = 1, 2, 4, 8, 16, 32
+    KEYS = ((LEFT, (pygame.K_a, pygame.K_LEFT)), (RIGHT, (pygame.K_d, pygame.K_RIGHT)),
+            (THRUST, (pygame.K_w, pygame.K_UP)), (FIRE, (pygame.K_SPACE,)),
+            (HYPERSPACE, (pygame.K_h, pygame.K_RSHIFT)), (RESTART, (pygame.K_r,)))
+
+    # The same rules as a local game
+    check_collisions = space_war.Game.check_collisions
+    check_win_condition = space_war.Game.check_win_condition
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        # Keys are read by the session, not the ships
+        controls = space_war.Controls(0, 0, 0, 0, 0)
+        self.ship1 = space_war.Ship(space_war.WINDOW_WIDTH//4, space_war.WINDOW_HEIGHT//2,
+                                    space_war.GREEN, controls)
+        self.ship2 = space_war.Ship(3*space_war.WINDOW_WIDTH//4, space_war.WINDOW_HEIGHT//2,
+                                    space_war.RED, controls)
+        self.star_x, self.star_y = space_war.WINDOW_WIDTH // 2, space_war.WINDOW_HEIGHT // 2
+        self.game_over = False
+        self.winner = None
+
+    def step(self, inputs):
+        if self.game_over:
+            if any(bits & self.RESTART for bits in inputs):
+                self.reset()
+            return
+        ships = (self.ship1, self.ship2)
+        for ship, bits in zip(ships, inputs):
+            if ship.dead:
+                continue
+            if bits & self.LEFT: ship.rotate(False)
+            if bits & self.RIGHT: ship.rotate(True)
+            if bits & self.THRUST: ship.thrust()
+            if bits & self.HYPERSPACE: ship.hyperspace()
+            if bits & self.FIRE: ship.fire_torpedo()
+        for ship in ships:
+            ship.update(self.star_x, self.star_y)
+        self.check_collisions()
+        # Ship.update kills a ship that falls into the star before the
+        # collision check sees it
+        if not self.game_over and (self.ship1.dead or self.ship2.dead):
+            self.game_over = True
+            self.winner = self.ship2 if self.ship1.dead else self.ship1
+
+    def random_input(self, bot):
+        bits = bot.getrandbits(4)
+        if bot.random() < 0.02:
+            bits |= self.HYPERSPACE
+        return bits
+
+    def draw(self, screen, font):
+        screen.fill(BLACK)
+        pygame.draw.circle(screen, YELLOW, (self.star_x, self.star_y), space_war.STAR_RADIUS)
+        pygame.draw.circle(screen, (255, 165, 0), (self.star_x, self.star_y),
+                           space_war.STAR_DANGER_RADIUS, 1)
+        self.ship1.draw(screen)
+        self.ship2.draw(screen)
+        screen.blit(font.render(f"Green: {self.ship1.score}", True, space_war.GREEN), (10, 10))
+        screen.blit(font.render(f"Red: {self.ship2.score}", True, space_war.RED),
+                    (space_war.WINDOW_WIDTH - 100, 10))
+        if self.game_over:
+            winner = "Green" if self.winner is self.ship1 else "Red"
+            text = font.render(f"{winner} wins! Press R for a rematch", True, WHITE)
+            screen.blit(text, text.get_rect(center=(space_war.WINDOW_WIDTH//2, space_war.WINDOW_HEIGHT//2)))
+
+
+MATCHES = {'pong': (PongMatch, "Pong", (pong.WINDOW_WIDTH, pong.WINDOW_HEIGHT)),
+           'space_war': (SpaceWarMatch, "Space War", (space_war.WINDOW_WIDTH, space_war.WINDOW_HEIGHT))}
+
+
+def read_input(match, keys):
+    bits = 0
+    for bit, bound in match.KEYS:
+        if any(keys[key] for key in bound):
+            bits |= bit
+    return bits
+
+
+class Link:
+    """A non-blocking UDP socket talking to one peer."""
+
+    def __init__(self, sock, peer=None):
+        self.sock = sock
+        self.sock.setblocking(False)
+        self.peer = peer
+
+    def send(self, data):
+        self.sock.sendto(data, self.peer)
+
+    def pump(self):
+        pass
+
+    def receive(self):
+        """Yield (data, address) for every datagram waiting."""
+        while True:
+            try:
+                yield self.sock.recvfrom(2048)
+            except (BlockingIOError, ConnectionResetError):
+                return
+
+
+class LossyLink(Link):
+    """A Link whose outgoing packets are delayed, jittered and dropped."""
+
+    def __init__(self, sock, peer=None, latency=0.0, jitter=0.0, loss=0.0, seed=0, clock=time.perf_counter):
+        super().__init__(sock, peer)
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        # Its own generator: the network must not shift the game's streams
+        self.random = random.Random(seed)
+        self.clock = clock
+        self.queue = []  # (due time, order, data)
+        self.order = 0
+        self.sent = self.dropped = 0
+
+    def send(self, data):
+        self.sent += 1
+        if self.random.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+        heapq.heappush(self.queue, (self.clock() + delay, self.order, data))
+        self.order += 1
+        self.pump()
+
+    def pump(self):
+        now = self.clock()
+        while self.queue and self.queue[0][0] <= now:
+            self.sock.sendto(heapq.heappop(self.queue)[2], self.peer)
+
+
+class Session:
+    """Rollback netplay for one side of a match."""
+
+    def __init__(self, match, link, player, delay=0, clock=time.perf_counter):
+        self.match = match
+        self.link = link
+        self.player = player     # 0 plays the left paddle or first ship
+        self.clock = clock
+        self.frame = 0           # Next frame to simulate
+        self.local_inputs = dict.fromkeys(range(delay), 0)
+        self.delay = delay
+        self.remote_inputs = {}
+        self.remote_frame = -1   # Last frame with every remote input up to it
+        self.predicted = {}      # Remote input each simulated frame used
+        self.snapshots = {}      # Match state before each unconfirmed frame
+        self.rollback_from = None
+        self.peer_frame = 0
+        self.peer_ack = -1
+        self.echo = (0.0, 0.0)   # Peer's last send time and when it arrived
+        self.rtt = None
+        self.rollback_depth = 0
+        self.max_rollback = 0
+        self.rollbacks = 0
+        self.resimulated = 0
+        self.stalls = 0
+        self.welcome = None      # The host's answer, resent if the joiner missed it
+
+    def tick(self, bits, end=None):
+        """Advance one frame with this frame's local input, unless the peer
+        is too far behind (or the match reached end). Returns whether it did."""
+        self.link.pump()
+        self.receive()
+        if self.rollback_from is not None:
+            self.roll_back()
+        self.discard_confirmed()
+
+        advanced = False
+        if (end is None or self.frame < end) and not self.should_wait():
+            self.local_inputs[self.frame + self.delay] = bits
+            self.simulate(self.frame)
+            advanced = True
+        elif end is None or self.frame < end:
+            self.stalls += 1
+        self.send()
+        return advanced
+
+    def frames_ahead(self):
+        # Where the peer should be by now, given how old its last packet is
+        rtt_frames = (self.rtt or 0) * FPS
+        return self.frame - (self.peer_frame + rtt_frames / 2)
+
+    def should_wait(self):
+        return self.frame - self.remote_frame > MAX_ROLLBACK or self.frames_ahead() >= 2
+
+    def inputs_for(self, frame):
+        remote = self.remote_inputs.get(frame)
+        if remote is None:
+            # Assume the peer is still holding what they held last
+            remote = self.remote_inputs.get(self.remote_frame, 0)
+        self.predicted[frame] = remote
+        local = self.local_inputs[frame]
+        return (local, remote) if self.player == 0 else (remote, local)
+
+    def simulate(self, frame):
+        self.snapshots[frame] = savestate.snapshot(self.match)
+        self.match.step(self.inputs_for(frame))
+        self.frame = frame + 1
+
+    def roll_back(self):
+        start = self.rollback_from
+        end = self.frame
+        savestate.restore(self.match, self.snapshots[start])
+        for frame in range(start, end):
+            self.simulate(frame)
+        self.rollback_depth = end - start
+        self.max_rollback = max(self.max_rollback, self.rollback_depth)
+        self.rollbacks += 1
+        self.resimulated += end - start
+        self.rollback_from = None
+
+    def discard_confirmed(self):
+        # Nothing before the first unconfirmed frame can be rolled back to
+        # again. With input delay remote_frame runs ahead of frame, and
+        # frames not yet simulated still need their inputs.
+        # Local inputs are kept until the peer has them and they can't be resimulated
+        oldest = min(self.remote_frame + 1, self.frame)
+        for table, keep in ((self.snapshots, oldest), (self.predicted, oldest),
+                            (self.remote_inputs, min(self.remote_frame, self.frame)),
+                            (self.local_inputs, min(oldest, self.peer_ack + 1))):
+            for frame in [f for f in table if f < keep]:
+                del table[frame]
+
+    def send(self):
+        now = self.clock()
+        first = self.peer_ack + 1
+        last = min(self.frame + self.delay, first + MAX_SEND)
+        payload = bytes(self.local_inputs[f] for f in range(first, last) if f in self.local_inputs)
+        sent_at, received_at = self.echo
+        held = now - received_at if sent_at else 0.0
+        self.link.send(HEADER.pack(INPUT, self.frame, self.remote_frame, first,
+                                   now, sent_at, held) + payload)
+
+    def receive(self):
+        for data, address in self.link.receive():
+            if len(data) < HEADER.size or address != self.link.peer:
+                continue
+            kind, peer_frame, ack, first, sent_at, echoed, held = HEADER.unpack_from(data)
+            if kind == HELLO and self.welcome:
+                self.link.sock.sendto(self.welcome, address)
+            if kind != INPUT:
+                continue
+            now = self.clock()
+            self.peer_frame = max(self.peer_frame, peer_frame)
+            self.peer_ack = max(self.peer_ack, ack)
+            if sent_at > self.echo[0]:
+                self.echo = (sent_at, now)
+            if echoed:
+                sample = now - echoed - held
+                self.rtt = sample if self.rtt is None else self.rtt + (sample - self.rtt) * RTT_SMOOTHING
+            for frame, bits in enumerate(data[HEADER.size:], first):
+                if frame <= self.remote_frame or frame in self.remote_inputs:
+                    continue
+                self.remote_inputs[frame] = bits
+                if frame < self.frame and self.predicted.get(frame) != bits:
+                    if self.rollback_from is None or frame < self.rollback_from:
+                        self.rollback_from = frame
+            while self.remote_frame + 1 in self.remote_inputs:
+                self.remote_frame += 1
+
+
+def open_socket(port=0, host=''):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((host, port))
+    return sock
+
+
+def make_link(sock, args, peer=None, seed=0, clock=time.perf_counter):
+    if args.latency or args.jitter or args.loss:
+        return LossyLink(sock, peer, args.latency / 1000, args.jitter / 1000, args.loss, seed, clock)
+    return Link(sock, peer)
+
+
+def handshake_packet(kind, seed, payload=b''):
+    return HEADER.pack(kind, 0, -1, seed, 0.0, 0.0, 0.0) + payload
+
+
+def host(args):
+    """Wait for a HELLO, answer with the game and seed; returns (link, seed, welcome)."""
+    sock = open_socket(args.port)
+    print(f"Hosting {args.game} on port {args.port}, waiting for a player...")
+    sock.settimeout(None)
+    while True:
+        data, address = sock.recvfrom(2048)
+        if len(data) >= HEADER.size and data[0] == HELLO:
+            break
+    seed = rng.seed(args.seed)
+    welcome = handshake_packet(WELCOME, seed, args.game.encode())
+    sock.sendto(welcome, address)
+    print(f"{address[0]} joined")
+    return make_link(sock, args, address, seed), seed, welcome
+
+
+def join(args):
+    """Say HELLO until the host answers; returns (link, seed, game)."""
+    sock = open_socket()
+    address = (socket.gethostbyname(args.address), args.port)
+    print(f"Joining {address[0]}:{address[1]}...")
+    sock.settimeout(HANDSHAKE_INTERVAL)
+    while True:
+        sock.sendto(handshake_packet(HELLO, 0), address)
+        try:
+            data, sender = sock.recvfrom(2048)
+        except socket.timeout:
+            continue
+        if sender == address and len(data) >= HEADER.size and data[0] == WELCOME:
+            break
+    seed = HEADER.unpack_from(data)[3]
+    game = data[HEADER.size:].decode()
+    rng.seed(seed)
+    return make_link(sock, args, address, seed + 1), seed, game
+
+
+def draw_overlay(screen, font, session):
+    rtt = f"{session.rtt * 1000:.1f} ms" if session.rtt is not None else "-"
+    lines = [f"RTT {rtt}",
+             f"rollback {session.rollback_depth} (max {session.max_rollback}, {session.rollbacks} total)",
+             f"ahead {session.frames_ahead():.1f}  stalls {session.stalls}",
+             f"frame {session.frame}  confirmed {session.remote_frame}"]
+    for i, line in enumerate(lines):
+        screen.blit(font.render(line, True, GREEN), (10, screen.get_height() - 20 * (len(lines) - i) - 5))
+
+
+def play(args):
+    if args.command == 'host':
+        link, seed, welcome = host(args)
+        game, player = args.game, 0
+    else:
+        link, seed, game = join(args)
+        welcome, player = None, 1
+    match_type, title, size = MATCHES[game]
+
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode(size)
+    pygame.display.set_caption(f"{title} - Netplay ({'left' if player == 0 else 'right'})")
+    clock = pygame.time.Clock()
+    font = pygame.font.Font(None, 36)
+    small_font = pygame.font.Font(None, 24)
+    print(f"Seed: {seed}")
+
+    session = Session(match_type(), link, player, args.delay)
+    session.welcome = welcome
+    show_overlay = True
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key == OVERLAY_KEY:
+                    show_overlay = not show_overlay
+        session.tick(read_input(session.match, pygame.key.get_pressed()))
+        session.match.draw(screen, font)
+        if show_overlay:
+            draw_overlay(screen, small_font, session)
+        pygame.display.flip()
+        clock.tick(FPS)
+    pygame.quit()
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 1.0  # Send times of 0 mean "nothing to echo"
+
+    def __call__(self):
+        return self.now
+
+
+def state_digest(match):
+    state = savestate.snapshot(match)
+    return zlib.crc32(repr(state.rng_state).encode(), zlib.crc32(state.data))
+
+
+def check(args):
+    """Run check_delay for each --delay; returns whether every run stayed in sync."""
+    results = []
+    for delay in args.delay:
+        print(f"delay {delay}:")
+        results.append(check_delay(args, delay))
+    return all(results)
+
+
+def check_delay(args, delay):
+    """Play two sessions against each other over loopback with random
+    inputs; returns whether both match an offline run of those inputs."""
+    match_type = MATCHES[args.game][0]
+    clock = SimulatedClock()
+    sockets = [open_socket(host='127.0.0.1'), open_socket(host='127.0.0.1')]
+    addresses = [s.getsockname() for s in sockets]
+    sessions = []
+    rng_states = []  # Each peer has its own copy of the rng streams
+    for player in (0, 1):
+        rng.seed(args.seed)
+        link = make_link(sockets[player], args, addresses[1 - player], args.seed + player, clock)
+        sessions.append(Session(match_type(), link, player, delay, clock))
+        rng_states.append(rng.get_state())
+    bots = [random.Random(args.seed * 2 + player) for player in (0, 1)]
+    held = [0, 0]
+    inputs = [[], []]  # What each player actually pressed, frame by frame
+
+    start = time.perf_counter()
+    ticks = 0
+    while not all(s.frame == args.frames and s.remote_frame >= args.frames - 1 for s in sessions):
+        for player, session in enumerate(sessions):
+            if bots[player].random() < 0.1:
+                held[player] = session.match.random_input(bots[player])
+            rng.set_state(rng_states[player])
+            if session.tick(held[player], end=args.frames):
+                inputs[player].append(held[player])
+            rng_states[player] = rng.get_state()
+        clock.now += 1 / FPS
+        ticks += 1
+        if ticks > args.frames * 10:
+            print("Sessions stopped making progress")
+            return False
+    elapsed = time.perf_counter() - start
+
+    # Input is applied --delay frames after it was pressed
+    inputs = [[0] * delay + pressed for pressed in inputs]
+    rng.seed(args.seed)
+    reference = match_type()
+    for frame in range(args.frames):
+        reference.step((inputs[0][frame], inputs[1][frame]))
+    expected = state_digest(reference)
+    digests = []
+    for session, state in zip(sessions, rng_states):
+        rng.set_state(state)
+        digests.append(state_digest(session.match))
+
+    for player, session in enumerate(sessions):
+        link = session.link
+        dropped = f"{link.dropped}/{link.sent}" if isinstance(link, LossyLink) else "0/-"
+        print(f"player {player}: rtt {session.rtt * 1000:5.1f} ms  rollbacks {session.rollbacks:5}  "
+              f"max depth {session.max_rollback:2}  resimulated {session.resimulated:6}  "
+              f"stalls {session.stalls:4}  dropped {dropped}  "
+              f"{'in sync' if digests[player] == expected else 'DESYNC'}")
+    print(f"{args.frames} frames in {ticks} ticks, {elapsed:.2f}s of CPU for both peers")
+    return digests == [expected, expected]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pong and Space War over UDP with rollback")
+    commands = parser.add_subparsers(dest='command', required=True)
+    host_parser = commands.add_parser('host', help="wait for a player to join")
+    host_parser.add_argument('game', choices=list(MATCHES))
+    host_parser.add_argument('--seed', type=int)
+    join_parser = commands.add_parser('join', help="join a hosted game")
+    join_parser.add_argument('address')
+    check_parser = commands.add_parser('check', help="play two bots over loopback and check they stay in sync")
+    check_parser.add_argument('game', choices=list(MATCHES))
+    check_parser.add_argument('--frames', type=int, default=3600)
+    check_parser.add_argument('--seed', type=int, default=1)
+    check_parser.add_argument('--delay', type=int, nargs='+', default=CHECK_DELAYS,
+                              help="frames of input delay to check, one run each")
+    for sub in (host_parser, join_parser):
+        sub.add_argument('--delay', type=int, default=0, help="frames of input delay (fewer rollbacks)")
+    for sub in (host_parser, join_parser, check_parser):
+        sub.add_argument('--port', type=int, default=PORT)
+        sub.add_argument('--latency', type=float, default=0, help="ms added to every packet sent")
+        sub.add_argument('--jitter', type=float, default=0, help="ms of random variation in that latency")
+        sub.add_argument('--loss', type=float, default=0, help="fraction of packets dropped, e.g. 0.05")
+    args = parser.parse_args()
+
+    if args.command == 'check':
+        return 0 if check(args) else 1
+    play(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
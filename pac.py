@@ -1,12 +1,15 @@
 import pygame
 import sys
-import random
 from enum import Enum
 import math
 from collections import deque
 
-# Initialize Pygame
-pygame.init()
+import collision
+import frame_profiler
+import rng
+
+# Random streams
+ai_rng = rng.stream(rng.AI)
 
 # Constants
 WINDOW_SIZE = 600
@@ -261,10 +264,10 @@ class Ghost:
         if self.is_frightened:
             self.mode = "frightened"
             # Random movement when frightened
-            if random.random() < 0.1 or not self.can_move(maze, self.direction):
+            if ai_rng.random() < 0.1 or not self.can_move(maze, self.direction):
                 possible_directions = self.get_valid_directions(maze)
                 if possible_directions:
-                    self.direction = random.choice(possible_directions)
+                    self.direction = ai_rng.choice(possible_directions)
                     print(f"Ghost {self.color} choosing random direction: {self.direction}")
         else:
             if self.mode == "chase":
@@ -435,8 +438,7 @@ class Pacman:
 
         # Check for power pellet collection
         for pellet in power_pellets[:]:
-            if (abs(self.x - pellet[0]) < CELL_SIZE and 
-                abs(self.y - pellet[1]) < CELL_SIZE):
+            if collision.centers_within(self.x, self.y, pellet[0], pellet[1], CELL_SIZE, CELL_SIZE):
                 power_pellets.remove(pellet)
                 self.score += POWER_PELLET_SCORE
                 self.is_powered = True
@@ -455,8 +457,7 @@ class Pacman:
 
         # Check ghost collisions
         for ghost in ghosts:
-            if (abs(self.x - ghost.x) < CELL_SIZE and 
-                abs(self.y - ghost.y) < CELL_SIZE):
+            if collision.centers_within(self.x, self.y, ghost.x, ghost.y, CELL_SIZE, CELL_SIZE):
                 if self.is_powered:
                     # Eat ghost
                     ghost.x = GRID_WIDTH * CELL_SIZE // 2
@@ -508,7 +509,6 @@ class Pacman:
 
 class Game:
     def __init__(self):
-        pygame.init()
         self.screen = pygame.display.set_mode((WINDOW_SIZE, WINDOW_SIZE))
         pygame.display.set_caption("Pac-Man")
         self.clock = pygame.time.Clock()
@@ -577,8 +577,8 @@ class Game:
                 ghost.update(self.maze, self.pacman)
                 
                 # Check collision with Pac-Man
-                if (abs(ghost.x - self.pacman.x) < CELL_SIZE and 
-                    abs(ghost.y - self.pacman.y) < CELL_SIZE):
+                if collision.centers_within(ghost.x, ghost.y, self.pacman.x, self.pacman.y,
+                                            CELL_SIZE, CELL_SIZE):
                     if ghost.is_frightened:
                         # Ghost is eaten
                         ghost.x = GRID_WIDTH * CELL_SIZE // 2
@@ -807,6 +807,16 @@ class Game:
             self.draw()
             self.clock.tick(60)
 
-if __name__ == "__main__":
+def init():
+    pygame.display.init()
+    pygame.font.init()
+
+def run():
+    init()
+    rng.report()
     game = Game()
-    game.run() 
\ No newline at end of file
+    frame_profiler.attach(game)
+    game.run()
+
+if __name__ == "__main__":
+    run()
@@ -1,8 +1,15 @@
 import pygame
-import random
 import math
+import time
+from collections import deque
 
-pygame.init()
+import collision
+import frame_profiler
+import rng
+
+# Random streams
+ai_rng = rng.stream(rng.AI)
+spawn_rng = rng.stream(rng.SPAWN)
 
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
@@ -21,9 +28,22 @@ BALL_MAX_SPEED = 15
 AI_SPEED_EASY = 3
 AI_SPEED_MEDIUM = 4
 AI_SPEED_HARD = 5
+AI_ERROR_FRAMES = (30, 60)  # How long the AI keeps one aiming error
 POINTS_TO_WIN = 5
 COUNTDOWN_TIME = 3 
 
+LOW_LATENCY = False     # Start in low-latency mode (L toggles it)
+LATENCY_MARGIN = 0.002  # Seconds of slack left between drawing and the frame being due
+SPIN_TIME = 0.002       # The last part of a wait is spun rather than slept
+LATENCY_WINDOW = 60     # Presses and frames the latency probe averages over
+
+# AI difficulty: (dead zone, predicts the ball's path, max aiming error)
+AI_SETTINGS = {
+    "easy": (AI_SPEED_EASY, False, 0),
+    "medium": (AI_SPEED_MEDIUM, True, 50),
+    "hard": (AI_SPEED_HARD, True, 0),
+}
+
 class Paddle:
     def __init__(self, x, y, is_ai=False, ai_difficulty="medium"):
         self.x = x
@@ -34,8 +54,12 @@ class Paddle:
         self.score = 0
         self.is_ai = is_ai
         self.ai_difficulty = ai_difficulty
+        self.ai_settings = None  # Used instead of AI_SETTINGS[ai_difficulty] when set
         self.prediction_error = 0
         self.error_countdown = 0
+        # Last impact prediction and the ball velocity it was made for
+        self.predicted_velocity = None
+        self.predicted_y = 0
     
     def move(self, up=True):
         if up and self.y > 0:
@@ -44,20 +68,17 @@ class Paddle:
             self.y += self.speed
     
     def ai_move(self, ball):
-        if self.ai_difficulty == "easy":
-            target_y = ball.y - self.height/2
-            speed = AI_SPEED_EASY
-        else:
+        speed, predicts, max_error = self.ai_settings or AI_SETTINGS[self.ai_difficulty]
+        if predicts:
             target_y = self.predict_ball_position(ball)
-            if self.ai_difficulty == "medium":
-                if self.error_countdown <= 0:
-                    self.prediction_error = random.randint(-50, 50)
-                    self.error_countdown = random.randint(30, 60)
-                self.error_countdown -= 1
-                target_y += self.prediction_error
-                speed = AI_SPEED_MEDIUM
-            else:
-                speed = AI_SPEED_HARD
+        else:
+            target_y = ball.y - self.height/2
+        if max_error:
+            if self.error_countdown <= 0:
+                self.prediction_error = ai_rng.randint(-max_error, max_error)
+                self.error_countdown = ai_rng.randint(*AI_ERROR_FRAMES)
+            self.error_countdown -= 1
+            target_y += self.prediction_error
         
         if abs(self.y + self.height/2 - target_y) > speed:
             if self.y + self.height/2 > target_y:
@@ -66,20 +87,32 @@ class Paddle:
                 self.move(False)
     
     def predict_ball_position(self, ball):
-        if ball.dx <= 0:
+        future_y, frames = self.predict_impact(ball)
+        if future_y is None:
             return WINDOW_HEIGHT/2 - self.height/2
-      
-        time_to_paddle = (self.x - ball.x) / ball.dx
-        
-        future_y = ball.y + ball.dy * time_to_paddle
+        return future_y - self.height/2
+    
+    def predict_impact(self, ball):
+        """Return (y, frames until impact) for the ball reaching this paddle,
+        or (None, None) while it is moving away."""
+        # The ball's centre stops half its size short of the paddle's face
+        if self.x > WINDOW_WIDTH/2:
+            face_x = self.x - BALL_SIZE/2
+        else:
+            face_x = self.x + self.width + BALL_SIZE/2
+        frames = (face_x - ball.x) / ball.dx if ball.dx else -1
+        if frames < 0:
+            return None, None
         
-        while future_y < 0 or future_y > WINDOW_HEIGHT:
-            if future_y < 0:
-                future_y = -future_y
-            elif future_y > WINDOW_HEIGHT:
+        # The impact point stays the same until a bounce changes the velocity
+        if self.predicted_velocity != (ball.dx, ball.dy):
+            # Unfold the wall bounces: the path repeats every 2 * WINDOW_HEIGHT
+            future_y = (ball.y + ball.dy * frames) % (2 * WINDOW_HEIGHT)
+            if future_y > WINDOW_HEIGHT:
                 future_y = 2 * WINDOW_HEIGHT - future_y
-        
-        return future_y - self.height/2
+            self.predicted_y = future_y
+            self.predicted_velocity = (ball.dx, ball.dy)
+        return self.predicted_y, frames
     
     def draw(self, screen):
         pygame.draw.rect(screen, WHITE, 
@@ -93,8 +126,8 @@ class Ball:
     def reset(self):
         self.x = WINDOW_WIDTH/2
         self.y = WINDOW_HEIGHT/2
-        angle = random.uniform(-math.pi/4, math.pi/4)
-        if random.random() < 0.5: 
+        angle = spawn_rng.uniform(-math.pi/4, math.pi/4)
+        if spawn_rng.random() < 0.5: 
             angle += math.pi
         self.dx = BALL_SPEED * math.cos(angle)
         self.dy = BALL_SPEED * math.sin(angle)
@@ -116,14 +149,13 @@ class Ball:
             self.reset()
             return
         
-        ball_rect = pygame.Rect(self.x - self.size/2, self.y - self.size/2,
-                              self.size, self.size)
+        # Whole pixels, as a pygame.Rect would hold them
+        ball_left = int(self.x - self.size/2)
+        ball_top = int(self.y - self.size/2)
         
         for paddle in [left_paddle, right_paddle]:
-            paddle_rect = pygame.Rect(paddle.x, paddle.y,
-                                    paddle.width, paddle.height)
-            
-            if ball_rect.colliderect(paddle_rect):
+            if collision.rects_overlap(ball_left, ball_top, self.size, self.size,
+                                       int(paddle.x), int(paddle.y), paddle.width, paddle.height):
                 relative_intersect_y = (paddle.y + paddle.height/2) - self.y
                 normalized_intersect = relative_intersect_y / (paddle.height/2)
                 bounce_angle = normalized_intersect * math.pi/3 
@@ -159,6 +191,14 @@ class Game:
         self.in_countdown = False
         self.countdown_start = 0
         self.selected_option = 1 
+        self.small_font = pygame.font.Font(None, 24)
+        self.low_latency = LOW_LATENCY
+        self.show_probe = False
+        self.frame_start = time.perf_counter()
+        self.work_times = deque(maxlen=LATENCY_WINDOW)  # Input-to-flip time of recent frames
+        self.latencies = deque(maxlen=LATENCY_WINDOW)   # Estimated press-to-flip times
+        self.last_poll = self.poll_time = time.perf_counter()
+        self.press_time = None  # Estimated time of a press that isn't on screen yet
         self.reset()
     
     def reset(self):
@@ -175,6 +215,7 @@ class Game:
         self.reset() 
     
     def handle_input(self):
+        self.last_poll, self.poll_time = self.poll_time, time.perf_counter()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
@@ -209,6 +250,14 @@ class Game:
                         self.ai_difficulty = "hard"
                         self.right_paddle.ai_difficulty = "hard"
                         self.start_countdown()
+                    elif event.key == pygame.K_l:
+                        self.low_latency = not self.low_latency
+                        self.work_times.clear()
+                    elif event.key == pygame.K_p:
+                        self.show_probe = not self.show_probe
+                    elif event.key in (pygame.K_w, pygame.K_s) and self.press_time is None:
+                        # It arrived some time since the last poll; assume halfway
+                        self.press_time = (self.last_poll + self.poll_time) / 2
         
         if not self.in_menu and not self.in_countdown:
             keys = pygame.key.get_pressed()
@@ -243,7 +292,7 @@ class Game:
             "1/2/3 - Change AI difficulty",
             "R - Restart game",
             "ESC - Return to menu",
-            "",
+            "L - Low latency, P - Latency probe",
             "Press ENTER to start"
         ]
         
@@ -298,7 +347,36 @@ class Game:
                 text_rect = text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2))
                 self.screen.blit(text, text_rect)
         
+        if self.show_probe:
+            self.draw_latency_probe()
         pygame.display.flip()
+        if self.press_time is not None:
+            self.latencies.append(time.perf_counter() - self.press_time)
+            self.press_time = None
+    
+    def draw_latency_probe(self):
+        # The square lights up on the frame that first shows a paddle key
+        # press, for timing input-to-photon with a camera or photodiode
+        color = WHITE if self.press_time is not None else GRAY
+        pygame.draw.rect(self.screen, color, (WINDOW_WIDTH - 40, WINDOW_HEIGHT - 40, 30, 30))
+        mode = "low latency" if self.low_latency else "normal"
+        text = f"press to flip: {self.average_ms(self.latencies)} ms  work: {self.average_ms(self.work_times)} ms  ({mode})"
+        probe_text = self.small_font.render(text, True, GRAY)
+        self.screen.blit(probe_text, probe_text.get_rect(bottomright=(WINDOW_WIDTH - 50, WINDOW_HEIGHT - 10)))
+    
+    def average_ms(self, times):
+        return f"{sum(times) / len(times) * 1000:.1f}" if times else "-"
+    
+    def wait_for_input(self):
+        # Sleep through most of the frame, so input is read as late as
+        # possible and the frame is drawn just before it is due
+        budget = max(self.work_times, default=0) + LATENCY_MARGIN
+        deadline = self.frame_start + 1 / FPS - budget
+        remaining = deadline - time.perf_counter()
+        if remaining > SPIN_TIME:
+            time.sleep(remaining - SPIN_TIME)
+        while time.perf_counter() < deadline:
+            pass
     
     def update(self):
         if self.in_countdown:
@@ -316,16 +394,32 @@ class Game:
     def run(self):
         running = True
         while running:
+            if self.low_latency:
+                self.wait_for_input()
+            start = time.perf_counter()
             running = self.handle_input()
             self.update()
             self.draw()
-            self.clock.tick(FPS)
+            self.work_times.append(time.perf_counter() - start)
+            if self.low_latency:
+                # Spinning keeps the frame start exact for the next wait
+                self.clock.tick_busy_loop(FPS)
+            else:
+                self.clock.tick(FPS)
+            self.frame_start = time.perf_counter()
+
+def init():
+    pygame.display.init()
+    pygame.font.init()
 
-def main():
+def run():
+    init()
+    rng.report()
     game = Game()
+    frame_profiler.attach(game)
     game.run()
 
 if __name__ == "__main__":
-    main()
+    run()
 
 # find errors in my code? send a note to hello@shortfuse.games
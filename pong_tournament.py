@@ -0,0 +1,197 @@
+# Pong Tournament
+# Description: Plays headless AI-vs-AI Pong matches across a process pool to tune the AI settings
+#
+# Usage:
+#   python pong_tournament.py                          # easy/medium/hard round robin
+#   python pong_tournament.py --speeds 2 3 4 5 6 --errors 0 25 50 75 --matches 20
+#   python pong_tournament.py --speeds 3 4 5 --errors 0 50 --opponent hard --output sweep.json
+#
+# An AI setting is pong.AI_SETTINGS' (dead zone, predicts, max aiming
+# error). --speeds/--errors sweep every combination of dead zone and error
+# (predicting, and with --tracking also not predicting); each setting
+# then plays --matches matches against --opponent, or against every other
+# setting with --round-robin. Sides alternate between matches.
+# Settings are reported by difficulty name, or as s<dead zone><p if it
+# predicts, t if it tracks the ball>e<max error>, e.g. s4pe25.
+#
+# Matches only use pong's Paddle and Ball, never a window. Each match
+# reseeds the rng streams from --seed plus its index, so any single match
+# can be replayed exactly, and results don't depend on the worker count.
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pong
+import rng
+
+# Tournament Settings
+MATCHES = 10
+MAX_MATCH_FRAMES = 60 * 60 * 20  # A match still going after 20 minutes is a draw
+SEED = 1
+CHUNK_SIZE = 8
+
+
+def setting_name(setting):
+    for difficulty, builtin in pong.AI_SETTINGS.items():
+        if setting == builtin:
+            return difficulty
+    speed, predicts, max_error = setting
+    return f"s{speed}{'p' if predicts else 't'}e{max_error}"
+
+
+def play_match(match):
+    """Play one match; runs in a worker process."""
+    index, seed, left_setting, right_setting = match
+    rng.seed(seed)
+    left = pong.Paddle(50, pong.WINDOW_HEIGHT/2 - pong.PADDLE_HEIGHT/2, True)
+    right = pong.Paddle(pong.WINDOW_WIDTH - 50 - pong.PADDLE_WIDTH,
+                        pong.WINDOW_HEIGHT/2 - pong.PADDLE_HEIGHT/2, True)
+    left.ai_settings = left_setting
+    right.ai_settings = right_setting
+    ball = pong.Ball()
+
+    rallies = []  # Paddle hits in each point
+    hits = 0
+    frames = 0
+    points = 0
+    while max(left.score, right.score) < pong.POINTS_TO_WIN and frames < MAX_MATCH_FRAMES:
+        direction = ball.dx > 0
+        ball.update(left, right)
+        left.ai_move(ball)
+        right.ai_move(ball)
+        frames += 1
+        if left.score + right.score != points:
+            points = left.score + right.score
+            rallies.append(hits)
+            hits = 0
+        elif (ball.dx > 0) != direction:
+            hits += 1
+
+    if left.score == right.score:
+        winner = None
+    else:
+        winner = 'left' if left.score > right.score else 'right'
+    return index, winner, rallies, frames
+
+
+def make_settings(speeds, errors, predict_both):
+    predicts = (True, False) if predict_both else (True,)
+    return [(speed, predict, error) for speed, predict, error
+            in itertools.product(speeds, predicts, errors)]
+
+
+def make_matches(settings, opponents, matches, seed, round_robin):
+    """Return (index, seed, left, right) for every match to play."""
+    if round_robin:
+        pairings = list(itertools.combinations(settings, 2))
+    else:
+        pairings = [(setting, opponent) for setting in settings for opponent in opponents
+                    if setting != opponent]
+    schedule = []
+    for a, b in pairings:
+        for game in range(matches):
+            left, right = (a, b) if game % 2 == 0 else (b, a)
+            index = len(schedule)
+            schedule.append((index, seed + index, left, right))
+    return schedule
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0
+
+
+def summarize(schedule, results):
+    stats = {}
+    for index, winner, rallies, frames in results:
+        _, _, left, right = schedule[index]
+        for setting, side in ((left, 'left'), (right, 'right')):
+            entry = stats.setdefault(setting, {'matches': 0, 'wins': 0, 'draws': 0,
+                                               'rallies': [], 'frames': 0})
+            entry['matches'] += 1
+            entry['wins'] += winner == side
+            entry['draws'] += winner is None
+            entry['rallies'].extend(rallies)
+            entry['frames'] += frames
+
+    report = []
+    for setting, entry in stats.items():
+        rallies = sorted(entry['rallies'])
+        report.append({
+            'name': setting_name(setting),
+            'dead_zone': setting[0],
+            'predicts': setting[1],
+            'max_error': setting[2],
+            'matches': entry['matches'],
+            'win_rate': entry['wins'] / entry['matches'],
+            'draws': entry['draws'],
+            'rally_mean': sum(rallies) / len(rallies) if rallies else 0,
+            'rally_p50': percentile(rallies, 0.5),
+            'rally_p95': percentile(rallies, 0.95),
+            'rally_max': rallies[-1] if rallies else 0,
+        })
+    report.sort(key=lambda row: row['win_rate'], reverse=True)
+    return report
+
+
+def run(schedule, workers):
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        results = sorted(pool.imap_unordered(play_match, schedule, chunksize=CHUNK_SIZE))
+    elapsed = time.perf_counter() - start
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless AI-vs-AI Pong tournament")
+    parser.add_argument('--speeds', type=int, nargs='+', help="AI dead zones to sweep")
+    parser.add_argument('--errors', type=int, nargs='+', default=[0], help="max aiming errors to sweep")
+    parser.add_argument('--tracking', action='store_true',
+                        help="also sweep settings that track the ball instead of predicting")
+    parser.add_argument('--opponent', choices=list(pong.AI_SETTINGS), default='hard',
+                        help="built-in difficulty the swept settings play against")
+    parser.add_argument('--round-robin', action='store_true', help="every setting plays every other")
+    parser.add_argument('--matches', type=int, default=MATCHES, help="matches per pairing")
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--output', help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    if args.speeds:
+        settings = make_settings(args.speeds, args.errors, args.tracking)
+        opponents = [pong.AI_SETTINGS[args.opponent]]
+    else:
+        settings = list(pong.AI_SETTINGS.values())
+        opponents = settings
+        args.round_robin = True
+    schedule = make_matches(settings, opponents, args.matches, args.seed, args.round_robin)
+    if not schedule:
+        print("No matches to play")
+        return
+
+    results, elapsed = run(schedule, args.workers)
+    report = summarize(schedule, results)
+    total_frames = sum(frames for _, _, _, frames in results)
+
+    print(f"{'setting':<12} {'matches':>7} {'win rate':>9} {'draws':>6} "
+          f"{'rally mean':>10} {'p50':>4} {'p95':>4} {'max':>4}")
+    for row in report:
+        print(f"{row['name']:<12} {row['matches']:7} {row['win_rate']:9.1%} {row['draws']:6} "
+              f"{row['rally_mean']:10.1f} {row['rally_p50']:4} {row['rally_p95']:4} {row['rally_max']:4}")
+    print(f"{len(schedule)} matches, {total_frames} frames in {elapsed:.1f}s on {args.workers} workers: "
+          f"{total_frames / elapsed:,.0f} simulated frames/s, {len(schedule) / elapsed * 3600:,.0f} matches/hour")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'seed': args.seed, 'matches_per_pairing': args.matches,
+                       'frames': total_frames, 'seconds': elapsed, 'settings': report}, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+# Input Replay
+# Description: Records per-frame input to a compact binary log and plays it back headless
+#
+# Usage:
+#   python replay.py record asteroids run.rgr
+#   python replay.py play run.rgr [--checkpoint 3600] [--realtime]
+#
+# The recorder and player hook pygame's input functions (event.get,
+# key.get_pressed, mouse.get_pos) and its clock, so every game can be
+# recorded without changes. Each Clock.tick() call ends a frame, and
+# pygame.time.get_ticks() advances by exactly one frame per tick, so
+# timers replay identically however fast the player runs.
+
+import argparse
+import importlib
+import os
+import sys
+import time
+import zlib
+
+import pygame
+
+import frame_profiler
+import rng
+import savestate
+
+# Log Settings
+MAGIC = b'RGRP'
+FORMAT_VERSION = 1
+
+# Item tags
+TAG_QUIT = 0
+TAG_KEYDOWN = 1
+TAG_KEYUP = 2
+TAG_MOUSEDOWN = 3
+TAG_MOUSEUP = 4
+TAG_KEYS = 5       # Scancodes whose get_pressed() state flipped
+TAG_MOUSE_POS = 6
+ITEM_FIELDS = {TAG_QUIT: 0, TAG_KEYDOWN: 1, TAG_KEYUP: 1,
+               TAG_MOUSEDOWN: 3, TAG_MOUSEUP: 3, TAG_MOUSE_POS: 2}
+
+RECORDED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP,
+                   pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
+
+class ReplayFinished(Exception):
+    pass
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class InputLog:
+    """Sparse per-frame input: only frames where something changed are stored."""
+
+    def __init__(self, game, seed, records=None, frame_count=0):
+        self.game = game
+        self.seed = seed
+        self.records = records if records is not None else []  # (frame, items)
+        self.frame_count = frame_count
+
+    def encode(self):
+        body = bytearray()
+        previous = 0
+        for frame, items in self.records:
+            write_varint(body, frame - previous)
+            write_varint(body, len(items))
+            for item in items:
+                body.append(item[0])
+                if item[0] == TAG_KEYS:
+                    write_varint(body, len(item[1]))
+                    for scancode in item[1]:
+                        write_varint(body, scancode)
+                else:
+                    for value in item[1:]:
+                        write_varint(body, value)
+            previous = frame
+        # An empty record marks the last frame
+        write_varint(body, self.frame_count - previous)
+        write_varint(body, 0)
+
+        header = bytearray(MAGIC)
+        header.append(FORMAT_VERSION)
+        write_varint(header, self.seed * 2 if self.seed >= 0 else -self.seed * 2 - 1)
+        name = self.game.encode('ascii')
+        write_varint(header, len(name))
+        header += name
+        return bytes(header) + zlib.compress(bytes(body), 9)
+
+    @classmethod
+    def decode(cls, data):
+        if data[:4] != MAGIC:
+            raise ValueError("Not an input replay log")
+        if data[4] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported replay format version {data[4]}")
+        seed, pos = read_varint(data, 5)
+        seed = seed // 2 if seed % 2 == 0 else -(seed + 1) // 2
+        length, pos = read_varint(data, pos)
+        game = data[pos:pos + length].decode('ascii')
+        body = zlib.decompress(data[pos + length:])
+
+        records = []
+        frame = pos = 0
+        while pos < len(body):
+            gap, pos = read_varint(body, pos)
+            count, pos = read_varint(body, pos)
+            frame += gap
+            items = []
+            for _ in range(count):
+                tag = body[pos]
+                pos += 1
+                if tag == TAG_KEYS:
+                    length, pos = read_varint(body, pos)
+                    scancodes = []
+                    for _ in range(length):
+                        scancode, pos = read_varint(body, pos)
+                        scancodes.append(scancode)
+                    items.append((tag, tuple(scancodes)))
+                else:
+                    values = []
+                    for _ in range(ITEM_FIELDS[tag]):
+                        value, pos = read_varint(body, pos)
+                        values.append(value)
+                    items.append((tag, *values))
+            if items:
+                records.append((frame, items))
+        return cls(game, seed, records, frame)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.encode())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.decode(f.read())
+
+
+class FrameClock:
+    """Stands in for pygame.time.Clock; each tick ends a frame."""
+    hooks = None  # The installed recorder or player
+
+    def __init__(self):
+        self.real_clock = self.hooks.make_real_clock()
+        self.frame_time = 0
+
+    def tick(self, framerate=0):
+        if self.real_clock:
+            self.real_clock.tick(framerate)
+        self.frame_time = int(1000 / framerate) if framerate else 0
+        self.hooks.end_frame(1000 / framerate if framerate else 0)
+        return self.frame_time
+
+    tick_busy_loop = tick
+
+    def get_time(self):
+        return self.frame_time
+
+    def get_rawtime(self):
+        return self.frame_time
+
+    def get_fps(self):
+        return 1000 / self.frame_time if self.frame_time else 0.0
+
+
+savestate.share_type(FrameClock)
+
+
+class InputHooks:
+    """Swaps pygame's input and clock functions for the recorder/player's own."""
+
+    def __init__(self):
+        self.frame = 0
+        self.ticks = 0.0  # Virtual milliseconds since the run started
+        self.originals = None
+
+    def install(self):
+        FrameClock.hooks = self
+        self.originals = (pygame.event.get, pygame.key.get_pressed,
+                          pygame.mouse.get_pos, pygame.time.get_ticks,
+                          pygame.time.Clock)
+        pygame.event.get = self.get_events
+        pygame.key.get_pressed = self.get_pressed
+        pygame.mouse.get_pos = self.get_mouse_pos
+        pygame.time.get_ticks = self.get_ticks
+        pygame.time.Clock = FrameClock
+
+    def uninstall(self):
+        (pygame.event.get, pygame.key.get_pressed, pygame.mouse.get_pos,
+         pygame.time.get_ticks, pygame.time.Clock) = self.originals
+
+    def make_real_clock(self):
+        return None
+
+    def get_ticks(self):
+        return int(self.ticks)
+
+    def end_frame(self, frame_ms):
+        self.frame += 1
+        self.ticks += frame_ms
+
+
+class Recorder(InputHooks):
+    def __init__(self, game, seed):
+        super().__init__()
+        self.log = InputLog(game, seed)
+        self.items = []
+        self.pressed = frozenset()
+        self.mouse_pos = (0, 0)
+
+    def make_real_clock(self):
+        return self.originals[4]()
+
+    def get_events(self, *args, **kwargs):
+        events = [e for e in self.originals[0](*args, **kwargs) if e.type in RECORDED_EVENTS]
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.items.append((TAG_QUIT,))
+            elif event.type == pygame.KEYDOWN:
+                self.items.append((TAG_KEYDOWN, event.key))
+            elif event.type == pygame.KEYUP:
+                self.items.append((TAG_KEYUP, event.key))
+            else:
+                tag = TAG_MOUSEDOWN if event.type == pygame.MOUSEBUTTONDOWN else TAG_MOUSEUP
+                self.items.append((tag, event.button, *event.pos))
+        return events
+
+    def get_pressed(self):
+        keys = self.originals[1]()
+        pressed = frozenset(i for i, down in enumerate(keys) if down)
+        if pressed != self.pressed:
+            self.items.append((TAG_KEYS, tuple(sorted(pressed ^ self.pressed))))
+            self.pressed = pressed
+        return keys
+
+    def get_mouse_pos(self):
+        pos = self.originals[2]()
+        if pos != self.mouse_pos:
+            self.items.append((TAG_MOUSE_POS, *pos))
+            self.mouse_pos = pos
+        return pos
+
+    def end_frame(self, frame_ms):
+        self.flush()
+        super().end_frame(frame_ms)
+        self.log.frame_count = self.frame
+
+    def flush(self):
+        # Input from a frame cut short by the game exiting still counts
+        if self.items:
+            self.log.records.append((self.frame, self.items))
+            self.log.frame_count = self.frame + 1
+            self.items = []
+
+
+class CachedFont(pygame.font.Font):
+    """Font that reuses rendered text, since HUDs redraw the same strings every frame."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rendered = {}
+
+    def render(self, text, antialias, color, background=None):
+        key = (text, antialias, tuple(color), background and tuple(background))
+        surface = self.rendered.get(key)
+        if surface is None:
+            if len(self.rendered) > 256:
+                self.rendered.clear()
+            surface = self.rendered[key] = super().render(text, antialias, color, background)
+        return surface
+
+
+class Player(InputHooks):
+    def __init__(self, log, realtime=False, checkpoint_every=0, on_checkpoint=None):
+        super().__init__()
+        self.log = log
+        self.realtime = realtime
+        self.checkpoint_every = checkpoint_every
+        self.on_checkpoint = on_checkpoint
+        self.frames = dict(log.records)
+        self.events = []
+        self.pressed = [False] * 512
+        self.keys = pygame.key.ScancodeWrapper(self.pressed)
+        self.mouse_pos = (0, 0)
+        self.fonts = {}
+        self.start_frame(0)
+
+    def install(self):
+        super().install()
+        self.font = pygame.font.Font
+        pygame.font.Font = self.get_font
+
+    def uninstall(self):
+        super().uninstall()
+        pygame.font.Font = self.font
+
+    def make_real_clock(self):
+        return self.originals[4]() if self.realtime else None
+
+    def start_frame(self, frame):
+        changed = False
+        for item in self.frames.get(frame, ()):
+            tag = item[0]
+            if tag == TAG_QUIT:
+                self.events.append(pygame.event.Event(pygame.QUIT))
+            elif tag == TAG_KEYDOWN:
+                self.events.append(pygame.event.Event(pygame.KEYDOWN, key=item[1]))
+            elif tag == TAG_KEYUP:
+                self.events.append(pygame.event.Event(pygame.KEYUP, key=item[1]))
+            elif tag in (TAG_MOUSEDOWN, TAG_MOUSEUP):
+                event_type = pygame.MOUSEBUTTONDOWN if tag == TAG_MOUSEDOWN else pygame.MOUSEBUTTONUP
+                self.events.append(pygame.event.Event(event_type, button=item[1], pos=item[2:4]))
+            elif tag == TAG_KEYS:
+                for scancode in item[1]:
+                    self.pressed[scancode] = not self.pressed[scancode]
+                changed = True
+            elif tag == TAG_MOUSE_POS:
+                self.mouse_pos = item[1:3]
+        if changed:
+            self.keys = pygame.key.ScancodeWrapper(self.pressed)
+
+    def get_font(self, *args):
+        # Several games load their fonts every frame
+        font = self.fonts.get(args)
+        if font is None:
+            font = self.fonts[args] = CachedFont(*args)
+        return font
+
+    def get_events(self, *args, **kwargs):
+        events, self.events = self.events, []
+        return events
+
+    def get_pressed(self):
+        return self.keys
+
+    def get_mouse_pos(self):
+        return self.mouse_pos
+
+    def end_frame(self, frame_ms):
+        super().end_frame(frame_ms)
+        if self.checkpoint_every and self.frame % self.checkpoint_every == 0 and self.on_checkpoint:
+            self.on_checkpoint(self)
+        if self.frame >= self.log.frame_count:
+            raise ReplayFinished
+        self.start_frame(self.frame)
+
+
+def run_game(name):
+    """Import a game and run it the way its __main__ block does."""
+    try:
+        importlib.import_module(name).run()
+    finally:
+        # The process outlives the game, so its profiler hooks must go
+        frame_profiler.detach()
+
+
+def record(game, path):
+    recorder = Recorder(game, rng.seed())
+    recorder.install()
+    try:
+        run_game(game)
+    except SystemExit:
+        pass
+    finally:
+        recorder.uninstall()
+        recorder.flush()
+        recorder.log.save(path)
+    size = os.path.getsize(path)
+    print(f"Recorded {recorder.log.frame_count} frames of {game} to {path} ({size} bytes)")
+
+
+def play(path, realtime=False, checkpoint_every=0):
+    if not realtime:
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    log = InputLog.load(path)
+    rng.seed(log.seed)
+    start = time.perf_counter()
+
+    def report(player):
+        elapsed = time.perf_counter() - start
+        speed = player.ticks / 1000 / elapsed if elapsed else 0
+        print(f"Frame {player.frame}: {elapsed:.2f}s, {speed:.0f}x real time")
+
+    player = Player(log, realtime, checkpoint_every, report)
+    player.install()
+    try:
+        run_game(log.game)
+    except (ReplayFinished, SystemExit):
+        pass
+    finally:
+        player.uninstall()
+    report(player)
+    return player
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay game input")
+    commands = parser.add_subparsers(dest='command', required=True)
+    record_parser = commands.add_parser('record')
+    record_parser.add_argument('game', help="Game module, e.g. asteroids")
+    record_parser.add_argument('path')
+    play_parser = commands.add_parser('play')
+    play_parser.add_argument('path')
+    play_parser.add_argument('--realtime', action='store_true', help="Show the window at normal speed")
+    play_parser.add_argument('--checkpoint', type=int, default=0, metavar='FRAMES',
+                             help="Report progress every FRAMES frames")
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record(args.game, args.path)
+    else:
+        play(args.path, args.realtime, args.checkpoint)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+# Seeded RNG
+# Description: Named random streams derived from one recorded master seed
+
+import os
+import random
+
+# Seed Settings
+SEED_ENV = 'RETRO_SEED'  # Set to replay a run with a known seed
+
+# Stream names shared by the games. Gameplay streams drive the simulation;
+# the cosmetic stream only feeds visuals, so effects can change freely
+# without shifting what happens in the game.
+AI = 'ai'
+SPAWN = 'spawn'
+LEVEL = 'level'
+COSMETIC = 'cosmetic'
+
+master_seed = None
+_streams = {}
+
+
+def _derive(master, name):
+    # String seeds are hashed with SHA-512, so this is stable across runs
+    return random.Random(f"{master}:{name}").getrandbits(64)
+
+
+def seed(value=None):
+    """Reseed every stream from one master seed and return it.
+
+    Without a value the seed comes from RETRO_SEED, or fresh entropy.
+    """
+    global master_seed
+    if value is None:
+        value = os.environ.get(SEED_ENV)
+        if not value:
+            value = int.from_bytes(os.urandom(4), 'big')
+        else:
+            try:
+                value = int(value)
+            except ValueError:
+                raise ValueError(f"{SEED_ENV} must be an integer, not {value!r}") from None
+    master_seed = value
+    for name, stream in _streams.items():
+        stream.seed(_derive(value, name))
+    return value
+
+
+def stream(name):
+    """Return the named stream, creating it from the master seed."""
+    if name not in _streams:
+        _streams[name] = random.Random(_derive(master_seed, name))
+    return _streams[name]
+
+
+def get_state():
+    return master_seed, {name: s.getstate() for name, s in _streams.items()}
+
+
+def set_state(state):
+    global master_seed
+    master_seed, states = state
+    for name, value in states.items():
+        stream(name).setstate(value)
+
+
+def report():
+    """Record the seed for this run so it can be replayed."""
+    print(f"Seed: {master_seed} (replay with {SEED_ENV}={master_seed})")
+
+
+seed()
@@ -0,0 +1,84 @@
+# Rotation Cache
+# Description: Sin/cos tables and cached rotated polygons for things that turn
+#
+# Ships only ever turn in whole ROTATION_SPEED steps, so they face a
+# handful of angles, and a polygon rotated to one of them can be reused
+# every frame the ship faces it again.
+#
+#   HULL = rotation.Polygon([(0, -20), (-20, 20), (20, 20)])
+#   pygame.draw.polygon(screen, WHITE, HULL.place(x, y, angle))
+#
+# Drawing rounds angles to the nearest of STEPS buckets (whole degrees),
+# which is invisible at our sizes. Gameplay math (thrust, bullets) must
+# not round, or replays and netplay would drift, so cos_sin() returns the
+# exact values math would, remembered per angle.
+
+import math
+
+import savestate
+
+# Rotation Settings
+STEPS = 360            # Angle buckets per turn for drawing
+MEMO_LIMIT = 4096      # Exact angles cos_sin() remembers before starting over
+
+_bucket_scale = STEPS / 360
+COS = [math.cos(2 * math.pi * i / STEPS) for i in range(STEPS)]
+SIN = [math.sin(2 * math.pi * i / STEPS) for i in range(STEPS)]
+_exact = {}
+
+
+def table_cos_sin(angle):
+    """cos and sin of an angle in degrees, rounded to its bucket."""
+    index = round(angle * _bucket_scale) % STEPS
+    return COS[index], SIN[index]
+
+
+def cos_sin(angle):
+    """Exactly math.cos(math.radians(angle)) and math.sin(math.radians(angle))."""
+    values = _exact.get(angle)
+    if values is None:
+        if len(_exact) >= MEMO_LIMIT:
+            _exact.clear()
+        radians = math.radians(angle)
+        values = _exact[angle] = (math.cos(radians), math.sin(radians))
+    return values
+
+
+class Polygon:
+    """Points around an origin, rotated to each angle bucket on first use.
+
+    keep bounds how many rotations are remembered. Shapes that turn in
+    steps, like ships, keep them all. keep=0 suits shapes that turn a
+    little every frame and rarely land in the same bucket twice: they're
+    rotated and placed in one pass from the tables instead.
+    """
+    __slots__ = ('points', 'rotations', 'keep')
+
+    def __init__(self, points, keep=STEPS):
+        self.points = tuple(points)
+        self.rotations = {}
+        self.keep = keep
+
+    def _rotated(self, index):
+        # The points rotated clockwise on screen to an angle bucket
+        points = self.rotations.get(index)
+        if points is None:
+            c, s = COS[index], SIN[index]
+            points = [(x * c - y * s, x * s + y * c) for x, y in self.points]
+            if self.keep:
+                if len(self.rotations) >= self.keep:
+                    self.rotations.clear()
+                self.rotations[index] = points
+        return points
+
+    def place(self, x, y, angle):
+        """The rotated points moved to (x, y), ready to draw."""
+        index = round(angle * _bucket_scale) % STEPS
+        if not self.keep:
+            c, s = COS[index], SIN[index]
+            return [(x + px * c - py * s, y + px * s + py * c) for px, py in self.points]
+        return [(x + px, y + py) for px, py in self._rotated(index)]
+
+
+# Outlines never change once made, so snapshots share them
+savestate.share_type(Polygon)
@@ -0,0 +1,89 @@
+# Save States
+# Description: Snapshot and restore a running game's simulation state
+#
+#   state = savestate.snapshot(game)
+#   ...
+#   savestate.restore(game, state)
+#
+# A snapshot pickles the game object's attributes (every entity, timer and
+# score hanging off it) together with the rng stream states. Surfaces,
+# fonts, clocks and sounds are resources rather than simulation state, so
+# they are not copied: the snapshot keeps references to the live objects
+# and restore puts the same objects back. That keeps snapshots small and
+# restores fast, but it also means a snapshot only makes sense inside the
+# process that took it. Timers read from pygame.time.get_ticks() are not
+# rewound.
+
+import io
+import pickle
+
+import pygame
+
+import rng
+
+_resource_types = [pygame.Surface, pygame.font.Font, pygame.time.Clock, pygame.mixer.Sound]
+
+
+def share_type(cls):
+    """Treat instances of cls as shared resources rather than state."""
+    if cls not in _resource_types:
+        _resource_types.append(cls)
+
+
+class SaveState:
+    def __init__(self, data, resources, rng_state):
+        self.data = data            # The pickled state
+        self.resources = resources  # Live objects the data refers to by index
+        self.rng_state = rng_state  # Immutable tuples, so kept as is rather than pickled
+
+    def __len__(self):
+        return len(self.data)
+
+
+class _StatePickler(pickle.Pickler):
+    def __init__(self, file, game):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.game = game
+        self.types = tuple(_resource_types)
+        self.resources = []
+        self.indexes = {}
+
+    def persistent_id(self, obj):
+        if obj is self.game:
+            return -1
+        if isinstance(obj, self.types):
+            index = self.indexes.get(id(obj))
+            if index is None:
+                index = self.indexes[id(obj)] = len(self.resources)
+                self.resources.append(obj)
+            return index
+        return None
+
+
+class _StateUnpickler(pickle.Unpickler):
+    def __init__(self, file, game, resources):
+        super().__init__(file)
+        self.game = game
+        self.resources = resources
+
+    def persistent_load(self, pid):
+        return self.game if pid == -1 else self.resources[pid]
+
+
+def snapshot(game):
+    """Capture the game's simulation state and the rng streams."""
+    buffer = io.BytesIO()
+    pickler = _StatePickler(buffer, game)
+    pickler.dump(vars(game))
+    return SaveState(buffer.getvalue(), pickler.resources, rng.get_state())
+
+
+def restore(game, state):
+    """Put the game back exactly as it was when the snapshot was taken."""
+    attributes = _StateUnpickler(io.BytesIO(state.data), game, state.resources).load()
+    game.__dict__.clear()
+    game.__dict__.update(attributes)
+    rng.set_state(state.rng_state)
+    # Games that cache rendered state can rebuild it here
+    if hasattr(game, 'state_restored'):
+        game.state_restored()
@@ -5,10 +5,12 @@
 
 import pygame
 import sys
-import random
 
-# Initialize Pygame
-pygame.init()
+import frame_profiler
+import rng
+
+# Random streams
+spawn_rng = rng.stream(rng.SPAWN)
 
 # Constants
 WINDOW_WIDTH = 800
@@ -31,10 +33,17 @@ DOWN = (0, 1)
 LEFT = (-1, 0)
 RIGHT = (1, 0)
 
-# Setup Display
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Snake")
-clock = pygame.time.Clock()
+# Setup Display, done by init() rather than on import
+screen = None
+clock = None
+
+def init():
+    global screen, clock
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption("Snake")
+    clock = pygame.time.Clock()
 
 class Snake:
     def __init__(self):
@@ -115,8 +124,8 @@ class Food:
 
     def randomize_position(self):
         self.position = (
-            random.randint(0, GRID_WIDTH-1),
-            random.randint(0, GRID_HEIGHT-1)
+            spawn_rng.randint(0, GRID_WIDTH-1),
+            spawn_rng.randint(0, GRID_HEIGHT-1)
         )
 
     def draw(self):
@@ -194,8 +203,11 @@ class Game:
 
         pygame.display.flip()
 
-def main():
+def run():
+    init()
+    rng.report()
     game = Game()
+    frame_profiler.attach(game)
 
     while True:
         game.handle_input()
@@ -204,4 +216,4 @@ def main():
         clock.tick(FPS)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    run() 
\ No newline at end of file
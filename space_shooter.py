@@ -6,8 +6,9 @@
 import pygame
 import sys
 
-# Initialize Pygame
-pygame.init()
+import collision
+from entity_pool import EntityPool
+import frame_profiler
 
 # Constants
 WINDOW_WIDTH = 800
@@ -39,11 +40,19 @@ ENEMY_MOVE_DOWN = 20
 BULLET_SIZE = 5
 BULLET_SPEED = 7
 BULLET_COLOR = WHITE
+MAX_BULLETS = 3  # On screen at once, which also limits the firing rate
 
-# Setup Display
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Space Shooter")
-clock = pygame.time.Clock()
+# Setup Display, done by init() rather than on import
+screen = None
+clock = None
+
+def init():
+    global screen, clock
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption("Space Shooter")
+    clock = pygame.time.Clock()
 
 class Player:
     def __init__(self):
@@ -68,53 +77,138 @@ class Player:
         # Keep player within screen bounds
         self.x = max(self.width//2, min(self.x, WINDOW_WIDTH - self.width//2))
 
-class Enemy:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
+class Formation:
+    """The invader grid, stored as one origin plus an alive mask.
+
+    Every enemy shares the same speed and direction, so moving the whole
+    formation is a single update to the origin. Alive counts per row and
+    column keep track of the outermost survivors for edge detection, and
+    a bullet position maps straight to the grid cell it could hit.
+    """
+
+    def __init__(self, rows=ENEMY_ROWS, cols=ENEMY_COLS, spacing=ENEMY_SPACING):
+        self.rows = rows
+        self.cols = cols
+        self.spacing = spacing
         self.size = ENEMY_SIZE
         self.speed = ENEMY_SPEED
         self.direction = 1
         self.color = ENEMY_COLOR
+        # Centre of the enemy at row 0, col 0
+        self.x = spacing
+        self.y = spacing
+        self.alive = bytearray([1]) * (rows * cols)
+        self.row_counts = [cols] * rows
+        self.col_counts = [rows] * cols
+        self.count = rows * cols
+        self.left_col = 0
+        self.right_col = cols - 1
+        self.bottom_row = rows - 1
+
+    def move(self):
+        """Move one step; returns True if the formation dropped a row."""
+        if self.count == 0:
+            return False
+
+        self.x += self.speed * self.direction
+        left = self.x + self.left_col * self.spacing
+        right = self.x + self.right_col * self.spacing
+        if right >= WINDOW_WIDTH - ENEMY_SIZE or left <= ENEMY_SIZE:
+            self.direction *= -1
+            self.y += ENEMY_MOVE_DOWN
+            return True
+        return False
+
+    def bottom(self):
+        return self.y + self.bottom_row * self.spacing
+
+    def hit(self, x, y):
+        """Kill an enemy within half a size of (x, y); returns True if hit."""
+        half = self.size // 2
+        local_x = x - self.x
+        local_y = y - self.y
+        # Only the cells whose enemies could overlap the point
+        first_col = max(0, int(local_x - half) // self.spacing)
+        last_col = min(self.cols - 1, int(local_x + half) // self.spacing)
+        first_row = max(0, int(local_y - half) // self.spacing)
+        last_row = min(self.rows - 1, int(local_y + half) // self.spacing)
+
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                index = row * self.cols + col
+                if (self.alive[index] and
+                    collision.centers_within(local_x, local_y, col * self.spacing, row * self.spacing,
+                                             half, half)):
+                    self.kill(row, col)
+                    return True
+        return False
+
+    def kill(self, row, col):
+        self.alive[row * self.cols + col] = 0
+        self.count -= 1
+        self.row_counts[row] -= 1
+        self.col_counts[col] -= 1
+        if self.count == 0:
+            return
+
+        # Shrink the outer bounds past any emptied rows and columns
+        while self.col_counts[self.left_col] == 0:
+            self.left_col += 1
+        while self.col_counts[self.right_col] == 0:
+            self.right_col -= 1
+        while self.row_counts[self.bottom_row] == 0:
+            self.bottom_row -= 1
 
     def draw(self):
-        # Draw enemy as a square with a smaller square inside
-        pygame.draw.rect(screen, self.color, 
-                        (self.x - self.size//2, self.y - self.size//2, 
-                         self.size, self.size))
-        pygame.draw.rect(screen, BLACK,
-                        (self.x - self.size//4, self.y - self.size//4,
-                         self.size//2, self.size//2))
+        half = self.size // 2
+        quarter = self.size // 4
+        for row in range(self.rows):
+            if not self.row_counts[row]:
+                continue
+            y = self.y + row * self.spacing
+            start = row * self.cols
+            for col in range(self.cols):
+                if not self.alive[start + col]:
+                    continue
+                x = self.x + col * self.spacing
+                # Draw enemy as a square with a smaller square inside
+                pygame.draw.rect(screen, self.color, 
+                                (x - half, y - half, self.size, self.size))
+                pygame.draw.rect(screen, BLACK,
+                                (x - quarter, y - quarter, half, half))
 
 class Bullet:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
+    # Pooled: created once by the Game's EntityPool, then respawned
+    __slots__ = ('x', 'y', 'size', 'speed', 'color', 'active', 'pool_index')
+
+    def __init__(self):
+        self.x = 0
+        self.y = 0
         self.size = BULLET_SIZE
         self.speed = BULLET_SPEED
         self.color = BULLET_COLOR
+        self.active = False
+
+    def spawn(self, x, y):
+        self.x = x
+        self.y = y
+        self.active = True
 
     def draw(self):
         pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
 
     def move(self):
         self.y -= self.speed
+        if self.y < 0:
+            self.active = False
 
 class Game:
-    def __init__(self):
+    def __init__(self, rows=ENEMY_ROWS, cols=ENEMY_COLS, spacing=ENEMY_SPACING):
         self.player = Player()
-        self.enemies = []
-        self.bullets = []
+        self.enemies = Formation(rows, cols, spacing)
+        self.bullets = EntityPool(Bullet, MAX_BULLETS)
         self.score = 0
         self.game_over = False
-        self.create_enemies()
-
-    def create_enemies(self):
-        for row in range(ENEMY_ROWS):
-            for col in range(ENEMY_COLS):
-                x = col * ENEMY_SPACING + ENEMY_SPACING
-                y = row * ENEMY_SPACING + ENEMY_SPACING
-                self.enemies.append(Enemy(x, y))
 
     def handle_input(self):
         keys = pygame.key.get_pressed()
@@ -123,52 +217,35 @@ class Game:
         if keys[pygame.K_RIGHT]:
             self.player.move(1)
         if keys[pygame.K_SPACE]:
-            # Limit bullet firing rate
-            if len(self.bullets) < 3:
-                self.bullets.append(Bullet(self.player.x, self.player.y - self.player.height))
+            # Limit bullet firing rate; acquire does nothing while the pool is full
+            self.bullets.acquire(self.player.x, self.player.y - self.player.height)
 
     def update(self):
         if self.game_over:
             return
 
         # Update bullets
-        for bullet in self.bullets[:]:
+        for bullet in self.bullets:
             bullet.move()
-            if bullet.y < 0:
-                self.bullets.remove(bullet)
+        self.bullets.release_inactive()
 
         # Move enemies
-        move_down = False
-        for enemy in self.enemies:
-            enemy.x += enemy.speed * enemy.direction
-            if enemy.x >= WINDOW_WIDTH - ENEMY_SIZE or enemy.x <= ENEMY_SIZE:
-                move_down = True
-
-        if move_down:
-            for enemy in self.enemies:
-                enemy.direction *= -1
-                enemy.y += ENEMY_MOVE_DOWN
-                if enemy.y >= self.player.y:
-                    self.game_over = True
-
-        # Check collisions
-        for bullet in self.bullets[:]:
-            for enemy in self.enemies[:]:
-                if (abs(bullet.x - enemy.x) < ENEMY_SIZE//2 and
-                    abs(bullet.y - enemy.y) < ENEMY_SIZE//2):
-                    if bullet in self.bullets:
-                        self.bullets.remove(bullet)
-                    if enemy in self.enemies:
-                        self.enemies.remove(enemy)
-                        self.score += 10
+        if self.enemies.move() and self.enemies.bottom() >= self.player.y:
+            self.game_over = True
+
+        # Check collisions, each bullet against the grid cells it is over
+        for bullet in self.bullets:
+            if self.enemies.hit(bullet.x, bullet.y):
+                self.score += 10
+                bullet.active = False
+        self.bullets.release_inactive()
 
     def draw(self):
         screen.fill(BLACK)
         
         # Draw game objects
         self.player.draw()
-        for enemy in self.enemies:
-            enemy.draw()
+        self.enemies.draw()
         for bullet in self.bullets:
             bullet.draw()
 
@@ -185,8 +262,10 @@ class Game:
 
         pygame.display.flip()
 
-def main():
+def run():
+    init()
     game = Game()
+    frame_profiler.attach(game)
     running = True
 
     while running:
@@ -204,4 +283,4 @@ def main():
     sys.exit()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    run() 
\ No newline at end of file
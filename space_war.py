@@ -1,10 +1,23 @@
 import pygame
 import math
-import random
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+from functools import partial
+from typing import Tuple, Optional
 
-pygame.init()
+try:
+    import numpy as np
+except ImportError:  # Only the arena mode needs it
+    np = None
+
+import collision
+from entity_pool import EntityPool
+import frame_profiler
+import rng
+import rotation
+
+# Random streams
+ai_rng = rng.stream(rng.AI)
+spawn_rng = rng.stream(rng.SPAWN)
 
 # Constants
 WINDOW_WIDTH, WINDOW_HEIGHT = 800, 600
@@ -15,6 +28,7 @@ BLACK, WHITE, YELLOW, RED, GREEN = (0, 0, 0), (255, 255, 255), (255, 255, 0), (2
 SHIP_SPEED, ROTATION_SPEED, THRUST_POWER = 0.5, 3, 0.1
 GRAVITY, TORPEDO_SPEED = 0.01, 5
 TORPEDO_LIFETIME, HYPESPACE_COOLDOWN = 60, 180
+MAX_TORPEDOES = 4  # Per ship, also the size of each ship's torpedo pool
 VELOCITY_DAMPING, MAX_VELOCITY = 0.98, 5
 SHIP_RADIUS, TORPEDO_RADIUS = 15, 3
 HIT_FLASH_DURATION, POINTS_TO_WIN, COUNTDOWN_TIME = 10, 5, 3
@@ -22,6 +36,31 @@ STAR_RADIUS = 10
 STAR_DANGER_RADIUS = 50  # Distance at which ships start getting warning
 STAR_KILL_RADIUS = 25    # Distance at which ships are destroyed
 
+# Outlines at angle 0 (pointing right), rotated once per angle and then reused
+SHIP_HULL = rotation.Polygon([
+    (20, 0),
+    (10 * math.cos(math.radians(150)), -10 * math.sin(math.radians(150))),
+    (10 * math.cos(math.radians(-150)), -10 * math.sin(math.radians(-150)))
+])
+SHIP_FLAME = rotation.Polygon([
+    (10 * math.cos(math.radians(150)), -10 * math.sin(math.radians(150))),
+    (-10, 0),
+    (10 * math.cos(math.radians(-150)), -10 * math.sin(math.radians(-150)))
+])
+
+# Arena Settings
+ARENA_SHIPS = 16
+ARENA_SHIP_CHOICES = (4, 8, 16, 32, 64)
+MAX_ARENA_SHIPS = 64
+ARENA_STARS = 3
+ARENA_STAR_RING = 150     # Stars sit evenly on a ring this far from the centre
+ARENA_POINTS_TO_WIN = 10
+GRAVITY_SOFTENING = 0     # Pixels; smooths the pull right next to a star
+TORPEDO_GRAVITY = True    # Arena torpedoes fall towards the stars too
+
+# Control bits, for driving arena ships from an array
+CONTROL_LEFT, CONTROL_RIGHT, CONTROL_THRUST, CONTROL_FIRE, CONTROL_HYPERSPACE = 1, 2, 4, 8, 16
+
 AI_DIFFICULTY = {
     'easy': {'reaction_time': 30, 'accuracy': 0.7},
     'medium': {'reaction_time': 20, 'accuracy': 0.85},
@@ -38,12 +77,17 @@ class Controls:
 
 @dataclass
 class Torpedo:
+    # Pooled per ship, so slots keep each one small and dict-free
+    __slots__ = ('x', 'y', 'dx', 'dy', 'lifetime', 'pool_index')
     x: float
     y: float
     dx: float
     dy: float
     lifetime: int
 
+    def spawn(self, x: float, y: float, dx: float, dy: float, lifetime: int) -> None:
+        self.x, self.y, self.dx, self.dy, self.lifetime = x, y, dx, dy, lifetime
+
 class Ship:
     def __init__(self, x: float, y: float, color: Tuple[int, int, int], 
                  controls: Controls, is_ai: bool = False, ai_difficulty: str = 'medium'):
@@ -53,7 +97,7 @@ class Ship:
         self.color, self.controls = color, controls
         self.score = 0
         self.hyperspace_cooldown = 0
-        self.torpedoes: List[Torpedo] = []
+        self.torpedoes = EntityPool(partial(Torpedo, 0, 0, 0, 0, 0), MAX_TORPEDOES)
         self.thrusting = False
         self.is_ai = is_ai
         self.ai_difficulty = ai_difficulty
@@ -70,22 +114,23 @@ class Ship:
 
     def thrust(self) -> None:
         self.thrusting = True
-        self.dx += math.cos(math.radians(self.angle)) * THRUST_POWER
-        self.dy -= math.sin(math.radians(self.angle)) * THRUST_POWER
+        cos, sin = rotation.cos_sin(self.angle)
+        self.dx += cos * THRUST_POWER
+        self.dy -= sin * THRUST_POWER
 
     def fire_torpedo(self) -> None:
-        if len(self.torpedoes) < 4:
-            self.torpedoes.append(Torpedo(
-                self.x, self.y,
-                self.dx + math.cos(math.radians(self.angle)) * TORPEDO_SPEED,
-                self.dy - math.sin(math.radians(self.angle)) * TORPEDO_SPEED,
-                TORPEDO_LIFETIME
-            ))
+        cos, sin = rotation.cos_sin(self.angle)
+        self.torpedoes.acquire(
+            self.x, self.y,
+            self.dx + cos * TORPEDO_SPEED,
+            self.dy - sin * TORPEDO_SPEED,
+            TORPEDO_LIFETIME
+        )
 
     def hyperspace(self) -> None:
         if self.hyperspace_cooldown <= 0:
-            self.x = random.randint(50, WINDOW_WIDTH - 50)
-            self.y = random.randint(50, WINDOW_HEIGHT - 50)
+            self.x = spawn_rng.randint(50, WINDOW_WIDTH - 50)
+            self.y = spawn_rng.randint(50, WINDOW_HEIGHT - 50)
             self.dx = self.dy = 0
             self.hyperspace_cooldown = HYPESPACE_COOLDOWN
 
@@ -95,14 +140,14 @@ class Ship:
             target_angle = math.degrees(math.atan2(-dy, dx))
             accuracy = AI_DIFFICULTY[self.ai_difficulty]['accuracy']
             
-            self.ai_target_angle = target_angle + random.uniform(-30 * (1 - accuracy), 30 * (1 - accuracy))
+            self.ai_target_angle = target_angle + ai_rng.uniform(-30 * (1 - accuracy), 30 * (1 - accuracy))
             distance = math.sqrt(dx * dx + dy * dy)
-            self.ai_thrusting = distance > 100 and random.random() < accuracy
-            self.ai_firing = abs((self.angle - self.ai_target_angle) % 360) < 20 and distance < 300 and random.random() < accuracy
+            self.ai_thrusting = distance > 100 and ai_rng.random() < accuracy
+            self.ai_firing = abs((self.angle - self.ai_target_angle) % 360) < 20 and distance < 300 and ai_rng.random() < accuracy
             
             if self.hyperspace_cooldown <= 0:
                 star_dx, star_dy = star_x - self.x, star_y - self.y
-                if math.sqrt(star_dx * star_dx + star_dy * star_dy) < 50 and random.random() < accuracy:
+                if math.sqrt(star_dx * star_dx + star_dy * star_dy) < 50 and ai_rng.random() < accuracy:
                     self.hyperspace()
             
             self.ai_decision_timer = AI_DIFFICULTY[self.ai_difficulty]['reaction_time']
@@ -150,7 +195,7 @@ class Ship:
         self.x = (self.x + self.dx) % WINDOW_WIDTH
         self.y = (self.y + self.dy) % WINDOW_HEIGHT
         
-        self.torpedoes = [t for t in self.torpedoes if t.lifetime > 0]
+        self.torpedoes.release_if(lambda t: t.lifetime <= 0)
         for t in self.torpedoes:
             t.x = (t.x + t.dx) % WINDOW_WIDTH
             t.y = (t.y + t.dy) % WINDOW_HEIGHT
@@ -165,35 +210,251 @@ class Ship:
         if self.dead:
             return
 
-        # Draw star warning if active
-        if self.star_warning > 0:
-            pygame.draw.circle(screen, YELLOW, (int(self.x), int(self.y)), SHIP_RADIUS + 5, 2)
-        
-        points = [
-            (self.x + math.cos(math.radians(self.angle)) * 20,
-             self.y - math.sin(math.radians(self.angle)) * 20),
-            (self.x + math.cos(math.radians(self.angle + 150)) * 10,
-             self.y - math.sin(math.radians(self.angle + 150)) * 10),
-            (self.x + math.cos(math.radians(self.angle - 150)) * 10,
-             self.y - math.sin(math.radians(self.angle - 150)) * 10)
-        ]
-        pygame.draw.polygon(screen, self.color, points)
-        
-        if self.thrusting:
-            thrust_points = [
-                (self.x + math.cos(math.radians(self.angle + 150)) * 10,
-                 self.y - math.sin(math.radians(self.angle + 150)) * 10),
-                (self.x + math.cos(math.radians(self.angle)) * -10,
-                 self.y - math.sin(math.radians(self.angle)) * -10),
-                (self.x + math.cos(math.radians(self.angle - 150)) * 10,
-                 self.y - math.sin(math.radians(self.angle - 150)) * 10)
-            ]
-            pygame.draw.polygon(screen, YELLOW, thrust_points)
-            self.thrusting = False
-        
+        draw_ship(screen, self.x, self.y, self.angle, self.color, self.thrusting, self.star_warning > 0)
+        self.thrusting = False
+
         for t in self.torpedoes:
             pygame.draw.circle(screen, self.color, (int(t.x), int(t.y)), TORPEDO_RADIUS)
 
+def draw_ship(screen: pygame.Surface, x: float, y: float, angle: float,
+              color: Tuple[int, int, int], thrusting: bool, star_warning: bool) -> None:
+    # Draw star warning if active
+    if star_warning:
+        pygame.draw.circle(screen, YELLOW, (int(x), int(y)), SHIP_RADIUS + 5, 2)
+
+    # Angles here count anticlockwise, the opposite of screen rotation
+    pygame.draw.polygon(screen, color, SHIP_HULL.place(x, y, -angle))
+
+    if thrusting:
+        pygame.draw.polygon(screen, YELLOW, SHIP_FLAME.place(x, y, -angle))
+
+def length_squared(vectors):
+    # Summing the x and y columns directly beats a reduction over a length-2 axis
+    return vectors[..., 0] * vectors[..., 0] + vectors[..., 1] * vectors[..., 1]
+
+class Arena:
+    """Every ship, torpedo and star of an arena match in numpy arrays,
+    stepped together by the same rules as Ship, except that a torpedo hit
+    destroys the ship as well as scoring. Needs no display, so it also
+    runs headless.
+
+    matches > 1 steps that many separate matches of `ships` ships at once
+    around the same stars, for training; ships only ever hit ships in
+    their own match, and match m owns ships m*ships to (m+1)*ships - 1."""
+
+    def __init__(self, ships: int = ARENA_SHIPS, stars: int = ARENA_STARS,
+                 softening: float = GRAVITY_SOFTENING, torpedo_gravity: bool = TORPEDO_GRAVITY,
+                 matches: int = 1):
+        if np is None:
+            raise RuntimeError("The arena needs numpy")
+        if not 2 <= ships <= MAX_ARENA_SHIPS:
+            raise ValueError(f"An arena holds 2 to {MAX_ARENA_SHIPS} ships")
+        self.matches = matches
+        self.match_ships = ships
+        self.match = np.arange(matches * ships) // ships
+        self.size = np.array([WINDOW_WIDTH, WINDOW_HEIGHT], dtype=float)
+        center = self.size / 2
+        turns = np.arange(stars) * 2 * np.pi / stars
+        ring = ARENA_STAR_RING if stars > 1 else 0
+        self.star_pos = center + ring * np.column_stack((np.cos(turns), np.sin(turns)))
+        self.star_gravity = np.full(stars, GRAVITY)
+        self.softening = softening
+        self.torpedo_gravity = torpedo_gravity
+
+        # Ships start evenly round the edge facing the centre, ship 0 on the left
+        turns = np.pi + np.arange(ships) * 2 * np.pi / ships
+        self.start_pos = center + np.column_stack((np.cos(turns), np.sin(turns))) * (center - 60)
+        to_center = center - self.start_pos
+        self.start_angle = np.degrees(np.arctan2(-to_center[:, 1], to_center[:, 0]))
+
+        total = matches * ships
+        self.pos = np.zeros((total, 2))
+        self.vel = np.zeros((total, 2))
+        self.angle = np.zeros(total)
+        self.alive = np.ones(total, dtype=bool)
+        self.score = np.zeros(total, dtype=int)
+        self.hyperspace_cooldown = np.zeros(total, dtype=int)
+        self.star_warning = np.zeros(total, dtype=int)
+        self.thrusting = np.zeros(total, dtype=bool)
+
+        # MAX_TORPEDOES slots per ship. A slot is free at lifetime -1; one
+        # that just ran out (0) stays taken until the next step, as in the pool
+        self.torpedo_pos = np.zeros((total, MAX_TORPEDOES, 2))
+        self.torpedo_vel = np.zeros((total, MAX_TORPEDOES, 2))
+        self.torpedo_life = np.full((total, MAX_TORPEDOES), -1)
+
+        # What happened in the last step
+        self.hits = np.zeros(total, dtype=int)       # Hits each ship scored
+        self.was_hit = np.zeros(total, dtype=bool)   # Ships a torpedo destroyed
+        self.killed = np.zeros(total, dtype=bool)    # Ships a star destroyed
+        self.frame = 0
+        for match in range(matches):
+            self.restart(match)
+
+    @property
+    def ships(self) -> int:
+        return len(self.pos)
+
+    def restart(self, match: int = 0) -> None:
+        """Put one match's ships back at the start, as if it were new."""
+        ships = slice(match * self.match_ships, (match + 1) * self.match_ships)
+        self.pos[ships] = self.start_pos
+        self.vel[ships] = 0
+        self.angle[ships] = self.start_angle
+        self.alive[ships] = True
+        self.score[ships] = 0
+        self.hyperspace_cooldown[ships] = 0
+        self.star_warning[ships] = 0
+        self.thrusting[ships] = False
+        self.torpedo_life[ships] = -1
+
+    def gravity(self, offset, distance):
+        """Total pull of every star; offset is (..., stars, 2) towards each star."""
+        if self.softening:
+            distance = np.sqrt(distance * distance + self.softening * self.softening)
+        pull = np.divide(self.star_gravity, distance, out=np.zeros_like(distance), where=distance > 0)
+        return (offset * pull[..., None]).sum(axis=-2)
+
+    def step(self, controls) -> None:
+        """Advance one frame; controls holds each ship's CONTROL_* bits."""
+        controls = np.asarray(controls)
+        alive = self.alive
+
+        # As Ship.rotate, thrust, hyperspace and fire_torpedo, in the order a Game applies them
+        turn = (controls & CONTROL_RIGHT > 0).astype(int) - (controls & CONTROL_LEFT > 0)
+        self.angle += ROTATION_SPEED * turn * alive
+        radians = np.radians(self.angle)
+        facing = np.column_stack((np.cos(radians), -np.sin(radians)))
+        self.thrusting = alive & (controls & CONTROL_THRUST > 0)
+        self.vel += facing * (self.thrusting[:, None] * THRUST_POWER)
+        jumping = alive & (controls & CONTROL_HYPERSPACE > 0) & (self.hyperspace_cooldown <= 0)
+        for i in np.flatnonzero(jumping):
+            self.pos[i] = spawn_rng.randint(50, WINDOW_WIDTH - 50), spawn_rng.randint(50, WINDOW_HEIGHT - 50)
+        self.vel[jumping] = 0
+        self.hyperspace_cooldown[jumping] = HYPESPACE_COOLDOWN
+        free = self.torpedo_life < 0
+        shooters = np.flatnonzero(alive & (controls & CONTROL_FIRE > 0) & free.any(axis=1))
+        slots = free[shooters].argmax(axis=1)
+        self.torpedo_pos[shooters, slots] = self.pos[shooters]
+        self.torpedo_vel[shooters, slots] = self.vel[shooters] + facing[shooters] * TORPEDO_SPEED
+        self.torpedo_life[shooters, slots] = TORPEDO_LIFETIME
+
+        # As Ship.update: stars kill, warn and pull, then damping and the speed limit
+        offset = self.star_pos[None, :, :] - self.pos[:, None, :]
+        distance = np.sqrt(length_squared(offset))
+        self.killed = alive & (distance < STAR_KILL_RADIUS).any(axis=1)
+        alive &= ~self.killed
+        warned = (distance < STAR_DANGER_RADIUS).any(axis=1)
+        self.star_warning = np.where(warned, 5, np.maximum(self.star_warning - 1, 0))
+        self.vel[alive] += self.gravity(offset, distance)[alive]
+        self.vel[alive] *= VELOCITY_DAMPING
+        speed = np.sqrt(length_squared(self.vel))
+        too_fast = alive & (speed > MAX_VELOCITY)
+        self.vel[too_fast] *= (MAX_VELOCITY / speed[too_fast])[:, None]
+        self.pos[alive] = (self.pos[alive] + self.vel[alive]) % self.size
+
+        self.torpedo_life[self.torpedo_life == 0] = -1
+        live = self.torpedo_life > 0
+        if self.torpedo_gravity:
+            offset = self.star_pos[None, None, :, :] - self.torpedo_pos[:, :, None, :]
+            distance = np.sqrt(length_squared(offset))
+            # A torpedo that reaches a star burns up
+            live &= ~(distance < STAR_RADIUS).any(axis=2)
+            self.torpedo_life[~live] = -1
+            self.torpedo_vel[live] += self.gravity(offset, distance)[live]
+        self.torpedo_pos[live] = (self.torpedo_pos[live] + self.torpedo_vel[live]) % self.size
+        self.torpedo_life[live] -= 1
+
+        self.hyperspace_cooldown[alive & (self.hyperspace_cooldown > 0)] -= 1
+
+        # As Game.check_collisions, for every flying torpedo against every
+        # other living ship in its match
+        owners, slots = np.nonzero(live & alive[:, None])
+        ships = self.match_ships
+        match = self.match[owners]
+        first = match * ships  # Each torpedo's match starts at this ship
+        hit = collision.circles_overlap_many(self.torpedo_pos[owners, slots, None, :],
+                                             self.pos.reshape(-1, ships, 2)[match],
+                                             SHIP_RADIUS + TORPEDO_RADIUS)
+        hit &= self.alive.reshape(-1, ships)[match]
+        hit &= (owners - first)[:, None] != np.arange(ships)[None, :]
+        struck = hit.any(axis=1)  # Each torpedo hits the first ship it touches
+        self.hits = np.bincount(owners[struck], minlength=self.ships)
+        self.score += self.hits
+        self.torpedo_life[owners[struck], slots[struck]] = -1
+        self.was_hit = np.zeros(self.ships, dtype=bool)
+        if struck.any():
+            self.was_hit[first[struck] + hit[struck].argmax(axis=1)] = True
+        alive &= ~self.was_hit
+        self.frame += 1
+
+    def winners(self):
+        """winner() for every match at once, with -1 where there is none yet."""
+        score = self.score.reshape(self.matches, self.match_ships)
+        alive = self.alive.reshape(self.matches, self.match_ships)
+        # Ships under ARENA_POINTS_TO_WIN never outscore one that reached it
+        winners = np.where(alive.sum(axis=1) == 1, alive.argmax(axis=1), -1)
+        winners = np.where((score >= ARENA_POINTS_TO_WIN).any(axis=1), score.argmax(axis=1), winners)
+        return np.where(winners >= 0, winners + np.arange(self.matches) * self.match_ships, -1)
+
+    def winner(self) -> Optional[int]:
+        """The first ship to ARENA_POINTS_TO_WIN or the last one flying, if any."""
+        winner = self.winners()[0]
+        return int(winner) if winner >= 0 else None
+
+class ArenaAI:
+    """The 1 player AI's rules, deciding for a whole arena of ships at once.
+    Each ship chases the nearest other ship."""
+
+    def __init__(self, ships: int, difficulty: str = 'medium'):
+        self.difficulty = difficulty
+        self.timer = np.zeros(ships, dtype=int)
+        self.target_angle = np.zeros(ships)
+        self.thrusting = np.zeros(ships, dtype=bool)
+        self.firing = np.zeros(ships, dtype=bool)
+
+    def controls(self, arena: Arena):
+        settings = AI_DIFFICULTY[self.difficulty]
+        accuracy = settings['accuracy']
+        controls = np.zeros(arena.ships, dtype=np.uint8)
+        deciding = np.flatnonzero(arena.alive & (self.timer <= 0))
+        if len(deciding):
+            # Only ships in the same match are rivals
+            ships = arena.match_ships
+            match = arena.match[deciding]
+            gap = arena.pos.reshape(-1, ships, 2)[match] - arena.pos[deciding, None, :]
+            distance = np.sqrt(length_squared(gap))
+            distance[~arena.alive.reshape(-1, ships)[match]] = np.inf
+            distance[np.arange(len(deciding)), deciding - match * ships] = np.inf
+            nearest = distance.argmin(axis=1)
+            rows = np.arange(len(deciding))
+            target_distance = distance[rows, nearest]
+            dx, dy = gap[rows, nearest].T
+
+            spread = 30 * (1 - accuracy)
+            noise = np.array([ai_rng.uniform(-spread, spread) for _ in deciding])
+            rolls = np.array([[ai_rng.random() for _ in range(3)] for _ in deciding]) < accuracy
+            self.target_angle[deciding] = np.degrees(np.arctan2(-dy, dx)) + noise
+            self.thrusting[deciding] = (target_distance > 100) & rolls[:, 0]
+            aligned = np.abs((arena.angle[deciding] - self.target_angle[deciding]) % 360) < 20
+            self.firing[deciding] = aligned & (target_distance < 300) & rolls[:, 1]
+
+            star_gap = arena.star_pos[None, :, :] - arena.pos[deciding, None, :]
+            near_star = (length_squared(star_gap) < 50 * 50).any(axis=1)
+            escaping = near_star & (arena.hyperspace_cooldown[deciding] <= 0) & rolls[:, 2]
+            controls[deciding[escaping]] |= CONTROL_HYPERSPACE
+            self.timer[deciding] = settings['reaction_time']
+        waiting = self.timer > 0
+        waiting[deciding] = False
+        self.timer[waiting] -= 1
+
+        controls[self.thrusting] |= CONTROL_THRUST
+        controls[self.firing] |= CONTROL_FIRE
+        clockwise = (self.target_angle - arena.angle) % 360 <= 180
+        controls[clockwise] |= CONTROL_RIGHT
+        controls[~clockwise] |= CONTROL_LEFT
+        return controls
+
 class Game:
     def __init__(self):
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
@@ -211,6 +472,9 @@ class Game:
         self.winner = None
         self.in_countdown = False
         self.countdown_start = 0
+        self.arena_ships = ARENA_SHIPS
+        self.arena = None
+        self.player_controls = 0  # Control bits for ship 0 in the arena
         
         self.reset_game()
 
@@ -229,6 +493,16 @@ class Game:
         self.ship1.dead = False
         self.ship2.dead = False
 
+        if self.game_mode == 'arena':
+            self.arena = Arena(self.arena_ships)
+            self.arena_ai = ArenaAI(self.arena_ships, self.ai_difficulty)
+            # The player keeps green; the AI ships get spread round the colour wheel
+            self.arena_colors = [GREEN]
+            for i in range(1, self.arena_ships):
+                color = pygame.Color(0)
+                color.hsva = (360 * i / self.arena_ships + 150) % 360, 80, 100, 100
+                self.arena_colors.append(tuple(color)[:3])
+
     def start_countdown(self) -> None:
         self.in_countdown = True
         self.countdown_start = pygame.time.get_ticks()
@@ -239,7 +513,8 @@ class Game:
         title = self.title_font.render("SPACE WAR", True, WHITE)
         self.screen.blit(title, title.get_rect(center=(WINDOW_WIDTH//2, 100)))
         
-        options = ["1 Player", "2 Players", f"AI Difficulty: {self.ai_difficulty.capitalize()}", "Start Game"]
+        arena = f"Arena: {self.arena_ships} ships" if np is not None else "Arena (needs numpy)"
+        options = ["1 Player", "2 Players", arena, f"AI Difficulty: {self.ai_difficulty.capitalize()}", "Start Game"]
         for i, option in enumerate(options):
             color = GREEN if i == self.selected_option else WHITE
             text = self.font.render(option, True, color)
@@ -249,9 +524,12 @@ class Game:
 
     def draw_countdown(self) -> None:
         self.screen.fill(BLACK)
-        self.ship1.draw(self.screen)
-        self.ship2.draw(self.screen)
-        pygame.draw.circle(self.screen, YELLOW, (self.star_x, self.star_y), 10)
+        if self.game_mode == 'arena':
+            self.draw_arena_field()
+        else:
+            self.ship1.draw(self.screen)
+            self.ship2.draw(self.screen)
+            pygame.draw.circle(self.screen, YELLOW, (self.star_x, self.star_y), 10)
         
         elapsed = (pygame.time.get_ticks() - self.countdown_start) / 1000
         countdown_number = max(1, COUNTDOWN_TIME - int(elapsed))
@@ -263,6 +541,9 @@ class Game:
 
     def draw_victory_screen(self) -> None:
         self.screen.fill(BLACK)
+        if self.game_mode == 'arena':
+            self.draw_arena_results()
+            return
         
         # Draw title with different message for star death
         if self.winner:
@@ -283,7 +564,52 @@ class Game:
         self.screen.blit(instructions, instructions.get_rect(center=(WINDOW_WIDTH//2, 400)))
         pygame.display.flip()
 
+    def draw_arena_field(self) -> None:
+        arena = self.arena
+        for x, y in arena.star_pos:
+            pygame.draw.circle(self.screen, YELLOW, (int(x), int(y)), STAR_RADIUS)
+            pygame.draw.circle(self.screen, (255, 165, 0), (int(x), int(y)), STAR_DANGER_RADIUS, 1)
+        for i in np.flatnonzero(arena.alive):
+            x, y = arena.pos[i]
+            draw_ship(self.screen, x, y, arena.angle[i], self.arena_colors[i], arena.thrusting[i],
+                      arena.star_warning[i] > 0)
+        for ship, slot in zip(*np.nonzero(arena.torpedo_life >= 0)):
+            x, y = arena.torpedo_pos[ship, slot]
+            pygame.draw.circle(self.screen, self.arena_colors[ship], (int(x), int(y)), TORPEDO_RADIUS)
+
+    def draw_arena(self) -> None:
+        self.screen.fill(BLACK)
+        self.draw_arena_field()
+        arena = self.arena
+        score = self.font.render(f"Score: {arena.score[0]}", True, GREEN)
+        self.screen.blit(score, (10, 10))
+        leader = int(arena.score.argmax())
+        best = self.font.render(f"Best: {arena.score[leader]}", True, self.arena_colors[leader])
+        self.screen.blit(best, (WINDOW_WIDTH - 110, 10))
+        flying = self.font.render(f"{arena.alive.sum()} ships, first to {ARENA_POINTS_TO_WIN}", True, WHITE)
+        self.screen.blit(flying, flying.get_rect(center=(WINDOW_WIDTH//2, 30)))
+        pygame.display.flip()
+
+    def draw_arena_results(self) -> None:
+        arena = self.arena
+        if self.winner == 0:
+            title = self.title_font.render("VICTORY!", True, GREEN)
+        elif not arena.alive[0]:
+            title = self.title_font.render("DESTROYED", True, YELLOW)
+        else:
+            title = self.title_font.render("DEFEATED", True, self.arena_colors[self.winner])
+        self.screen.blit(title, title.get_rect(center=(WINDOW_WIDTH//2, 200)))
+        place = 1 + int((arena.score > arena.score[0]).sum())
+        score_text = self.font.render(f"Your score: {arena.score[0]}  (#{place} of {arena.ships})", True, WHITE)
+        self.screen.blit(score_text, score_text.get_rect(center=(WINDOW_WIDTH//2, 300)))
+        instructions = self.font.render("Press SPACE to play again or ESC for menu", True, WHITE)
+        self.screen.blit(instructions, instructions.get_rect(center=(WINDOW_WIDTH//2, 400)))
+        pygame.display.flip()
+
     def draw(self) -> None:
+        if self.game_mode == 'arena':
+            self.draw_arena()
+            return
         self.screen.fill(BLACK)
         
         # Draw star with danger zone
@@ -312,9 +638,13 @@ class Game:
                 return False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_UP:
-                    self.selected_option = (self.selected_option - 1) % 4
+                    self.selected_option = (self.selected_option - 1) % 5
                 elif event.key == pygame.K_DOWN:
-                    self.selected_option = (self.selected_option + 1) % 4
+                    self.selected_option = (self.selected_option + 1) % 5
+                elif event.key in (pygame.K_LEFT, pygame.K_RIGHT) and self.selected_option == 2:
+                    step = 1 if event.key == pygame.K_RIGHT else -1
+                    index = ARENA_SHIP_CHOICES.index(self.arena_ships) if self.arena_ships in ARENA_SHIP_CHOICES else 0
+                    self.arena_ships = ARENA_SHIP_CHOICES[(index + step) % len(ARENA_SHIP_CHOICES)]
                 elif event.key == pygame.K_RETURN:
                     if self.selected_option == 0:
                         self.game_mode = '1player'
@@ -324,10 +654,14 @@ class Game:
                         self.game_mode = '2player'
                         self.in_menu = False
                         self.start_countdown()
-                    elif self.selected_option == 2:
+                    elif self.selected_option == 2 and np is not None:
+                        self.game_mode = 'arena'
+                        self.in_menu = False
+                        self.start_countdown()
+                    elif self.selected_option == 3:
                         difficulties = ['easy', 'medium', 'hard']
                         self.ai_difficulty = difficulties[(difficulties.index(self.ai_difficulty) + 1) % 3]
-                    elif self.selected_option == 3 and self.game_mode:
+                    elif self.selected_option == 4 and self.game_mode:
                         self.in_menu = False
                         self.start_countdown()
         return True
@@ -354,6 +688,14 @@ class Game:
                 return True
         
         keys = pygame.key.get_pressed()
+        if self.game_mode == 'arena':
+            controls = self.ship1.controls
+            self.player_controls = (CONTROL_LEFT * keys[controls.rotate_left] |
+                                    CONTROL_RIGHT * keys[controls.rotate_right] |
+                                    CONTROL_THRUST * keys[controls.thrust] |
+                                    CONTROL_FIRE * keys[controls.fire] |
+                                    CONTROL_HYPERSPACE * keys[controls.hyperspace])
+            return True
         for ship in [self.ship1, self.ship2]:
             if not ship.is_ai:
                 if keys[ship.controls.rotate_left]: ship.rotate(False)
@@ -368,8 +710,7 @@ class Game:
         # Check star collisions first
         for ship in [self.ship1, self.ship2]:
             if not ship.dead:
-                dx, dy = self.star_x - ship.x, self.star_y - ship.y
-                if math.sqrt(dx*dx + dy*dy) < STAR_KILL_RADIUS:
+                if collision.point_in_circle(ship.x, ship.y, self.star_x, self.star_y, STAR_KILL_RADIUS):
                     ship.dead = True
                     # Game over when ship is destroyed by star
                     self.game_over = True
@@ -380,14 +721,14 @@ class Game:
         for ship in [self.ship1, self.ship2]:
             if ship.dead:
                 continue
-            for torpedo in ship.torpedoes[:]:
+            for torpedo in ship.torpedoes:
                 other_ship = self.ship2 if ship == self.ship1 else self.ship1
                 if other_ship.dead:
                     continue
-                dx, dy = torpedo.x - other_ship.x, torpedo.y - other_ship.y
-                if math.sqrt(dx*dx + dy*dy) < (SHIP_RADIUS + TORPEDO_RADIUS):
+                if collision.circles_overlap(torpedo.x, torpedo.y, TORPEDO_RADIUS,
+                                             other_ship.x, other_ship.y, SHIP_RADIUS):
                     ship.score += 1
-                    ship.torpedoes.remove(torpedo)
+                    ship.torpedoes.release(torpedo)
                     other_ship.hit_flash = HIT_FLASH_DURATION
                     self.check_win_condition()  # Check if this hit won the game
                     break
@@ -402,10 +743,21 @@ class Game:
         # Star destruction is handled in check_collisions
 
     def update(self) -> None:
+        if self.game_mode == 'arena':
+            self.update_arena()
+            return
         self.ship1.update(self.star_x, self.star_y)
         self.ship2.update(self.star_x, self.star_y, self.ship1)
         self.check_collisions()
 
+    def update_arena(self) -> None:
+        controls = self.arena_ai.controls(self.arena)
+        controls[0] = self.player_controls
+        self.arena.step(controls)
+        self.winner = self.arena.winner()
+        if self.winner is not None or not self.arena.alive[0]:
+            self.game_over = True
+
     def run(self) -> None:
         running = True
         while running:
@@ -426,10 +778,17 @@ class Game:
                 self.draw()
             self.clock.tick(FPS)
 
-def main():
+def init():
+    pygame.display.init()
+    pygame.font.init()
+
+def run():
+    init()
+    rng.report()
     game = Game()
+    frame_profiler.attach(game)
     game.run()
     pygame.quit()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    run() 
\ No newline at end of file
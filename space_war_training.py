@@ -0,0 +1,455 @@
+# Space War Training
+# Description: Headless self-play harness that evolves Space War AIs across worker processes
+#
+# Usage:
+#   python space_war_training.py                                   # evolve against the medium AI and itself
+#   python space_war_training.py --opponents hard champion --generations 500 --output brain.json
+#   python space_war_training.py --load brain.json --evaluate --opponents easy medium hard
+#
+# Every worker process owns one numpy Arena holding --matches separate
+# matches of --ships ships, stepped together, with no window. Seats below
+# --learners in each match are driven from outside through the
+# observation/action API; the rest are scripted opponents:
+#   easy, medium, hard  the 1 player AI's rules (space_war.ArenaAI)
+#   champion            the best brain found so far, for self-play
+#   idle, spinner, random
+# Each match plays one opponent kind, taking turns through --opponents.
+#
+# Observations and actions live in shared memory. Each step the workers
+# write every ship's observation row, the parent decides the learners'
+# actions for all arenas in one numpy call, and the workers step again.
+# An action is the ship's space_war CONTROL_* bits.
+#
+# A brain is a linear map from an observation row to five control scores;
+# a control is held while its score is above zero. Evolution keeps the
+# --elite best brains of each generation and fills the rest of the
+# population with mutated copies of them. Matches are reseeded from --seed
+# and the worker index, so a run can be repeated with the same workers.
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import numpy as np
+
+import rng
+import space_war
+
+# Training Settings
+SHIPS = 4                      # Ships per match
+LEARNERS = 1                   # Seats per match the brains being trained fly
+MATCHES = 64                   # Matches per worker, stepped as one arena
+OPPONENTS = ('medium', 'champion')
+POPULATION = 16
+ELITE = 4                      # Best brains kept unchanged each generation
+MUTATION = 0.3                 # Standard deviation of the noise added to weights
+GENERATIONS = 50
+GENERATION_FRAMES = 60 * 30    # Frames every match plays per generation
+MAX_MATCH_FRAMES = 60 * 60 * 2  # A match still going after 2 minutes starts over
+WIN_REWARD = 5                 # On top of +1 per hit and -1 per death
+WORKER_TIMEOUT = 60            # Seconds to wait on a step before giving up on the workers
+SEED = 1
+
+# What each column of an observation row holds. Positions and velocities
+# are relative to the ship and turned so it faces along "ahead"; other
+# ships and torpedoes are seen the short way round the wrapping screen
+OBSERVATION = (
+    'speed ahead', 'speed right',
+    'rival ahead', 'rival right', 'rival speed ahead', 'rival speed right',
+    'star ahead', 'star right', 'star danger',
+    'torpedo ahead', 'torpedo right', 'torpedo incoming',
+    'torpedoes ready', 'hyperspace ready', 'bias',
+)
+OBSERVATION_SIZE = len(OBSERVATION)
+CONTROLS = (space_war.CONTROL_LEFT, space_war.CONTROL_RIGHT, space_war.CONTROL_THRUST,
+            space_war.CONTROL_FIRE, space_war.CONTROL_HYPERSPACE)
+VIEW_DISTANCE = space_war.WINDOW_WIDTH / 2  # Distances are scaled by this
+
+SCRIPTED = ('easy', 'medium', 'hard', 'champion', 'idle', 'spinner', 'random')
+RESET, STEP, STOP = 0, 1, 2
+
+
+def wrapped(gap, size):
+    """Offsets the short way round a screen that wraps at size."""
+    return (gap + size / 2) % size - size / 2
+
+
+def observe(arena, out):
+    """Write every ship's observation row into out, shaped (arena.ships, OBSERVATION_SIZE)."""
+    ships = arena.match_ships
+    match = arena.match
+    seat = np.arange(arena.ships) - match * ships
+    rows = np.arange(arena.ships)
+    radians = np.radians(arena.angle)
+    cos, sin = np.cos(radians), np.sin(radians)
+
+    def turned(vectors, scale):
+        # Into the ship's frame: facing is (cos, -sin) on screen, its right (sin, cos)
+        return ((vectors[:, 0] * cos - vectors[:, 1] * sin) / scale,
+                (vectors[:, 0] * sin + vectors[:, 1] * cos) / scale)
+
+    out[:, 0], out[:, 1] = turned(arena.vel, space_war.MAX_VELOCITY)
+
+    # Nearest living rival in the same match
+    gap = wrapped(arena.pos.reshape(-1, ships, 2)[match] - arena.pos[:, None, :], arena.size)
+    distance = space_war.length_squared(gap)
+    distance[~arena.alive.reshape(-1, ships)[match]] = np.inf
+    distance[rows, seat] = np.inf
+    rival = distance.argmin(axis=1)
+    found = np.isfinite(distance[rows, rival])[:, None]
+    relative_vel = arena.vel.reshape(-1, ships, 2)[match, rival] - arena.vel
+    out[:, 2], out[:, 3] = turned(np.where(found, gap[rows, rival], 0), VIEW_DISTANCE)
+    out[:, 4], out[:, 5] = turned(np.where(found, relative_vel, 0), space_war.MAX_VELOCITY)
+
+    # Nearest star; gravity doesn't wrap, so neither does this
+    gap = arena.star_pos[None, :, :] - arena.pos[:, None, :]
+    distance = np.sqrt(space_war.length_squared(gap))
+    star = distance.argmin(axis=1)
+    out[:, 6], out[:, 7] = turned(gap[rows, star], VIEW_DISTANCE)
+    out[:, 8] = np.minimum(space_war.STAR_DANGER_RADIUS / np.maximum(distance[rows, star], 1), 1)
+
+    # Nearest torpedo someone else in the match fired
+    slots = ships * space_war.MAX_TORPEDOES
+    gap = wrapped(arena.torpedo_pos.reshape(-1, slots, 2)[match] - arena.pos[:, None, :], arena.size)
+    distance = space_war.length_squared(gap)
+    owner = np.arange(slots) // space_war.MAX_TORPEDOES
+    flying = arena.torpedo_life.reshape(-1, slots)[match] > 0
+    distance[~flying | (owner[None, :] == seat[:, None])] = np.inf
+    torpedo = distance.argmin(axis=1)
+    incoming = np.isfinite(distance[rows, torpedo])
+    out[:, 9], out[:, 10] = turned(np.where(incoming[:, None], gap[rows, torpedo], 0), VIEW_DISTANCE)
+    out[:, 11] = incoming
+
+    out[:, 12] = (arena.torpedo_life < 0).sum(axis=1) / space_war.MAX_TORPEDOES
+    out[:, 13] = arena.hyperspace_cooldown <= 0
+    out[:, 14] = 1
+    out[~arena.alive] = 0
+
+
+def brain_controls(weights, observations):
+    """Control bits for each observation row; weights is one brain shaped
+    (OBSERVATION_SIZE, len(CONTROLS)) or one per row (rows, OBSERVATION_SIZE, len(CONTROLS))."""
+    if weights.ndim == 2:
+        scores = observations @ weights
+    else:
+        scores = np.einsum('ro,roc->rc', observations, weights)
+    return ((scores > 0) @ np.array(CONTROLS)).astype(np.uint8)
+
+
+def buffer_layout(workers, matches, ships):
+    """(name, shape, dtype) of every array in the shared memory block."""
+    total = workers * matches * ships
+    return [
+        ('observations', (total, OBSERVATION_SIZE), np.float32),
+        ('actions', (total,), np.uint8),
+        ('rewards', (total,), np.float32),
+        ('done', (workers * matches,), np.bool_),
+        ('winners', (workers * matches,), np.int32),  # Winning seat of a match that just ended, or -1
+        ('champion', (OBSERVATION_SIZE, len(CONTROLS)), np.float64),
+        ('command', (1,), np.int64),
+    ]
+
+
+def array_bytes(shape, dtype):
+    # Rounded up so every array starts 8-byte aligned
+    return -(-int(np.prod(shape)) * np.dtype(dtype).itemsize // 8) * 8
+
+
+def buffer_size(layout):
+    return sum(array_bytes(shape, dtype) for _, shape, dtype in layout)
+
+
+def attach(memory, layout):
+    """numpy views of each array in the shared memory block."""
+    views = {}
+    offset = 0
+    for name, shape, dtype in layout:
+        views[name] = np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=offset)
+        offset += array_bytes(shape, dtype)
+    return views
+
+
+class SelfPlay:
+    """One worker's matches and scripted opponents, reading actions from and
+    writing observations to its share of the buffers."""
+
+    def __init__(self, index, views, matches, ships, learners, opponents):
+        self.arena = space_war.Arena(ships, matches=matches)
+        self.ships = ships
+        ships_slice = slice(index * matches * ships, (index + 1) * matches * ships)
+        matches_slice = slice(index * matches, (index + 1) * matches)
+        self.observations = views['observations'][ships_slice]
+        self.actions = views['actions'][ships_slice]
+        self.rewards = views['rewards'][ships_slice]
+        self.done = views['done'][matches_slice]
+        self.winners = views['winners'][matches_slice]
+        self.champion = views['champion']
+
+        seat = np.arange(self.arena.ships) % ships
+        self.learner = seat < learners
+        kind = np.array([opponents[m % len(opponents)] for m in range(matches)])[self.arena.match]
+        self.scripted = {name: np.flatnonzero(~self.learner & (kind == name))
+                         for name in SCRIPTED if (~self.learner & (kind == name)).any()}
+        self.ais = {name: space_war.ArenaAI(self.arena.ships, name)
+                    for name in self.scripted if name in space_war.AI_DIFFICULTY}
+        self.random = np.random.default_rng(rng.master_seed)
+        self.frames = np.zeros(matches, dtype=int)
+
+    def restart(self, matches):
+        for match in matches:
+            self.arena.restart(match)
+            ships = slice(match * self.ships, (match + 1) * self.ships)
+            for ai in self.ais.values():
+                ai.timer[ships] = 0
+                ai.thrusting[ships] = ai.firing[ships] = False
+        self.frames[matches] = 0
+
+    def controls(self):
+        controls = self.actions.copy()
+        controls[~self.learner] = 0
+        for name, seats in self.scripted.items():
+            if name in self.ais:
+                controls[seats] = self.ais[name].controls(self.arena)[seats]
+            elif name == 'champion':
+                controls[seats] = brain_controls(self.champion, self.observations[seats])
+            elif name == 'spinner':
+                controls[seats] = space_war.CONTROL_RIGHT | space_war.CONTROL_FIRE
+            elif name == 'random':
+                controls[seats] = self.random.integers(0, 16, len(seats))  # Never hyperspace
+        return controls
+
+    def step(self):
+        arena = self.arena
+        arena.step(self.controls())
+        self.frames += 1
+        self.rewards[:] = arena.hits - (arena.was_hit | arena.killed)
+
+        winners = arena.winners()
+        learners_left = (arena.alive & self.learner).reshape(-1, self.ships).any(axis=1)
+        self.done[:] = (winners >= 0) | ~learners_left | (self.frames >= MAX_MATCH_FRAMES)
+        self.rewards[winners[winners >= 0]] += WIN_REWARD
+        self.winners[:] = np.where(winners >= 0, winners % self.ships, -1)
+        self.restart(np.flatnonzero(self.done))
+
+    def run(self, command):
+        if command == RESET:
+            self.restart(np.arange(self.arena.matches))
+            self.rewards[:] = 0
+            self.done[:] = False
+            self.winners[:] = -1
+        else:
+            self.step()
+        observe(self.arena, self.observations)
+
+
+def serve(index, memory_name, layout, settings, start, finish):
+    """Worker process: step this worker's matches each time the parent says so."""
+    rng.seed(settings['seed'] + index)
+    memory = shared_memory.SharedMemory(name=memory_name)
+    views = attach(memory, layout)
+    play = SelfPlay(index, views, settings['matches'], settings['ships'],
+                    settings['learners'], settings['opponents'])
+    while True:
+        start.wait()
+        command = int(views['command'][0])
+        if command == STOP:
+            break
+        play.run(command)
+        finish.wait()
+    del play, views
+    memory.close()
+
+
+class SelfPlayPool:
+    """workers x matches matches of ships ships. With workers=0 the matches
+    run in this process, which is easier to debug and best on one core."""
+
+    def __init__(self, workers=1, matches=MATCHES, ships=SHIPS, learners=LEARNERS,
+                 opponents=OPPONENTS, seed=SEED):
+        if not 1 <= learners < ships:
+            raise ValueError("A match needs at least one learner and one opponent")
+        self.ships = ships
+        self.learners = learners
+        self.layout = buffer_layout(max(workers, 1), matches, ships)
+        self.memory = shared_memory.SharedMemory(create=True, size=buffer_size(self.layout))
+        self.views = attach(self.memory, self.layout)
+        self.observations = self.views['observations']
+        self.rewards = self.views['rewards']
+        self.done = self.views['done']
+        self.winners = self.views['winners']
+        self.learner = np.arange(len(self.rewards)) % ships < learners
+        # Which opponent kind each match plays, matching SelfPlay
+        self.match_opponents = [opponents[m % len(opponents)] for m in range(matches)] * max(workers, 1)
+
+        self.processes = []
+        if workers == 0:
+            rng.seed(seed)
+            self.local = SelfPlay(0, self.views, matches, ships, learners, opponents)
+            return
+        self.local = None
+        self.start = multiprocessing.Barrier(workers + 1)
+        self.finish = multiprocessing.Barrier(workers + 1)
+        settings = {'seed': seed, 'matches': matches, 'ships': ships,
+                    'learners': learners, 'opponents': tuple(opponents)}
+        for index in range(workers):
+            process = multiprocessing.Process(
+                target=serve, args=(index, self.memory.name, self.layout, settings, self.start, self.finish),
+                daemon=True)
+            process.start()
+            self.processes.append(process)
+
+    def command(self, command):
+        self.views['command'][0] = command
+        if self.local:
+            self.local.run(command)
+        else:
+            self.start.wait(WORKER_TIMEOUT)
+            if command != STOP:
+                self.finish.wait(WORKER_TIMEOUT)
+
+    def reset(self):
+        """Start every match over; returns the observations."""
+        self.command(RESET)
+        return self.observations
+
+    def step(self, actions):
+        """actions holds control bits for every ship, though only learner
+        seats are read. Returns observations, rewards, done and winners,
+        which stay valid until the next step."""
+        self.views['actions'][:] = actions
+        self.command(STEP)
+        return self.observations, self.rewards, self.done, self.winners
+
+    def set_champion(self, weights):
+        self.views['champion'][:] = weights
+
+    def close(self):
+        if self.processes:
+            self.command(STOP)
+            for process in self.processes:
+                process.join()
+        self.local = None
+        del self.observations, self.rewards, self.done, self.winners, self.views
+        self.memory.close()
+        self.memory.unlink()
+
+
+def play_generation(pool, brains, frames):
+    """Fly each learner seat with a brain, taking turns through brains by
+    match; returns each brain's mean reward per seat and the match results."""
+    matches = len(pool.done)
+    owner = np.arange(matches) % len(brains)  # Brain flying each match
+    ship_owner = np.repeat(owner, pool.ships)
+    weights = np.stack(brains)[ship_owner[pool.learner]]
+    actions = np.zeros(len(pool.rewards), dtype=np.uint8)
+    totals = np.zeros(len(brains))
+    results = {}  # Opponent kind -> [wins, matches finished]
+
+    observations = pool.reset()
+    for _ in range(frames):
+        actions[pool.learner] = brain_controls(weights, observations[pool.learner])
+        observations, rewards, done, winners = pool.step(actions)
+        totals += np.bincount(ship_owner[pool.learner], rewards[pool.learner], minlength=len(brains))
+        for match in np.flatnonzero(done):
+            entry = results.setdefault(pool.match_opponents[match], [0, 0])
+            entry[0] += 0 <= winners[match] < pool.learners
+            entry[1] += 1
+    seats = np.bincount(ship_owner[pool.learner], minlength=len(brains))
+    return totals / seats, results
+
+
+def evolve(pool, args, brains, random):
+    best, best_fitness = brains[0], None
+    for generation in range(1, args.generations + 1):
+        pool.set_champion(best)
+        start = time.perf_counter()
+        fitness, results = play_generation(pool, brains, args.frames)
+        elapsed = time.perf_counter() - start
+
+        ranked = np.argsort(fitness)[::-1]
+        best, best_fitness = brains[ranked[0]], float(fitness[ranked[0]])
+        elite = [brains[i] for i in ranked[:args.elite]]
+        brains = elite + [elite[i % len(elite)] + random.normal(0, args.mutation, best.shape)
+                          for i in range(args.population - len(elite))]
+
+        match_frames = len(pool.done) * args.frames
+        print(f"generation {generation:4}: best {best_fitness:7.2f}  mean {fitness.mean():7.2f}  "
+              f"{report_results(results)}  {match_frames / elapsed:,.0f} frames/s "
+              f"({match_frames / elapsed / space_war.FPS:,.0f}x real time)")
+    return best, best_fitness
+
+
+def report_results(results):
+    return '  '.join(f"{name} {wins}/{played}" for name, (wins, played) in sorted(results.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless self-play training for Space War AIs")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="worker processes; 0 runs the matches in this process")
+    parser.add_argument('--matches', type=int, default=MATCHES, help="matches per worker")
+    parser.add_argument('--ships', type=int, default=SHIPS, help="ships per match")
+    parser.add_argument('--learners', type=int, default=LEARNERS, help="seats per match flown by brains")
+    parser.add_argument('--opponents', nargs='+', choices=SCRIPTED, default=list(OPPONENTS))
+    parser.add_argument('--population', type=int, default=POPULATION)
+    parser.add_argument('--elite', type=int, default=ELITE)
+    parser.add_argument('--mutation', type=float, default=MUTATION)
+    parser.add_argument('--generations', type=int, default=GENERATIONS)
+    parser.add_argument('--frames', type=int, default=GENERATION_FRAMES, help="frames per generation")
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--load', help="start from the brain in this JSON file")
+    parser.add_argument('--evaluate', action='store_true', help="only play the loaded brain")
+    parser.add_argument('--output', help="write the best brain to this JSON file")
+    args = parser.parse_args()
+    if not 1 <= args.elite <= args.population:
+        parser.error("--elite must be between 1 and --population")
+    if not args.evaluate and args.population > max(args.workers, 1) * args.matches:
+        # Every brain needs at least one match to be ranked
+        parser.error("--population must be at most --workers x --matches "
+                     "(--matches when --workers is 0)")
+
+    random = np.random.default_rng(args.seed)
+    shape = (OBSERVATION_SIZE, len(CONTROLS))
+    if args.load:
+        with open(args.load) as f:
+            saved = json.load(f)
+        if saved['observation'] != list(OBSERVATION):
+            parser.error(f"{args.load} was trained on different observations")
+        start = np.array(saved['weights'])
+        brains = [start] + [start + random.normal(0, args.mutation, shape)
+                            for _ in range(args.population - 1)]
+    elif args.evaluate:
+        parser.error("--evaluate needs --load")
+    else:
+        brains = [random.normal(0, 0.5, shape) for _ in range(args.population)]
+
+    pool = SelfPlayPool(args.workers, args.matches, args.ships, args.learners, args.opponents, args.seed)
+    try:
+        if args.evaluate:
+            pool.set_champion(brains[0])
+            start = time.perf_counter()
+            fitness, results = play_generation(pool, brains[:1], args.frames)
+            elapsed = time.perf_counter() - start
+            print(f"reward {fitness[0]:.2f}  {report_results(results)}  "
+                  f"{len(pool.done) * args.frames / elapsed:,.0f} frames/s")
+            return
+        best, fitness = evolve(pool, args, brains, random)
+    finally:
+        pool.close()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'observation': list(OBSERVATION),
+                       'controls': ['left', 'right', 'thrust', 'fire', 'hyperspace'],
+                       'weights': best.tolist(), 'fitness': fitness, 'seed': args.seed,
+                       'generations': args.generations, 'opponents': args.opponents}, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()